@@ -0,0 +1,81 @@
+"""Timing of the file conflict index on synthetic mods of 20,000 files each.
+
+Times a refresh without an index on one worker and on the thread pool, a refresh of the
+saved index with nothing changed and with one new file, and conflicts() for the selection.
+Run from the repository root:
+
+    python -m benchmarks.conflict_index [--mods 3] [--files 20000]
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+from scr import conflictindex
+from scr.conflictindex import ConflictIndex
+
+FOLDERS = ["common", "events", "decisions", "history/provinces/england", "history/provinces/france",
+           "history/countries", "history/pops/1836.1.1", "gfx/interface", "gfx/flags", "gfx/pictures/events",
+           "map/terrain", "localisation", "interface", "poptypes", "units", "inventions", "technologies"]
+FILES_PER_FOLDER = 250
+
+
+def write_mod(mod_dir, files, shared):
+    """Writes files empty files, the first shared of each folder have the same names in every mod."""
+    number = 0
+    while number < files:
+        for folder in FOLDERS:
+            folder_path = os.path.join(mod_dir, folder, f"part{number // (FILES_PER_FOLDER * len(FOLDERS))}")
+            os.makedirs(folder_path, exist_ok=True)
+            for index in range(FILES_PER_FOLDER):
+                if number >= files:
+                    return
+                name = f"{index}.txt" if index < shared else f"{os.path.basename(mod_dir)}_{index}.txt"
+                open(os.path.join(folder_path, name), 'w').close()
+                number += 1
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<36} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mods', type=int, default=3)
+    parser.add_argument('--files', type=int, default=20000, help="files per mod")
+    parser.add_argument('--shared', type=int, default=10, help="file names per folder that every mod has")
+    args = parser.parse_args()
+
+    game_root = tempfile.mkdtemp()
+    try:
+        mod_paths = [f"mod/Mod{number}" for number in range(args.mods)]
+        for mod_path in mod_paths:
+            write_mod(os.path.join(game_root, mod_path), args.files, args.shared)
+        selection = [(mod_path.split("/")[1], mod_path) for mod_path in mod_paths]
+        print(f"{args.mods} mods of {args.files} files")
+
+        saved_workers = conflictindex.MAX_WALK_WORKERS
+        conflictindex.MAX_WALK_WORKERS = 1
+        try:
+            timed("no index, one worker", lambda: ConflictIndex(game_root, "serial.json").refresh(mod_paths))
+        finally:
+            conflictindex.MAX_WALK_WORKERS = saved_workers
+        timed(f"no index, {saved_workers} workers", lambda: ConflictIndex(game_root).refresh(mod_paths))
+
+        index = timed("load the saved index", lambda: ConflictIndex(game_root))
+        timed("refresh, nothing changed", lambda: index.refresh(mod_paths))
+        open(os.path.join(game_root, mod_paths[0], "common", "part0", "new.txt"), 'w').close()
+        timed("refresh, one file added", lambda: index.refresh(mod_paths))
+        conflicts = timed("conflicts, first call", lambda: index.conflicts(selection))
+        timed("conflicts, file sets built", lambda: index.conflicts(selection))
+        print(f"{len(conflicts)} conflicting files")
+    finally:
+        shutil.rmtree(game_root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Timing of the .mod descriptor discovery on a folder of 500 synthetic descriptors.
+
+Parses the folder with one worker and with the thread pool, both without an index, then
+refreshes again with the index saved. --latency adds a wait before each descriptor is
+read, like the open() of a network drive or a busy HDD. --folder times a real mod folder
+instead, its index file is left alone. Run from the repository root:
+
+    python -m benchmarks.mod_discovery [--descriptors 500] [--latency 0.005] [--folder PATH]
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+from scr import modindex
+from scr.modindex import ModIndex
+
+
+def write_descriptors(folder, count):
+    for number in range(count):
+        dependencies = f'dependencies = {{ "Mod {number - 1}" "Mod {number // 2}" }}\n' if number else ""
+        with open(os.path.join(folder, f"mod{number:04}.mod"), 'w', newline='\r\n') as f:
+            f.write(
+                f'name = "Mod {number}"\npath = "mod/Mod{number}"\nuser_dir = "Mod{number % 7}"\n{dependencies}'
+                f'tags = {{ "Gameplay" "Graphics" "Historical" }}\npicture = "thumbnail.png"\n'
+                f'supported_version = "3.04"\ngithub = "https://github.com/owner/mod{number}"\n'
+                f'# Descriptors often carry a long comment about the mod and its compatibility\n' + "# " + "x" * 400 + "\n"
+            )
+
+
+def refresh(folder, index_file, label, workers=None):
+    saved_workers = modindex.MAX_PARSE_WORKERS
+    if workers is not None:
+        modindex.MAX_PARSE_WORKERS = workers
+    try:
+        index = ModIndex(folder, index_file)
+        start = time.perf_counter()
+        index.refresh()
+        wall_time = time.perf_counter() - start
+    finally:
+        modindex.MAX_PARSE_WORKERS = saved_workers
+    scan = index.last_scan
+    print(f"{label:<28} {scan['files_scanned']:>5} scanned {scan['files_parsed']:>5} parsed "
+          f"{scan['bytes_read'] / 1024:>8.1f} KB {wall_time * 1000:>9.1f} ms")
+    return wall_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--descriptors', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds waited before reading each descriptor")
+    parser.add_argument('--folder', help="a real mod folder to time instead of the synthetic one")
+    args = parser.parse_args()
+
+    if args.latency:
+        parse_mod_file = modindex.parse_mod_file
+
+        def slow_parse(path):
+            time.sleep(args.latency)
+            return parse_mod_file(path)
+        modindex.parse_mod_file = slow_parse
+
+    temp_folder = tempfile.mkdtemp()
+    try:
+        folder = args.folder or temp_folder
+        if not args.folder:
+            write_descriptors(folder, args.descriptors)
+        index_file = os.path.join(temp_folder, "benchmark_modindex.json")  # Never the folder's own index
+        print(f"{folder}, {args.latency * 1000:.1f} ms read latency")
+        serial = refresh(folder, index_file + ".serial", "no index, one worker", workers=1)
+        pooled = refresh(folder, index_file, f"no index, {modindex.MAX_PARSE_WORKERS} workers")
+        refresh(folder, index_file, "index saved, nothing changed")
+        print(f"Thread pool speedup without an index: {serial / pooled:.1f}x")
+    finally:
+        shutil.rmtree(temp_folder)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Applying presets to, and reading the selection from, a tree of 2,000 synthetic mods.
+
+Compares the original QTreeWidget walk, which tests every item against the preset list,
+with ModTreeModel's name index and checked set. Both are shown in a view, as in the
+launcher. Runs offscreen, from the repository root:
+
+    python -m benchmarks.mod_lookup [--mods 2000] [--preset-size 300] [--presets 20]
+"""
+import os
+import time
+import random
+import argparse
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QTreeView, QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator
+
+from scr.modmodel import ModRecord, ModTreeModel
+
+
+def synthetic_mods(count):
+    """{name: parent name or None}, every fourth mod is a submod of an earlier one."""
+    parents = {}
+    for number in range(count):
+        parents[f"Mod {number:04}"] = f"Mod {number // 2:04}" if number % 4 == 3 else None
+    return parents
+
+
+def widget_tree(parents):
+    tree = QTreeWidget()
+    items = {}
+    for name, parent in parents.items():
+        item = QTreeWidgetItem(items[parent] if parent else tree, [name])
+        item.setCheckState(0, Qt.CheckState.Unchecked)
+        items[name] = item
+    return tree
+
+
+def widget_set_checked(tree, checked_mods):
+    """The original set_checked_mods."""
+    iterator = QTreeWidgetItemIterator(tree, QTreeWidgetItemIterator.IteratorFlag.All)
+    tree.blockSignals(True)
+    while iterator.value():
+        item = iterator.value()
+        item.setCheckState(0, Qt.CheckState.Checked if item.text(0) in checked_mods else Qt.CheckState.Unchecked)
+        iterator += 1
+    tree.blockSignals(False)
+
+
+def widget_checked(tree):
+    """The original get_checked_mods."""
+    checked_mods = []
+    iterator = QTreeWidgetItemIterator(tree, QTreeWidgetItemIterator.IteratorFlag.All)
+    while iterator.value():
+        item = iterator.value()
+        if item.checkState(0) == Qt.CheckState.Checked:
+            checked_mods.append(item.text(0))
+        iterator += 1
+    return checked_mods
+
+
+def model_tree(parents):
+    records = {}
+    for position, name in enumerate(parents):
+        records[name] = ModRecord(name, f"{name}.mod")
+        records[name].position = position
+    model = ModTreeModel()
+    model.set_records(records, parents)
+    view = QTreeView()
+    view.setModel(model)
+    view.expandAll()
+    return model, view
+
+
+def timed(label, runs, function):
+    start = time.perf_counter()
+    for run in range(runs):
+        function(run)
+    per_run = (time.perf_counter() - start) / runs
+    print(f"{label:<40} {per_run * 1000:>9.3f} ms")
+    return per_run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mods', type=int, default=2000)
+    parser.add_argument('--preset-size', type=int, default=300)
+    parser.add_argument('--presets', type=int, default=20, help="presets applied in turn")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    parents = synthetic_mods(args.mods)
+    names = list(parents)
+    generator = random.Random(1836)
+    presets = [generator.sample(names, args.preset_size) for preset in range(args.presets)]
+    print(f"{args.mods} mods, presets of {args.preset_size}")
+
+    tree = widget_tree(parents)
+    tree.show()
+    model, view = model_tree(parents)
+    view.show()
+    app.processEvents()
+
+    before = timed("tree walk, apply a preset", args.presets, lambda run: widget_set_checked(tree, presets[run]))
+    after = timed("model, apply a preset", args.presets, lambda run: model.set_checked(presets[run]))
+    timed("tree walk, read the selection", args.presets, lambda run: widget_checked(tree))
+    timed("model, read the selection", args.presets, lambda run: model.checked_mods())
+
+    def toggle(run):
+        record = model.records[names[run]]
+        model.setData(model.index_of(record), Qt.CheckState.Unchecked if record.checked else Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+        model.checked_mods()
+    timed("model, toggle one mod and read", args.presets, toggle)
+    assert sorted(widget_checked(tree)) == sorted(set(presets[-1]))
+    print(f"Applying a preset is {before / after:.0f}x faster")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Throughput of the Paradox script parser in MB/s.
+
+Parses synthetic history and event files, which have the nesting, comments and lists of
+real mod content, and times parse, an unchanged to_text and an edit of one value.
+--folder parses every .txt file of a real mod folder instead. Run from the repository root:
+
+    python -m benchmarks.script_parser [--megabytes 8] [--folder PATH]
+"""
+import os
+import time
+import argparse
+
+from scr import paradoxscript
+
+
+def province_history(number):
+    return (
+        f"# Province {number}\r\nowner = ENG\r\ncontroller = ENG\r\nadd_core = ENG\r\ntrade_goods = grain\r\n"
+        f"life_rating = 35\r\nrailroad = 1\r\n1836.1.1 = {{\r\n\tfort = 1\r\n\tnaval_base = 2\r\n}}\r\n"
+        f"1861.4.12 = {{ owner = USA controller = USA add_core = USA }}\r\n"
+    )
+
+
+def event(number):
+    return (
+        f"country_event = {{\r\n\tid = {number}\r\n\ttitle = \"EVTNAME{number}\"\r\n\tdesc = \"EVTDESC{number}\"\r\n"
+        f"\tpicture = \"Reform\"\r\n\ttrigger = {{\r\n\t\ttag = ENG\r\n\t\tyear = 1850\r\n\t\tNOT = {{ has_country_flag = done_{number} }}\r\n"
+        f"\t\tany_owned_province = {{ is_core = IRE life_rating >= 30 }}\r\n\t}}\r\n"
+        f"\tmean_time_to_happen = {{ months = 12 modifier = {{ factor = 0.5 war = yes }} }}\r\n"
+        f"\toption = {{\r\n\t\tname = \"EVTOPTA{number}\"\r\n\t\tprestige = 5\r\n\t\tset_country_flag = done_{number}\r\n"
+        f"\t\tai_chance = {{ factor = 80 }}\r\n\t}}\r\n}}\r\n\r\n"
+    )
+
+
+def synthetic_files(megabytes):
+    files = []
+    size = 0
+    number = 0
+    while size < megabytes * 1024 * 1024:
+        text = province_history(number) if number % 2 else "".join(event(number * 10 + index) for index in range(20))
+        files.append(text)
+        size += len(text)
+        number += 1
+    return files
+
+
+def folder_files(folder):
+    files = []
+    for root, dirs, names in os.walk(folder):
+        for name in names:
+            if name.endswith(".txt"):
+                with open(os.path.join(root, name), 'r', encoding=paradoxscript.FILE_ENCODING, errors=paradoxscript.FILE_ERRORS, newline='') as f:
+                    files.append(f.read())
+    return files
+
+
+def timed(label, size, function):
+    start = time.perf_counter()
+    result = function()
+    wall_time = time.perf_counter() - start
+    print(f"{label:<24} {wall_time * 1000:>9.1f} ms {size / 1048576 / wall_time:>8.1f} MB/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--megabytes', type=float, default=8.0, help="size of the synthetic content")
+    parser.add_argument('--folder', help="a mod folder whose .txt files are parsed instead")
+    args = parser.parse_args()
+
+    files = folder_files(args.folder) if args.folder else synthetic_files(args.megabytes)
+    size = sum(len(text.encode(paradoxscript.FILE_ENCODING, paradoxscript.FILE_ERRORS)) for text in files)
+    print(f"{len(files)} files, {size / 1048576:.1f} MB")
+
+    documents = timed("parse", size, lambda: [paradoxscript.parse(text) for text in files])
+    print(f"{sum(len(document.nodes) for document in documents)} top level statements")
+    texts = timed("to_text, unchanged", size, lambda: [document.to_text() for document in documents])
+    assert texts == files, "a document did not round trip unchanged"
+
+    def edit():
+        for document in documents:
+            document.set('benchmark_edit', 1)
+            document.to_text()
+    timed("set + to_text", size, edit)
+
+
+if __name__ == '__main__':
+    main()
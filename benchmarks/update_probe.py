@@ -0,0 +1,93 @@
+"""Bytes and time of an update check against a local stub of the GitHub API.
+
+Compares the original check, a full /commits page per mod fetched one request at a time,
+with UpdateChecker's per_page=1 probe that skips the commit lookup after a new release.
+Run from the repository root:
+
+    python -m benchmarks.update_probe [--mods 60] [--latency 0.05]
+"""
+import os
+import time
+import argparse
+import tempfile
+
+import requests
+
+from scr.updatechecker import UpdateChecker
+from tests.fakegithub import FakeGitHub
+
+COMMITS_PER_PAGE = 30  # What GitHub returns for /commits without per_page
+
+
+def commit(number, date):
+    """A commit object shaped like GitHub's, which repeats the author and committer in full."""
+    sha = f"{number:040x}"
+    person = {'name': "Modder", 'email': "modder@example.com", 'date': date}
+    account = {'login': "modder", 'id': 1, 'type': "User", 'url': "https://api.github.com/users/modder", 'html_url': "https://github.com/modder"}
+    return {
+        'sha': sha, 'node_id': "C_" + sha, 'url': f"https://api.github.com/repos/owner/repo/commits/{sha}",
+        'html_url': f"https://github.com/owner/repo/commit/{sha}",
+        'commit': {'author': person, 'committer': person, 'message': "Balance changes to the economy " * 4,
+                   'tree': {'sha': sha, 'url': f"https://api.github.com/repos/owner/repo/git/trees/{sha}"}, 'comment_count': 0},
+        'author': account, 'committer': account,
+        'parents': [{'sha': sha, 'url': f"https://api.github.com/repos/owner/repo/commits/{sha}"}],
+    }
+
+
+def fake_repos(count):
+    """Routes for count repositories, every third has a release newer than the installed one."""
+    routes = {}
+    for number in range(count):
+        repo = f"/repos/owner/mod{number}"
+        tag = "v2" if number % 3 == 0 else "v1"
+        routes[repo + "/releases/latest"] = {'tag_name': tag, 'published_at': "2019-06-01T00:00:00Z"}
+        commits = [commit(number * 100 + index, "2019-06-01T00:00:00Z") for index in range(COMMITS_PER_PAGE)]
+        routes[repo + "/commits"] = commits
+        routes[repo + "/commits?per_page=1"] = commits[:1]
+    return routes
+
+
+def original_check(mods, api_root):
+    """The check as it was, a release and a full commit page per mod on a new connection each."""
+    for mod_info in mods.values():
+        repo = api_root + "/repos/" + mod_info['github'].split("github.com/", 1)[1]
+        requests.get(repo + "/releases/latest", timeout=10)
+        response = requests.get(repo + "/commits", timeout=10)
+        response.json()[0]['commit']['committer']['date']
+
+
+def measure(github, label, check):
+    first = len(github.requests)
+    start = time.perf_counter()
+    check()
+    wall_time = time.perf_counter() - start
+    served = github.requests[first:]
+    body_bytes = sum(size for path, status, size in served)
+    print(f"{label:<34} {len(served):>5} requests {body_bytes / 1024:>9.1f} KB {wall_time * 1000:>9.0f} ms")
+    return body_bytes, wall_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mods', type=int, default=60, help="GitHub tracked mods")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds the stub waits before each answer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as mod_folder, FakeGitHub(fake_repos(args.mods), delay=args.latency) as github:
+        mods = {}
+        for number in range(args.mods):
+            file = f"mod{number}.mod"
+            with open(os.path.join(mod_folder, file), 'w') as f:
+                f.write(f'name = "Mod {number}"\n')
+            os.utime(os.path.join(mod_folder, file), (1577836800, 1577836800))  # Installed in 2020
+            mods[f"Mod {number}"] = {'file': file, 'github': f"https://github.com/owner/mod{number}", 'release': "v1"}
+
+        print(f"{args.mods} mods, {args.latency * 1000:.0f} ms stub latency")
+        before = measure(github, "full commit page, serial", lambda: original_check(mods, github.api_root))
+        measure(github, "per_page=1 probe, one worker", lambda: UpdateChecker(mods, mod_folder, api_root=github.api_root, max_workers=1).run())
+        after = measure(github, "per_page=1 probe, thread pool", lambda: UpdateChecker(mods, mod_folder, api_root=github.api_root).run())
+        print(f"{before[0] / after[0]:.1f}x fewer bytes, {before[1] / after[1]:.1f}x faster")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,28 @@
 import sys
+
+def headless(argv):
+    """Whether argv asks for the command line launcher, --preset NAME, --preset=NAME or its --help."""
+    return any(arg in ('--preset', '-h', '--help') or arg.startswith('--preset=') for arg in argv[1:])
+
+if __name__ == '__main__' and headless(sys.argv):
+    # Headless launch, decided before anything of Qt is imported
+    from scr.cli import main
+    sys.exit(main(sys.argv[1:]))
+
 from PyQt6.QtWidgets import (
     QApplication
 )
 
 from PyQt6.QtGui import QIcon
 
-from scr.mainWindow import *
+from scr import profiling
+
+# --profile writes a Chrome trace of the session on exit, --cprofile adds a cProfile dump of the main thread
+if '--profile' in sys.argv or '--cprofile' in sys.argv:
+    profiling.enable(use_cprofile='--cprofile' in sys.argv)
+
+with profiling.span('import mainWindow'):
+    from scr.mainWindow import GameLauncher
 
 def apply_dark_theme(app):
     dark_style = """
@@ -46,6 +63,8 @@ if __name__ == '__main__':
     ex = GameLauncher()
     apply_dark_theme(app)
     ex.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    profiling.finish()
+    sys.exit(exit_code)
 
 
@@ -0,0 +1,91 @@
+import os
+import time
+import uuid
+
+from scr.paths import user_data_dir
+
+TRASH_DIR = ".tglauncher_trash"
+CACHE_FOLDERS = ["map", "gfx", "music"]
+PROGRESS_EVERY = 200  # Files deleted between two progress reports
+
+def trash_folder():
+    """Tombstones live next to the user dirs, on the same drive, so moving them there is a rename."""
+    return user_data_dir("", TRASH_DIR)
+
+def move_to_trash(folders):
+    """Renames the existing folders into a new tombstone and returns the paths left to delete.
+
+    If a folder cannot be renamed (another drive, permissions) its own path is returned
+    instead, so it still gets deleted in place.
+    """
+    tombstone = os.path.join(trash_folder(), f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}")
+    to_delete = []
+    for folder in folders:
+        if not os.path.exists(folder):
+            continue
+        try:
+            os.makedirs(tombstone, exist_ok=True)
+            target = os.path.join(tombstone, os.path.basename(folder))
+            os.rename(folder, target)
+            to_delete.append(target)
+        except OSError as e:
+            print(f"Could not move {folder} to the trash, deleting it in place: {e}")
+            to_delete.append(folder)
+    if os.path.isdir(tombstone):
+        to_delete.append(tombstone)  # Removes the tombstone itself once its contents are gone
+    return to_delete
+
+def delete_trees(paths, on_progress=None, cancelled=None):
+    """Deletes every path bottom-up and returns (files_deleted, bytes_freed).
+
+    on_progress(files_deleted, bytes_freed) is called every PROGRESS_EVERY files,
+    cancelled is an optional threading.Event that stops the deletion early.
+    """
+    files_deleted = 0
+    bytes_freed = 0
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        for root, dirs, files in os.walk(path, topdown=False):
+            if cancelled and cancelled.is_set():
+                return files_deleted, bytes_freed
+            for name in files:
+                file_path = os.path.join(root, name)
+                try:
+                    size = os.lstat(file_path).st_size
+                    os.unlink(file_path)
+                except OSError as e:
+                    print(f"Could not delete {file_path}: {e}")
+                    continue
+                files_deleted += 1
+                bytes_freed += size
+                if on_progress and files_deleted % PROGRESS_EVERY == 0:
+                    on_progress(files_deleted, bytes_freed)
+            for name in dirs:
+                try:
+                    os.rmdir(os.path.join(root, name))
+                except OSError:
+                    pass
+        try:
+            os.rmdir(path)
+        except OSError as e:
+            print(f"Could not delete {path}: {e}")
+    if on_progress:
+        on_progress(files_deleted, bytes_freed)
+    return files_deleted, bytes_freed
+
+def purge_trash():
+    """Deletes the tombstones a previous session did not get to finish."""
+    folder = trash_folder()
+    if not os.path.isdir(folder):
+        return 0, 0
+    # Only the tombstones present now, a cache clear started meanwhile deletes its own
+    leftovers = [os.path.join(folder, name) for name in os.listdir(folder)]
+    files_deleted, bytes_freed = delete_trees(leftovers)
+    try:
+        os.rmdir(folder)
+    except OSError:
+        pass
+    if files_deleted:
+        print(f"Deleted {files_deleted} leftover cache files, {bytes_freed / (1024 * 1024):.1f} MB freed.")
+    return files_deleted, bytes_freed
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import hashlib
+
+from scr.paths import user_data_dir, write_json_atomic
+from scr.cachecleaner import delete_trees
+
+SNAPSHOT_DIR = ".tglauncher_cache_snapshots"
+SNAPSHOT_INDEX = "snapshots.json"
+MARKER_FILE = ".tglauncher_cache_key"
+SNAPSHOT_FOLDERS = ["map", "gfx"]  # The folders the game rebuilds for a new mod combination
+DEFAULT_BUDGET_MB = 4096
+
+def selection_key(game_root, mods):
+    """Hashes the map and gfx file lists of the selected mods, given as (mod file, mod path) pairs.
+
+    Any file added, removed or updated in those folders gives a new key, so a stale
+    cache is never restored for a mod that changed.
+    """
+    digest = hashlib.sha1()
+    for mod_file, mod_path in mods:
+        digest.update(f"{mod_file}\0".encode('utf-8', 'surrogateescape'))
+        if not mod_path:
+            continue
+        for folder in SNAPSHOT_FOLDERS:
+            folder_path = os.path.join(game_root, mod_path, folder)
+            for root, dirs, files in os.walk(folder_path):
+                dirs.sort()
+                for name in sorted(files):
+                    stat = os.stat(os.path.join(root, name))
+                    relative_path = os.path.relpath(os.path.join(root, name), folder_path)
+                    digest.update(f"{folder}/{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()[:16]
+
+def folder_size(path):
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return size
+
+class CacheSnapshotStore:
+    """Keeps the game's map/gfx cache of each mod combination so switching back doesn't rebuild it.
+
+    The live cache of the previous combination is moved into the store and the cache of the
+    new one moved back in its place. Both live under Documents/Paradox Interactive/Victoria II,
+    so every move is a rename. Least recently used snapshots are deleted to stay under budget.
+    """
+
+    def __init__(self, user_dir, budget_mb=DEFAULT_BUDGET_MB):
+        self.cache_path = user_data_dir(user_dir)
+        self.store_path = user_data_dir("", SNAPSHOT_DIR, user_dir or "_default")
+        self.index_path = os.path.join(self.store_path, SNAPSHOT_INDEX)
+        self.budget = budget_mb * 1024 * 1024
+        self.snapshots = {}  # Dictionary to store {key: {'size': bytes, 'used_at': timestamp}}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                self.snapshots = json.load(f)
+        except FileNotFoundError:
+            self.snapshots = {}
+        except Exception as e:
+            print(f"Error loading the cache snapshot index: {e}")
+            self.snapshots = {}
+
+    def save(self):
+        os.makedirs(self.store_path, exist_ok=True)
+        write_json_atomic(self.index_path, self.snapshots, indent=4)
+
+    def live_key(self):
+        """Returns the key of the combination the live cache was built for, if the launcher knows it."""
+        try:
+            with open(os.path.join(self.cache_path, MARKER_FILE), 'r') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def set_live_key(self, key):
+        marker = os.path.join(self.cache_path, MARKER_FILE)
+        if key:
+            os.makedirs(self.cache_path, exist_ok=True)
+            with open(marker, 'w') as f:
+                f.write(key)
+        elif os.path.exists(marker):
+            os.remove(marker)
+
+    def move_folders(self, source, target):
+        moved = False
+        for folder in SNAPSHOT_FOLDERS:
+            source_folder = os.path.join(source, folder)
+            if os.path.isdir(source_folder):
+                os.makedirs(target, exist_ok=True)
+                target_folder = os.path.join(target, folder)
+                if os.path.exists(target_folder):
+                    delete_trees([target_folder])
+                os.rename(source_folder, target_folder)
+                moved = True
+        return moved
+
+    def prepare(self, key):
+        """Makes the live cache the one of key, returns True if its cache was already there or restored."""
+        current_key = self.live_key()
+        if current_key == key:
+            return True
+
+        if current_key:
+            snapshot_path = os.path.join(self.store_path, current_key)
+            if self.move_folders(self.cache_path, snapshot_path):
+                self.snapshots[current_key] = {'size': folder_size(snapshot_path), 'used_at': time.time()}
+
+        restored = False
+        snapshot_path = os.path.join(self.store_path, key)
+        if key in self.snapshots and not self.live_cache_exists():
+            restored = self.move_folders(snapshot_path, self.cache_path)
+            delete_trees([snapshot_path])
+            del self.snapshots[key]
+
+        # From here on the game builds the cache of key, a cache built before the launcher
+        # tracked it is adopted by this combination
+        self.set_live_key(key)
+        self.evict()
+        self.save()
+        return restored
+
+    def live_cache_exists(self):
+        return any(os.path.isdir(os.path.join(self.cache_path, folder)) for folder in SNAPSHOT_FOLDERS)
+
+    def evict(self):
+        """Deletes the least recently used snapshots until the store fits in the budget."""
+        total = sum(snapshot['size'] for snapshot in self.snapshots.values())
+        for key in sorted(self.snapshots, key=lambda key: self.snapshots[key]['used_at']):
+            if total <= self.budget:
+                break
+            total -= self.snapshots[key]['size']
+            delete_trees([os.path.join(self.store_path, key)])
+            del self.snapshots[key]
+            print(f"Evicted cache snapshot {key}")
@@ -0,0 +1,112 @@
+import os
+import argparse
+
+from scr.gameroot import find_game_root
+from scr.launcherconfig import LauncherConfig, CONFIG_FILE
+from scr.modindex import ModIndex
+from scr.depgraph import DependencyGraph
+from scr import gamelaunch
+from scr import processlaunch
+from scr import profiling
+from scr import validation
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="launcher",
+        description="Starts Victoria II with a saved preset, without opening the launcher window."
+    )
+    parser.add_argument('--preset', required=True, help="name of the preset to launch, as saved in the preset manager")
+    parser.add_argument('--dry-run', action='store_true', help="print what would be done and the game command, without changing or starting anything")
+    parser.add_argument('--game-root', help="Victoria II folder, found the same way as the launcher window does when left out")
+    parser.add_argument('--priority', choices=processlaunch.PRIORITIES, help="overrides the priority of the preset's launch policy")
+    parser.add_argument('--affinity', help="overrides the CPU affinity: least_loaded, all, a mask like 0x3 or a CPU list like 2,3")
+    parser.add_argument('--numa-node', type=int, help="keeps the game on the CPUs of this NUMA node")
+    parser.add_argument('--no-supervise', action='store_true', help="return right after starting the game instead of recording the session")
+    parser.add_argument('--profile', action='store_true', help="write a Chrome trace of the run to launcher_profile.json")
+    parser.add_argument('--cprofile', action='store_true', help="also dump cProfile stats to launcher_profile.prof")
+    return parser.parse_args(argv)
+
+def main(argv):
+    """Launches a preset from the command line, returns the process exit code."""
+    args = parse_args(argv)
+    if args.profile or args.cprofile:
+        profiling.enable(use_cprofile=args.cprofile)
+    try:
+        with profiling.span('cli launch'):
+            return launch_preset(args)
+    finally:
+        profiling.finish()
+
+def launch_preset(args):
+    game_root = os.path.abspath(args.game_root) if args.game_root else find_game_root()
+    if not game_root or not os.path.exists(os.path.join(game_root, "v2game.exe")):
+        print(f"Could not find the game executable in {game_root or 'any of the default folders'}, pass --game-root.")
+        return 1
+
+    mod_folder = os.path.join(game_root, "mod")
+    config_file = os.path.join(mod_folder, CONFIG_FILE)
+    if not os.path.exists(config_file):
+        print(f"No launcher config at {config_file}, save a preset from the launcher window first.")
+        return 1
+    config = LauncherConfig(config_file)
+    if config.load_error:
+        print(f"Could not read {config_file}, fix it or save a preset from the launcher window again: {config.load_error}")
+        return 1
+
+    presets = config.presets
+    if args.preset not in presets:
+        print(f"No preset named {args.preset!r}. Saved presets: {', '.join(sorted(presets)) or 'none'}")
+        return 1
+
+    mods = gamelaunch.read_mods(ModIndex(mod_folder).refresh())
+    missing = [mod for mod in presets[args.preset] if mod not in mods]
+    if missing:
+        print(f"Skipping mods of the preset that are not installed: {', '.join(missing)}")
+    graph = DependencyGraph({name: mod_info['dependencies'] for name, mod_info in mods.items()})
+    selected_mods = graph.load_order([mod for mod in presets[args.preset] if mod in mods])
+    for mod in selected_mods:
+        absent = [dep for dep in graph.transitive_dependencies(mod) if dep not in selected_mods]
+        if absent:
+            print(f"{mod} needs mods the preset doesn't include: {', '.join(absent)}")
+
+    user_dir = gamelaunch.user_dir_for(selected_mods, mods)
+    settings_file = gamelaunch.settings_path(user_dir)
+    argv = gamelaunch.game_argv(game_root, selected_mods, mods, config.wine_command)
+    policy = config.launch_policy(args.preset)
+    for key in ('priority', 'affinity', 'numa_node'):
+        if getattr(args, key) is not None:
+            policy[key] = getattr(args, key)
+
+    problems = validation.validate(game_root, selected_mods, mods, user_dir, graph)
+    for level, message in problems:
+        print(f"{level.capitalize()}: {message}")
+
+    if args.dry_run:
+        print(f"Mods in load order: {', '.join(selected_mods) or 'none'}")
+        print(f"Would set update_time={config.update_time:.6f} in {settings_file}")
+        if config.cache_snapshots:
+            print(f"Would prepare the map/gfx cache of {user_dir or 'the default user directory'}")
+        print(f"Launch policy: {policy}, CPUs {processlaunch.resolve_cpus(policy['affinity'], policy['numa_node']) or 'any'}")
+        print(gamelaunch.describe_command(argv))
+        return 0
+
+    if any(level == validation.ERROR for level, message in problems):
+        print("Not starting the game, fix the errors above first.")
+        return 1
+
+    try:
+        gamelaunch.patch_update_time(settings_file, config.update_time)
+    except OSError as e:
+        print(f"Could not update {settings_file}: {e}")
+    if config.cache_snapshots:
+        gamelaunch.prepare_cache(game_root, user_dir, selected_mods, mods, config.cache_budget_mb)
+
+    try:
+        process = gamelaunch.launch(game_root, argv, policy)
+    except OSError as e:
+        print(f"Could not start the game: {e}")
+        return 1
+    if config.supervise_sessions and not args.no_supervise:
+        print(f"Recording the session in {gamelaunch.session_history_path(game_root)} once the game exits")
+        gamelaunch.supervise(process, game_root, selected_mods, mods, args.preset, user_dir, config.load_ready_marker)
+    return 0
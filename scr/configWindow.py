@@ -1,105 +1,34 @@
 import os
-import shutil
-import json
+import threading
 
-class SettingsManager:
-    def __init__(self, settings_file):
-        self.settings_file = settings_file
-        self.settings = {}
-        self.load_settings()
-
-    def load_settings(self):
-        """Loads settings from the file into a dictionary."""
-        if not os.path.exists(self.settings_file):
-            self.create_default_settings()
-
-        self.settings = {}
-        
-        with open(self.settings_file, 'r') as file:
-            for line in file:
-                line = line.strip()
-                # Skip empty lines and lines with braces
-                if not line or line.startswith("{") or line.startswith("}"):
-                    continue
-                
-                if "=" in line:
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip().strip('"')  # Remove surrounding quotes if present
-                    self.settings[key] = value
-
-    def save_settings(self):
-        """Saves the current settings to the file."""
-        with open(self.settings_file, 'w') as file:
-            for key, value in self.settings.items():
-                file.write(f"{key}={value}\n")
-
-    def get_setting(self, key, default=None):
-        """Returns the value of a specific setting, or a default if not found."""
-        return self.settings.get(key, default)
-
-    def create_default_settings(self):
-        default_settings = """gui=
-            {
-            language=l_english
-            }
-            graphics=
-            {
-            size=
-            {
-                x=1920
-                y=1080
-            }
-
-            refreshRate=60
-            fullScreen=no
-            borderless=yes
-            shadows=no
-            shadowSize=2048
-            multi_sampling=0
-            anisotropic_filtering=0
-            gamma=50.000000
-            }
-            sound_fx_volume=100.000000
-            music_volume=100.000000
-            scroll_speed=50.000000
-            camera_rotation_speed=50.000000
-            zoom_speed=50.000000
-            mouse_speed=50.000000
-            master_volume=100.000000
-            ambient_volume=50.000000
-            mapRenderingOptions=
-            {
-            renderTrees=yes
-            onmap=yes
-            simpleWater=no
-            counter_distance=300.000000
-            text_height=300.000000
-            sea_text_alpha=120
-            details=1.000
-            }
-            lastplayer="Player"
-            lasthost=""
-            serveradress="diplomacy.valkyrienet.com"
-            debug_saves=0
-            autosave="YEARLY"
-            simple=no
-            categories=
-            {
-            1 1 1 1 1 1 }
-            update_time=1.000000
-            shortcut=yes
-            """
-        with open(self.settings_file, 'w') as file:
-            file.write(default_settings)
+from scr.settingsmanager import SettingsManager
+from scr.paths import user_data_dir
+from scr import cachecleaner
+from scr.cachesnapshots import CacheSnapshotStore
+from scr.saveindex import SAVE_FOLDER
 
 from PyQt6.QtWidgets import (
     QHBoxLayout, QVBoxLayout, QDialog, QFormLayout, QLineEdit, QSlider,
-    QPushButton, QMessageBox, QCheckBox, QComboBox
+    QPushButton, QMessageBox, QCheckBox, QComboBox, QProgressDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, QUrl, pyqtSignal
+from PyQt6.QtGui import QDesktopServices
 import os
 
+class CacheClearWorker(QThread):
+    """Deletes the tombstoned cache folders in the background."""
+    progress = pyqtSignal(int, int)
+    done = pyqtSignal(int, int)
+
+    def __init__(self, paths, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.cancelled = threading.Event()
+
+    def run(self):
+        files_deleted, bytes_freed = cachecleaner.delete_trees(self.paths, self.progress.emit, self.cancelled)
+        self.done.emit(files_deleted, bytes_freed)
+
 class ConfigDialog(QDialog):
     def __init__(self, current_root, parent, user_dir):
         super().__init__(parent)
@@ -116,7 +45,7 @@ class ConfigDialog(QDialog):
         )
         self.game_root = current_root
         self.user_dir = user_dir
-        self.launcher_settings_file = os.path.join(self.game_root, "mod", "launcher_configs.json")
+        self.config = parent.config
         self.settings_manager = SettingsManager(self.settings_path)
         self.initUI()
 
@@ -126,9 +55,6 @@ class ConfigDialog(QDialog):
 
         print(self.user_dir)
 
-        with open(self.launcher_settings_file, 'r') as file:
-            launcher_config = json.load(file)
-        
         # Screen Resolution
         self.resolution_input = QComboBox()
         self.resolution_input.addItem("3840x2160")
@@ -140,21 +66,21 @@ class ConfigDialog(QDialog):
         self.resolution_input.addItem("1024x600")
         self.resolution_input.addItem("800x600")
 
-        self.resolution_input.setCurrentText(f"{self.settings_manager.get_setting('x')}x{self.settings_manager.get_setting('y')}")
+        self.resolution_input.setCurrentText(f"{self.settings_manager.get_setting('graphics.size.x')}x{self.settings_manager.get_setting('graphics.size.y')}")
         layout.addRow("Screen Resolution:", self.resolution_input)
 
 
         # Fullscreen and Borderless
         self.fullscreen_checkbox = QCheckBox("Fullscreen")
-        self.fullscreen_checkbox.setChecked(self.settings_manager.get_setting("fullScreen") == "yes")
+        self.fullscreen_checkbox.setChecked(self.settings_manager.get_setting("graphics.fullScreen") == "yes")
         self.borderless_checkbox = QCheckBox("Borderless")
-        self.borderless_checkbox.setChecked(self.settings_manager.get_setting("borderless") == "yes")
+        self.borderless_checkbox.setChecked(self.settings_manager.get_setting("graphics.borderless") == "yes")
         layout.addRow(self.fullscreen_checkbox)
         layout.addRow(self.borderless_checkbox)
 
         #Intro
         self.skip_intro_checkbox = QCheckBox("Skip Intro")
-        self.skip_intro_checkbox.setChecked(int(launcher_config["skipintro"]))
+        self.skip_intro_checkbox.setChecked(self.config.skipintro)
         layout.addRow(self.skip_intro_checkbox)
 
         # Sound Volume
@@ -201,15 +127,23 @@ class ConfigDialog(QDialog):
         layout.addRow(self.debug_saves_checkbox)
 
         self.realtime_mode_checkbox = QCheckBox("Realtime Priority Mode")
-        self.realtime_mode_checkbox.setChecked(int(launcher_config["realtime"]))
+        self.realtime_mode_checkbox.setChecked(self.config.realtime)
         layout.addRow(self.realtime_mode_checkbox)
 
         self.update_time_slider = QSlider(Qt.Orientation.Horizontal)
         self.update_time_slider.setMinimum(1)
         self.update_time_slider.setMaximum(100)
-        self.update_time_slider.setValue(int(float(launcher_config["update_time"])))
+        self.update_time_slider.setValue(int(self.config.update_time))
         layout.addRow("Update Time:", self.update_time_slider)
 
+        self.cache_snapshots_checkbox = QCheckBox("Keep Map Cache per Mod Combination")
+        self.cache_snapshots_checkbox.setChecked(self.config.cache_snapshots)
+        layout.addRow(self.cache_snapshots_checkbox)
+
+        self.supervise_sessions_checkbox = QCheckBox("Record Game Sessions")
+        self.supervise_sessions_checkbox.setChecked(self.config.supervise_sessions)
+        layout.addRow(self.supervise_sessions_checkbox)
+
         # Clean Cache
         self.clean_cache_button = QPushButton("Clear Cache")
         self.clean_cache_button.clicked.connect(self.clear_cache)
@@ -235,8 +169,8 @@ class ConfigDialog(QDialog):
         
     def save_settings(self):
         updated_settings = {
-            'fullScreen': "yes" if self.fullscreen_checkbox.isChecked() else "no",
-            'borderless': "yes" if self.borderless_checkbox.isChecked() else "no",
+            'graphics.fullScreen': "yes" if self.fullscreen_checkbox.isChecked() else "no",
+            'graphics.borderless': "yes" if self.borderless_checkbox.isChecked() else "no",
             'sound_fx_volume': f"{self.sound_fx_slider.value():.6f}",
             'music_volume': f"{self.music_volume_slider.value():.6f}",
             'master_volume': f"{self.master_volume_slider.value():.6f}",
@@ -244,47 +178,28 @@ class ConfigDialog(QDialog):
             'lastplayer': self.lastplayer_input.text(),
             'autosave': self.autosave_input.currentText(),
             'debug_saves': "1" if self.debug_saves_checkbox.isChecked() else "0",
-            '	x': self.resolution_input.currentText().split('x')[0],
-            '	y': self.resolution_input.currentText().split('x')[1],
+            'graphics.size.x': self.resolution_input.currentText().split('x')[0],
+            'graphics.size.y': self.resolution_input.currentText().split('x')[1],
         }
 
-        # Read the existing settings
-        with open(self.settings_path, 'r') as file:
-            lines = file.readlines()
-
-        # Replace or update lines that start with the keys
-        for key, value in updated_settings.items():
-            for i in range(len(lines)):
-                if lines[i].startswith(key):
-                    lines[i] = f"{key}={value}\n"
-                    break
-
-        # Write the updated lines back to the file
-        with open(self.settings_path, 'w') as file:
-            file.writelines(lines)
+        # Only the edited values are rewritten, the rest of settings.txt stays as the game wrote it
+        for path, value in updated_settings.items():
+            self.settings_manager.set_setting(path, value)
+        self.settings_manager.save_settings()
 
-        # Update the update_time in the launcher config file
-        with open(self.launcher_settings_file, 'r') as file:
-            launcher_config = json.load(file)
-
-        launcher_config["update_time"] = f"{self.update_time_slider.value()}"
-        launcher_config["realtime"] = "1" if self.realtime_mode_checkbox.isChecked() else "0"
-        launcher_config["skipintro"] = "1" if self.skip_intro_checkbox.isChecked() else "0"
-        with open(self.launcher_settings_file, 'w') as file:
-            json.dump(launcher_config, file, indent=4)
+        # Update the launcher options, the main window writes them to launcher_configs.json
+        self.config.update_time = self.update_time_slider.value()
+        self.config.realtime = self.realtime_mode_checkbox.isChecked()
+        self.config.skipintro = self.skip_intro_checkbox.isChecked()
+        self.config.cache_snapshots = self.cache_snapshots_checkbox.isChecked()
+        self.config.supervise_sessions = self.supervise_sessions_checkbox.isChecked()
 
         self.skip_intro_change(self.skip_intro_checkbox.isChecked())
 
         self.accept()
 
     def clear_cache(self):
-        cache_path = os.path.join(
-            os.path.expanduser("~"),
-            "Documents",
-            "Paradox Interactive",
-            "Victoria II",
-            self.user_dir
-        )
+        cache_path = user_data_dir(self.user_dir)
         map_folder = os.path.join(cache_path, "map")
         gfx_folder = os.path.join(cache_path, "gfx")
         music_folder = os.path.join(cache_path, "music")
@@ -300,26 +215,44 @@ class ConfigDialog(QDialog):
         print(cache_path)
 
         if confirm_msg == QMessageBox.StandardButton.Yes:
-            for folder in [map_folder, gfx_folder, music_folder]:
-                if os.path.exists(folder):
-                    shutil.rmtree(folder)
+            # Renaming is instant, the cache is already gone for the game once this returns
+            to_delete = cachecleaner.move_to_trash([map_folder, gfx_folder, music_folder])
+            CacheSnapshotStore(self.user_dir).set_live_key(None)  # The live cache no longer belongs to any mod combination
+            if to_delete:
+                self.delete_in_background(to_delete)
             print("Cache cleared.")
         else:
             print("Cache clear cancelled.")
 
+    def delete_in_background(self, paths):
+        """Deletes the old cache on a worker owned by the main window, so closing this dialog doesn't stop it."""
+        owner = self.parent()
+        progress_dialog = QProgressDialog("Deleting the old cache...", "Hide", 0, 0, owner)
+        progress_dialog.setWindowTitle("Clear Cache")
+        progress_dialog.setMinimumDuration(500)
+        worker = CacheClearWorker(paths, owner)
+        owner.cache_clear_workers.append(worker)  # Cancelled and waited for when the launcher closes
+
+        def on_progress(files_deleted, bytes_freed):
+            progress_dialog.setLabelText(f"Deleting the old cache... {files_deleted} files, {bytes_freed / (1024 * 1024):.1f} MB freed")
+
+        def on_done(files_deleted, bytes_freed):
+            progress_dialog.close()
+            print(f"Cache deleted: {files_deleted} files, {bytes_freed / (1024 * 1024):.1f} MB freed.")
+            if owner.isVisible():
+                QMessageBox.information(owner, "Clear Cache", f"Cache cleared, {bytes_freed / (1024 * 1024):.1f} MB freed.")
+            if worker in owner.cache_clear_workers:
+                owner.cache_clear_workers.remove(worker)
+            worker.deleteLater()
+
+        worker.progress.connect(on_progress)
+        worker.done.connect(on_done)
+        worker.start()
+
     def open_saves(self):
-        saves_folder = os.path.join(
-            os.path.expanduser("~"),
-            "Documents",
-            "Paradox Interactive",
-            "Victoria II",
-            self.user_dir,
-            "save games"
-        )
-        if not os.path.exists(saves_folder):
-            os.mkdir(saves_folder)
-        else:
-            os.startfile(saves_folder)
+        saves_folder = user_data_dir(self.user_dir, SAVE_FOLDER)
+        os.makedirs(saves_folder, exist_ok=True)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(saves_folder))
 
     def skip_intro_change(self, checked):
         movie_folder = os.path.join(self.game_root, "movies")
@@ -0,0 +1,122 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scr import profiling
+from scr.paths import write_json_atomic, load_versioned_json
+
+INDEX_FILE = "launcher_conflicts.json"
+INDEX_VERSION = 1
+MAX_WALK_WORKERS = 4
+
+def walk_mod(mod_dir, cached_dirs):
+    """Lists every file of a mod, reusing the listing of each directory whose mtime didn't change.
+
+    A directory's mtime changes whenever an entry is added, removed or renamed in it, so
+    unchanged directories only cost a stat. Returns {relative dir: {'mtime_ns', 'files', 'subdirs'}}.
+    """
+    dirs = {}
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        path = os.path.join(mod_dir, relative_dir) if relative_dir else mod_dir
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        cached = cached_dirs.get(relative_dir)
+        if cached and cached['mtime_ns'] == mtime_ns:
+            files, subdirs = cached['files'], cached['subdirs']
+        else:
+            files, subdirs = [], []
+            try:
+                with os.scandir(path) as scan:
+                    for entry in scan:
+                        if entry.name.startswith('.'):
+                            continue  # .git and friends are never loaded by the game
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        else:
+                            files.append(entry.name)
+            except OSError as e:
+                print(f"Could not list {path}: {e}")
+                continue
+        dirs[relative_dir] = {'mtime_ns': mtime_ns, 'files': files, 'subdirs': subdirs}
+        stack.extend(f"{relative_dir}/{name}" if relative_dir else name for name in subdirs)
+    return dirs
+
+class ConflictIndex:
+    """Which relative file paths each mod folder contains, persisted in the mod folder.
+
+    refresh() walks the mods on a thread pool, conflicts() then answers from memory
+    which files of a selection are provided by more than one mod.
+    """
+
+    def __init__(self, game_root, index_file=INDEX_FILE):
+        self.game_root = game_root
+        self.index_path = os.path.join(game_root, "mod", index_file)
+        self.mods = {}  # Dictionary to store {mod path: walk_mod result}
+        self.file_sets = {}  # Dictionary to store {mod path: set of lower case relative file paths}
+        self.load()
+
+    def load(self):
+        data = load_versioned_json(self.index_path, INDEX_VERSION, "conflict index")
+        self.mods = data.get('mods', {}) if data else {}
+
+    def save(self):
+        try:
+            write_json_atomic(self.index_path, {'version': INDEX_VERSION, 'mods': self.mods})
+        except Exception as e:
+            print(f"Error saving the conflict index: {e}")
+
+    @profiling.traced('conflict index refresh')
+    def refresh(self, mod_paths):
+        """Brings the listing of the given mod paths (like 'mod/HPM') up to date."""
+        start_time = time.perf_counter()
+        mod_paths = [mod_path for mod_path in dict.fromkeys(mod_paths) if mod_path]
+        if not mod_paths:
+            return
+
+        def walk(mod_path):
+            return walk_mod(os.path.join(self.game_root, mod_path), self.mods.get(mod_path, {}))
+
+        with ThreadPoolExecutor(max_workers=min(MAX_WALK_WORKERS, len(mod_paths))) as executor:
+            results = list(executor.map(walk, mod_paths))
+
+        changed = False
+        for mod_path, dirs in zip(mod_paths, results):
+            if dirs != self.mods.get(mod_path):
+                self.mods[mod_path] = dirs
+                self.file_sets.pop(mod_path, None)
+                changed = True
+        if changed:
+            self.save()
+        print(f"Conflict index: {len(mod_paths)} mods refreshed in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+
+    def files(self, mod_path):
+        """Returns the set of relative file paths of a mod, lower case since the game runs on Windows."""
+        if mod_path not in self.file_sets:
+            files = set()
+            for relative_dir, listing in self.mods.get(mod_path, {}).items():
+                prefix = f"{relative_dir.lower()}/" if relative_dir else ""
+                files.update(prefix + name.lower() for name in listing['files'])
+            self.file_sets[mod_path] = files
+        return self.file_sets[mod_path]
+
+    def conflicts(self, selection):
+        """Returns {relative path: [mod names]} for files provided by more than one selected mod.
+
+        selection is a list of (mod name, mod path) pairs, the mods of each conflict
+        are listed in selection order.
+        """
+        # Set operations find the shared paths, only those are then looked up in every mod
+        seen = set()
+        shared = set()
+        for mod_name, mod_path in selection:
+            files = self.files(mod_path)
+            shared |= seen & files
+            seen |= files
+        return {
+            path: [mod_name for mod_name, mod_path in selection if path in self.files(mod_path)]
+            for path in sorted(shared)
+        }
@@ -0,0 +1,109 @@
+class DependencyGraph:
+    """The dependencies between mods, as read from their descriptors.
+
+    Every walk is iterative and visits each mod and dependency once, so large mod
+    folders with long dependency chains stay linear and never hit the recursion limit.
+    """
+
+    def __init__(self, dependencies):
+        # Dictionary to store {mod_name: [dependencies]}, duplicates removed but order kept
+        self.dependencies = {mod: list(dict.fromkeys(deps)) for mod, deps in dependencies.items()}
+
+    def missing_dependencies(self):
+        """Returns {mod: [dependencies that are not installed]} for every mod missing something."""
+        missing = {}
+        for mod, deps in self.dependencies.items():
+            absent = [dep for dep in deps if dep not in self.dependencies]
+            if absent:
+                missing[mod] = absent
+        return missing
+
+    def transitive_dependencies(self, mod):
+        """Returns every installed mod that mod needs, directly or through another dependency."""
+        found = []
+        seen = {mod}
+        stack = [mod]
+        while stack:
+            for dep in self.dependencies.get(stack.pop(), []):
+                if dep not in seen and dep in self.dependencies:
+                    seen.add(dep)
+                    found.append(dep)
+                    stack.append(dep)
+        return found
+
+    def find_cycles(self):
+        """Returns the groups of mods that depend on each other in a loop (Tarjan's algorithm)."""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        component_stack = []
+        cycles = []
+        counter = 0
+
+        for root in self.dependencies:
+            if root in index:
+                continue
+            work = [(root, iter(self.dependencies[root]))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            component_stack.append(root)
+            on_stack.add(root)
+            while work:
+                mod, deps = work[-1]
+                for dep in deps:
+                    if dep not in self.dependencies:
+                        continue
+                    if dep not in index:
+                        index[dep] = lowlink[dep] = counter
+                        counter += 1
+                        component_stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.dependencies[dep])))
+                        break
+                    if dep in on_stack:
+                        lowlink[mod] = min(lowlink[mod], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[mod])
+                    if lowlink[mod] == index[mod]:
+                        component = []
+                        while True:
+                            member = component_stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == mod:
+                                break
+                        if len(component) > 1 or mod in self.dependencies[mod]:
+                            cycles.append(component[::-1])
+        return cycles
+
+    def load_order(self, mods):
+        """Orders mods so every dependency comes before the mods that need it.
+
+        Dependencies reached through mods that aren't in mods count too, only mods is
+        returned. Mods that don't depend on each other keep the order they were given in.
+        A dependency loop can't be ordered, its mods stay in the order they were reached.
+        """
+        selected = set(mods)
+        order = []
+        state = {}  # 1 while a mod's dependencies are being visited, 2 once it is placed
+        for root in mods:
+            if state.get(root):
+                continue
+            state[root] = 1
+            work = [(root, iter(self.dependencies.get(root, [])))]
+            while work:
+                mod, deps = work[-1]
+                for dep in deps:
+                    if (dep in self.dependencies or dep in selected) and not state.get(dep):
+                        state[dep] = 1
+                        work.append((dep, iter(self.dependencies.get(dep, []))))
+                        break
+                else:
+                    work.pop()
+                    state[mod] = 2
+                    if mod in selected:
+                        order.append(mod)
+        return order
@@ -0,0 +1,106 @@
+import os
+import shlex
+import subprocess
+
+from scr import paradoxscript
+from scr import processlaunch
+from scr.gameroot import GAME_EXECUTABLE
+from scr.paths import user_data_dir
+from scr.cachesnapshots import CacheSnapshotStore, selection_key
+from scr.supervisor import SessionSupervisor, HISTORY_FILE
+from scr.loadtiming import LOG_FOLDER, mod_fingerprints
+
+def read_mods(entries):
+    """Turns mod index entries into {mod name: info}, in filename order. Unnamed descriptors are skipped."""
+    mods = {}
+    for file, entry in entries.items():
+        name = entry['name']
+        if name:
+            mods[name] = {
+                'file': file,
+                'github': entry['github'] if entry['github'] else None,
+                'release': entry['version'] if entry['version'] else None,
+                'path': entry['path'],
+                'user_dir': entry['user_dir'],
+                'dependencies': entry['dependencies']
+            }
+    return mods
+
+def user_dir_for(selected_mods, mods):
+    """The game uses the user_dir of the last selected mod that sets one."""
+    user_dirs = [mods[mod]['user_dir'] for mod in selected_mods if mods[mod]['user_dir']]
+    return user_dirs[-1] if user_dirs else ""
+
+def settings_path(user_dir):
+    return user_data_dir(user_dir, "settings.txt")
+
+def patch_update_time(settings_file, update_time):
+    """Writes the launcher's update_time into settings.txt, the game resets it on every start.
+
+    The file is left alone when it already has the value, or when it doesn't exist yet
+    and the game is about to create it.
+    """
+    if not os.path.exists(settings_file):
+        print(f"No settings file at {settings_file} yet, update_time is set once the game created it")
+        return False
+    document = paradoxscript.load(settings_file)
+    document.set('update_time', f"{update_time:.6f}")
+    if document.changed:
+        paradoxscript.save(document, settings_file)
+    return document.changed
+
+def snapshot_key(game_root, selected_mods, mods):
+    """The cache snapshot key of a mod combination, it reads every map and gfx file of the mods."""
+    return selection_key(game_root, [(mods[mod]['file'], mods[mod]['path']) for mod in selected_mods])
+
+def prepare_cache(game_root, user_dir, selected_mods, mods, budget_mb, key=None):
+    """Swaps in the map/gfx cache the game built the last time this mod combination was played.
+
+    key is the snapshot_key of the mods when it is already known.
+    """
+    try:
+        if key is None:
+            key = snapshot_key(game_root, selected_mods, mods)
+        store = CacheSnapshotStore(user_dir, budget_mb)
+        if store.prepare(key):
+            print(f"Reusing the cache of mod combination {key}")
+    except Exception as e:
+        # A cache problem only costs a rebuild, it must never stop the game from starting
+        print(f"Error preparing the cache snapshot: {e}")
+
+def game_argv(game_root, selected_mods, mods, wine_command=""):
+    """Returns the argument list starting v2game.exe with the selected mods, already in load order.
+
+    Outside Windows the game runs through wine_command, e.g. 'wine' or a Proton wrapper.
+    """
+    argv = [os.path.join(game_root, GAME_EXECUTABLE)]
+    argv += [f"-mod=mod/{mods[mod]['file']}" for mod in selected_mods]
+    if os.name != 'nt' and wine_command:
+        argv = shlex.split(wine_command) + argv
+    return argv
+
+def describe_command(argv):
+    return subprocess.list2cmdline(argv) if os.name == 'nt' else shlex.join(argv)
+
+def launch(game_root, argv, policy):
+    """Starts the game from game_root with a launch policy, returns the process."""
+    cpus = processlaunch.resolve_cpus(policy.get('affinity'), policy.get('numa_node'))
+    print(f"Starting {describe_command(argv)} with {policy.get('priority')} priority on CPUs {cpus if cpus else 'any'}")
+    return processlaunch.start_process(argv, game_root, policy.get('priority', 'high'), cpus)
+
+def session_history_path(game_root):
+    return os.path.join(game_root, "mod", HISTORY_FILE)
+
+def supervise(process, game_root, selected_mods, mods, preset, user_dir, ready_marker=""):
+    """Follows the started game on a background thread and records the session when it exits.
+
+    The session keeps the fingerprints of the mods, so a slower load can be traced to a mod update.
+    """
+    supervisor = SessionSupervisor(
+        process, selected_mods, session_history_path(game_root), preset, user_dir,
+        log_folder=user_data_dir(user_dir, LOG_FOLDER),
+        ready_marker=ready_marker,
+        fingerprints=mod_fingerprints(game_root, selected_mods, mods)
+    )
+    supervisor.start()
+    return supervisor
@@ -0,0 +1,189 @@
+import os
+import re
+import sys
+import json
+import time
+import queue
+import threading
+
+from scr.paths import write_json_atomic
+
+GAME_EXECUTABLE = "v2game.exe"
+STEAM_GAME_FOLDER = "Victoria 2"  # Folder name under steamapps/common
+ROOT_CACHE_FILE = "game_root.json"
+PROBE_TIMEOUT = 2.0  # Seconds, a drive that hasn't answered by then is given up on
+
+DEFAULT_GAME_ROOTS = [
+    r"C:\Program Files (x86)\Steam\steamapps\common\Victoria 2",
+    r"D:\Program Files (x86)\Steam\steamapps\common\Victoria 2",
+    r"D:\GOG Games\Victoria II",
+    r"C:\GOG Games\Victoria II"
+]
+
+VDF_TOKEN_RE = re.compile(r'"((?:\\.|[^"\\])*)"|([{}])')
+
+def cache_dir():
+    """The launcher's per user folder, %APPDATA%/TGLauncher on Windows and ~/.config/TGLauncher elsewhere."""
+    base = os.environ.get('APPDATA') or os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "TGLauncher")
+
+def has_game(folder):
+    return os.path.isfile(os.path.join(folder, GAME_EXECUTABLE))
+
+def load_cached_root():
+    try:
+        with open(os.path.join(cache_dir(), ROOT_CACHE_FILE), 'r') as f:
+            return json.load(f).get('game_root')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def save_cached_root(game_root):
+    folder = cache_dir()
+    cache_file = os.path.join(folder, ROOT_CACHE_FILE)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        write_json_atomic(cache_file, {'game_root': game_root})
+    except OSError as e:
+        print(f"Could not remember the game root: {e}")
+
+def parse_vdf(text):
+    """Parses Valve's KeyValues text format ("key" "value" and "key" { ... }) into nested dicts."""
+    root = {}
+    stack = [root]
+    key = None
+    for match in VDF_TOKEN_RE.finditer(text):
+        string, brace = match.groups()
+        if brace == '{':
+            block = {}
+            if key is not None:
+                stack[-1][key] = block
+            stack.append(block)
+            key = None
+        elif brace == '}':
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif key is None:
+            key = re.sub(r'\\(.)', r'\1', string)
+        else:
+            stack[-1][key] = re.sub(r'\\(.)', r'\1', string)
+            key = None
+    return root
+
+def steam_install_dirs():
+    """Where Steam itself is usually installed, its libraryfolders.vdf lists the other libraries."""
+    home = os.path.expanduser("~")
+    dirs = [
+        os.path.join(os.environ.get('ProgramFiles(x86)', r"C:\Program Files (x86)"), "Steam"),
+        os.path.join(os.environ.get('ProgramFiles', r"C:\Program Files"), "Steam"),
+        os.path.join(home, ".steam", "steam"),
+        os.path.join(home, ".local", "share", "Steam"),
+        os.path.join(home, "Library", "Application Support", "Steam")
+    ]
+    return list(dict.fromkeys(dirs))
+
+def steam_library_dirs(steam_dirs=None):
+    """Returns every Steam library folder, read from libraryfolders.vdf of each Steam install."""
+    libraries = []
+    for steam_dir in steam_install_dirs() if steam_dirs is None else steam_dirs:
+        if not os.path.isdir(steam_dir):
+            continue
+        libraries.append(steam_dir)
+        for vdf_path in (os.path.join(steam_dir, "steamapps", "libraryfolders.vdf"), os.path.join(steam_dir, "config", "libraryfolders.vdf")):
+            try:
+                with open(vdf_path, 'r', encoding='utf-8', errors='replace') as f:
+                    data = parse_vdf(f.read())
+            except OSError:
+                continue
+            for key, folders in data.items():
+                if key.lower() != 'libraryfolders' or not isinstance(folders, dict):
+                    continue
+                for name, folder in folders.items():
+                    if isinstance(folder, dict):
+                        # Current format: "0" { "path" "D:\\SteamLibrary" "apps" { ... } }
+                        path = next((value for field, value in folder.items() if field.lower() == 'path'), None)
+                    elif name.isdigit():
+                        path = folder  # Old format: "1" "D:\\SteamLibrary"
+                    else:
+                        path = None
+                    if path:
+                        libraries.append(path)
+    return list(dict.fromkeys(libraries))
+
+def run_with_timeout(function, timeout, default):
+    """Runs function on a daemon thread, returning default if it doesn't finish in time."""
+    results = queue.Queue()
+    threading.Thread(target=lambda: results.put(function()), daemon=True).start()
+    try:
+        return results.get(timeout=timeout)
+    except queue.Empty:
+        return default
+
+def probe(candidates, timeout=PROBE_TIMEOUT):
+    """Checks every candidate at once and returns the first one in list order that has the game.
+
+    Each check runs on its own daemon thread, so a drive that hangs only costs the timeout
+    and never keeps the launcher from exiting. A candidate is picked as soon as every
+    candidate before it has answered.
+    """
+    results = queue.Queue()
+    for candidate in candidates:
+        threading.Thread(target=lambda candidate=candidate: results.put((candidate, has_game(candidate))), daemon=True).start()
+
+    answers = {}
+    deadline = time.monotonic() + timeout
+    while len(answers) < len(candidates):
+        try:
+            candidate, found = results.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            print(f"Gave up on {len(candidates) - len(answers)} game folders that didn't answer in {timeout} s")
+            break
+        answers[candidate] = found
+        for candidate in candidates:
+            if candidate not in answers:
+                break
+            if answers[candidate]:
+                return candidate
+    return next((candidate for candidate in candidates if answers.get(candidate)), None)
+
+def candidate_roots(application_path, steam_dirs=None, timeout=PROBE_TIMEOUT):
+    """The other folders the game may be in: the launcher's parent folder, every Steam library, the usual spots."""
+    libraries = run_with_timeout(lambda: steam_library_dirs(steam_dirs), timeout, [])
+    candidates = [os.path.dirname(application_path)]
+    candidates += [os.path.join(library, "steamapps", "common", STEAM_GAME_FOLDER) for library in libraries]
+    candidates += DEFAULT_GAME_ROOTS
+
+    unique = {}
+    for candidate in candidates:
+        unique.setdefault(os.path.normcase(os.path.normpath(candidate)), candidate)
+    return list(unique.values())
+
+def find_game_root(application_path=None, steam_dirs=None, use_cache=True, timeout=PROBE_TIMEOUT):
+    """Returns the folder containing v2game.exe, or None.
+
+    The launcher's own folder comes first, as that is where it is meant to be installed.
+    Otherwise the last root found is remembered and checked with a single stat, the
+    candidates are only probed when it is gone.
+    """
+    if application_path is None:
+        # Get the directory of the running executable
+        application_path = os.path.dirname(os.path.abspath(sys.argv[0]))
+    print(f"Application path: {application_path}")  # Debug print
+    if has_game(application_path):
+        print(f"Found game root: {application_path}")  # Debug print
+        return application_path
+
+    if use_cache:
+        cached_root = load_cached_root()
+        if cached_root and has_game(cached_root):
+            print(f"Found game root: {cached_root} (remembered)")  # Debug print
+            return cached_root
+
+    candidates = candidate_roots(application_path, steam_dirs, timeout)
+    print(f"Checking {len(candidates)} folders: {', '.join(candidates)}")  # Debug print
+    game_root = probe(candidates, timeout)
+    if game_root:
+        print(f"Found game root: {game_root}")  # Debug print
+        if use_cache:
+            save_cached_root(game_root)
+    return game_root
@@ -0,0 +1,103 @@
+import json
+import time
+import threading
+
+from scr.paths import write_json_atomic
+
+DEFAULT_TTL = 15 * 60  # Seconds a cached response is trusted without asking GitHub again
+MAX_ENTRIES = 512
+
+class HttpCache:
+    """On-disk cache of GitHub API responses keyed by url.
+
+    Fresh entries (younger than ttl) are served without touching the network, stale ones
+    are revalidated with If-None-Match/If-Modified-Since so a 304 reuses the stored payload.
+    """
+
+    def __init__(self, cache_file, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Loads the cache file, a missing or corrupt file just starts an empty cache."""
+        try:
+            with open(self.cache_file, 'r') as f:
+                self.entries = json.load(f).get('entries', {})
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            print(f"Error loading the http cache, starting a new one: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Writes the cache to disk."""
+        with self.lock:
+            data = {'entries': dict(self.entries)}
+        try:
+            write_json_atomic(self.cache_file, data)
+        except Exception as e:
+            print(f"Error saving the http cache: {e}")
+
+    def stats(self):
+        """Returns the hit/revalidation/miss counters of this session."""
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses, 'entries': len(self.entries)}
+
+    def evict(self):
+        """Drops the least recently used entries until the cache fits in max_entries."""
+        overflow = len(self.entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self.entries, key=lambda url: self.entries[url].get('used_at', 0))[:overflow]
+            for url in oldest:
+                del self.entries[url]
+
+    def get_json(self, session, url, timeout=None):
+        """Returns the decoded JSON body of url, or None if GitHub did not answer with 200/304."""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry and now - entry.get('checked_at', 0) < self.ttl:
+                self.hits += 1
+                entry['used_at'] = now
+                return entry['payload']
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(url, headers=headers, timeout=timeout)
+
+        with self.lock:
+            if response.status_code == 304 and entry:
+                self.revalidated += 1
+                entry['checked_at'] = now
+                entry['used_at'] = now
+                return entry['payload']
+
+            self.misses += 1
+            if response.status_code == 200:
+                payload = response.json()
+            elif response.status_code == 404:
+                # Repositories without releases answer 404, remember that too
+                payload = None
+            else:
+                return None
+
+            self.entries[url] = {
+                'payload': payload,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'checked_at': now,
+                'used_at': now
+            }
+            self.evict()
+            return payload
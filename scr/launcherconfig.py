@@ -0,0 +1,208 @@
+import os
+import json
+import copy
+
+from scr import profiling
+from scr.paths import write_json_atomic
+
+CONFIG_FILE = "launcher_configs.json"
+BROKEN_SUFFIX = ".broken"  # An unreadable config is moved aside with this suffix before it is replaced
+
+DEFAULT_CONFIG = {
+    "checked_mods": [],
+    "update_time": 1,
+    "realtime": 0,
+    "skipintro": 0,
+    "update_cache_ttl": 900,
+    "cache_snapshots": 1,
+    "cache_budget_mb": 4096,
+    "presets": {},
+    "launch_policy": {"affinity": "least_loaded", "numa_node": None},
+    "preset_launch_policies": {},
+    "wine_command": "wine",
+    "supervise_sessions": 1,
+    "load_ready_marker": ""
+}
+
+def flag(value):
+    """Older configs store flags as 0/1 numbers, the dialogs as "0"/"1" strings."""
+    return str(value).strip() == "1"
+
+class LauncherConfig:
+    """The launcher_configs.json contents, loaded once per session and shared by every window.
+
+    Values are changed in memory through set() or the typed properties. Every change marks
+    the config dirty and notifies the subscribers, the main window then writes it with save().
+    """
+
+    def __init__(self, config_file):
+        self.config_file = config_file
+        self.data = {}
+        self.dirty = False
+        self.listeners = []
+        self.load_error = None  # Why the config file couldn't be read, the defaults are used then
+        self.load()
+
+    @profiling.traced('config load')
+    def load(self):
+        """Reads the config file, creating it with the default values if it doesn't exist."""
+        if not os.path.exists(self.config_file):
+            self.data = copy.deepcopy(DEFAULT_CONFIG)
+            self.dirty = True
+            self.save()
+            return
+        try:
+            with open(self.config_file, 'r') as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("it doesn't hold a JSON object")
+        except (OSError, ValueError) as e:
+            print(f"Error loading {self.config_file}, using the default settings: {e}")
+            self.load_error = str(e)
+            self.data = copy.deepcopy(DEFAULT_CONFIG)
+            self.dirty = False
+            return
+        self.data = data
+        for key, value in DEFAULT_CONFIG.items():
+            self.data.setdefault(key, copy.deepcopy(value))
+        self.dirty = False
+
+    def subscribe(self, callback):
+        """Registers callback(key), called after every change of a value."""
+        self.listeners.append(callback)
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        """Changes a value in memory, marking the config dirty only if it actually changed."""
+        if self.data.get(key) == value:
+            return
+        self.data[key] = value
+        self.dirty = True
+        for callback in self.listeners:
+            callback(key)
+
+    @profiling.traced('config save')
+    def save(self):
+        """Writes the config if it is dirty and returns whether it did."""
+        if not self.dirty:
+            return False
+        if self.load_error and os.path.exists(self.config_file):
+            # Never replace a file the user may have hand edited without keeping it
+            os.replace(self.config_file, self.config_file + BROKEN_SUFFIX)
+            print(f"Kept the unreadable config as {self.config_file + BROKEN_SUFFIX}")
+            self.load_error = None
+        write_json_atomic(self.config_file, self.data, indent=4)
+        self.dirty = False
+        return True
+
+    @property
+    def checked_mods(self):
+        return list(self.data.get('checked_mods', []))
+
+    @checked_mods.setter
+    def checked_mods(self, mods):
+        self.set('checked_mods', list(mods))
+
+    @property
+    def update_time(self):
+        return float(self.data.get('update_time', 1))
+
+    @update_time.setter
+    def update_time(self, value):
+        self.set('update_time', f"{value}")
+
+    @property
+    def realtime(self):
+        return flag(self.data.get('realtime', 0))
+
+    @realtime.setter
+    def realtime(self, enabled):
+        self.set('realtime', "1" if enabled else "0")
+
+    @property
+    def skipintro(self):
+        return flag(self.data.get('skipintro', 0))
+
+    @skipintro.setter
+    def skipintro(self, enabled):
+        self.set('skipintro', "1" if enabled else "0")
+
+    @property
+    def update_cache_ttl(self):
+        return float(self.data.get('update_cache_ttl', 900))
+
+    @property
+    def cache_snapshots(self):
+        return flag(self.data.get('cache_snapshots', 1))
+
+    @cache_snapshots.setter
+    def cache_snapshots(self, enabled):
+        self.set('cache_snapshots', "1" if enabled else "0")
+
+    @property
+    def cache_budget_mb(self):
+        return int(self.data.get('cache_budget_mb', 4096))
+
+    @property
+    def supervise_sessions(self):
+        """Whether the launcher follows the game until it exits and records the session."""
+        return flag(self.data.get('supervise_sessions', 1))
+
+    @supervise_sessions.setter
+    def supervise_sessions(self, enabled):
+        self.set('supervise_sessions', "1" if enabled else "0")
+
+    @property
+    def load_ready_marker(self):
+        """A regular expression for the log line written when the game reaches its main menu.
+
+        Left empty, the game counts as loaded once its logs stop being written.
+        """
+        return self.data.get('load_ready_marker', "")
+
+    @property
+    def presets(self):
+        """A copy of {preset name: [mod names]}, use save_preset/delete_preset to change it."""
+        return copy.deepcopy(self.data.get('presets', {}))
+
+    def save_preset(self, name, mods):
+        presets = self.presets
+        presets[name] = list(mods)
+        self.set('presets', presets)
+
+    def delete_preset(self, name):
+        presets = self.presets
+        if presets.pop(name, None) is not None:
+            self.set('presets', presets)
+        policies = copy.deepcopy(self.data.get('preset_launch_policies', {}))
+        if policies.pop(name, None) is not None:
+            self.set('preset_launch_policies', policies)
+
+    def preset_for(self, mods):
+        """Returns the name of the preset with exactly these mods, or None."""
+        mods = set(mods)
+        return next((name for name, preset_mods in self.data.get('presets', {}).items() if set(preset_mods) == mods), None)
+
+    def launch_policy(self, preset=None):
+        """Returns {'priority', 'affinity', 'numa_node'} for a launch, a preset's own policy overrides the default.
+
+        The priority defaults to the Realtime Priority Mode setting. affinity is 'least_loaded',
+        'all', a mask like '0x3' or a CPU list like '2,3'.
+        """
+        policy = {'priority': 'realtime' if self.realtime else 'high', 'affinity': 'least_loaded', 'numa_node': None}
+        policy.update(self.data.get('launch_policy') or {})
+        if preset:
+            policy.update(self.data.get('preset_launch_policies', {}).get(preset) or {})
+        return policy
+
+    def set_preset_launch_policy(self, name, policy):
+        policies = copy.deepcopy(self.data.get('preset_launch_policies', {}))
+        policies[name] = dict(policy)
+        self.set('preset_launch_policies', policies)
+
+    @property
+    def wine_command(self):
+        """The command the game runs through outside Windows, empty to run v2game.exe directly."""
+        return self.data.get('wine_command', "wine")
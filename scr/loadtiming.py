@@ -0,0 +1,137 @@
+import os
+import re
+import hashlib
+import statistics
+
+LOG_FOLDER = "logs"
+LOG_QUIET_SECONDS = 15.0  # The startup is over once the logs haven't been written for this long
+REGRESSION_FACTOR = 1.2  # A load this much slower than the usual one is flagged
+MIN_HISTORY = 2  # Earlier loads needed before a regression can be flagged
+
+def mod_set_key(mods):
+    """Identifies a set of checked mods, whatever their order."""
+    return hashlib.sha1("\0".join(sorted(mods)).encode('utf-8', 'surrogateescape')).hexdigest()[:12]
+
+def mod_fingerprint(game_root, mod_info):
+    """A cheap stamp of a mod's installed version, from its version and its folder timestamps.
+
+    Only the mod folder and its first level of folders are looked at, updating a mod
+    replaces files in them and so changes their timestamps.
+    """
+    digest = hashlib.sha1(f"{mod_info.get('release')}\0{mod_info.get('file')}\0".encode('utf-8', 'surrogateescape'))
+    if mod_info.get('path'):
+        mod_path = os.path.join(game_root, mod_info['path'])
+        try:
+            digest.update(f"{os.stat(mod_path).st_mtime_ns}\0".encode())
+            with os.scandir(mod_path) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):
+                    if entry.is_dir():
+                        digest.update(f"{entry.name}\0{entry.stat().st_mtime_ns}\0".encode('utf-8', 'surrogateescape'))
+        except OSError:
+            digest.update(b"missing")
+    return digest.hexdigest()[:12]
+
+def mod_fingerprints(game_root, selected_mods, mods):
+    return {mod: mod_fingerprint(game_root, mods[mod]) for mod in selected_mods if mod in mods}
+
+class LoadTimer:
+    """Finds when the game got to its main menu from the log files it writes while starting.
+
+    With a ready_marker (a regular expression) the game is ready on the first log line
+    matching it. Without one it is ready once the logs written since the spawn have been
+    quiet for quiet_seconds, at the time of the last write.
+    """
+
+    def __init__(self, log_folder, spawned_at, ready_marker="", quiet_seconds=LOG_QUIET_SECONDS):
+        self.log_folder = log_folder
+        self.spawned_at = spawned_at  # time.time() of the spawn, log timestamps are wall clock too
+        self.ready_marker = re.compile(ready_marker) if ready_marker else None
+        self.quiet_seconds = quiet_seconds
+        self.offsets = {}
+        self.last_write = None
+        self.load_time = None
+        self.detected_by = None
+
+    @property
+    def ready(self):
+        return self.load_time is not None
+
+    def poll(self, now):
+        """Checks the logs again, returns True once the load time is known."""
+        if self.ready:
+            return True
+        try:
+            with os.scandir(self.log_folder) as entries:
+                logs = [(entry.path, entry.stat()) for entry in entries if entry.is_file() and entry.name.endswith('.log')]
+        except OSError:
+            return False  # Not created yet
+
+        for path, stat in logs:
+            if stat.st_mtime < self.spawned_at:
+                continue  # Left over from an earlier session
+            self.last_write = max(self.last_write or 0, stat.st_mtime)
+            if self.ready_marker and self.read_marker(path, stat):
+                self.finish(stat.st_mtime, 'marker')
+                return True
+
+        if not self.ready_marker and self.last_write and now - self.last_write >= self.quiet_seconds:
+            self.finish(self.last_write, 'quiet logs')
+        return self.ready
+
+    def read_marker(self, path, stat):
+        """Reads what was added to a log since the last poll, returns True if it has the marker."""
+        offset = self.offsets.get(path, 0)
+        if stat.st_size < offset:
+            offset = 0  # The game truncates its logs when it starts
+        if stat.st_size == offset:
+            return False
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(stat.st_size - offset)
+        # Only whole lines are searched, a partly written one is read again next time
+        complete = data.rfind(b"\n") + 1
+        self.offsets[path] = offset + complete
+        text = data[:complete].decode('latin-1')
+        return any(self.ready_marker.search(line) for line in text.splitlines())
+
+    def finish(self, ready_at, detected_by):
+        self.load_time = round(max(0.0, ready_at - self.spawned_at), 1)
+        self.detected_by = detected_by
+
+def changed_mods(before, after):
+    """Returns the mods whose fingerprint differs between two {mod: fingerprint} maps."""
+    return sorted(mod for mod in after if before.get(mod) not in (None, after[mod]))
+
+def load_stats(sessions):
+    """Groups the recorded sessions by mod set, newest set first.
+
+    Each group is {'key', 'label', 'mods', 'sessions', 'loads', 'last', 'median', 'best',
+    'baseline', 'regression', 'changed_mods', 'crashes'}. last is compared with baseline, the
+    median of the earlier loads, changed_mods lists the mods updated between the last two loads.
+    """
+    groups = {}
+    for session in sessions:
+        mods = session.get('mods') or []
+        key = session.get('mod_set') or mod_set_key(mods)
+        group = groups.setdefault(key, {'key': key, 'label': "", 'mods': mods, 'sessions': [], 'crashes': 0})
+        group['sessions'].append(session)
+        if session.get('preset'):
+            group['label'] = session['preset']
+        if session.get('crashed'):
+            group['crashes'] += 1
+
+    for group in groups.values():
+        if not group['label']:
+            group['label'] = ", ".join(group['mods']) if group['mods'] else "No mods"
+        timed = [session for session in group['sessions'] if session.get('load_time') is not None]
+        loads = [session['load_time'] for session in timed]
+        group['loads'] = loads
+        group['last'] = loads[-1] if loads else None
+        group['best'] = min(loads) if loads else None
+        group['median'] = statistics.median(loads) if loads else None
+        earlier = loads[:-1]
+        group['baseline'] = statistics.median(earlier) if len(earlier) >= MIN_HISTORY else None
+        group['regression'] = group['baseline'] is not None and loads[-1] > group['baseline'] * REGRESSION_FACTOR
+        group['changed_mods'] = changed_mods(timed[-2].get('fingerprints') or {}, timed[-1].get('fingerprints') or {}) if len(timed) > 1 else []
+
+    return sorted(groups.values(), key=lambda group: group['sessions'][-1].get('started', 0), reverse=True)
@@ -1,20 +1,55 @@
 
 import os
-import json
-import sys
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QMessageBox, QLabel, QFileDialog,
-    QPushButton, QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator
+    QPushButton, QTreeView, QDialog, QApplication
 )
-from PyQt6.QtCore import Qt
-import subprocess
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, pyqtSlot
 import threading
 
 from PyQt6.QtGui import QIcon
 
-from scr.configWindow import *
-from scr.presetmanagerWindow import *
-from scr.updatesWindow import *
+from scr.modindex import ModIndex
+from scr.launcherconfig import LauncherConfig, CONFIG_FILE, BROKEN_SUFFIX
+from scr import cachecleaner
+from scr.conflictindex import ConflictIndex
+from scr.depgraph import DependencyGraph
+from scr.modmodel import ModRecord, ModTreeModel
+from scr.modwatcher import ModFolderWatcher
+from scr.gameroot import find_game_root
+from scr import gamelaunch
+from scr import validation
+from scr import profiling
+
+SAVE_DELAY_MS = 300
+VALIDATE_DELAY_MS = 300
+
+class ValidationWorker(QThread):
+    """Validates a mod selection off the GUI thread, see validation.validate.
+
+    With snapshots, the cache snapshot key of the selection is computed here too.
+    """
+    validated = pyqtSignal(int, object, object, object)  # mod index generation, cache key, problems, snapshot key or None
+
+    def __init__(self, generation, key, game_root, selected_mods, mods, user_dir, graph, snapshots=False, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.key = key
+        self.arguments = (game_root, selected_mods, mods, user_dir, graph)
+        self.snapshots = snapshots
+
+    def run(self):
+        try:
+            problems = validation.validate(*self.arguments)
+        except Exception as e:
+            problems = [(validation.WARNING, f"The mods could not be checked: {e}")]
+        snapshot_key = None
+        if self.snapshots:
+            try:
+                snapshot_key = gamelaunch.snapshot_key(*self.arguments[:3])
+            except Exception as e:
+                print(f"Error computing the cache snapshot key: {e}")
+        self.validated.emit(self.generation, self.key, problems, snapshot_key)
 
 class GameLauncher(QWidget):
 
@@ -24,49 +59,73 @@ class GameLauncher(QWidget):
 
         self.mod_files = {}  # Dictionary to store {display_name: filename}
         self.mod_dependencies = {}  # Dictionary to store {mod_name: [dependencies]}
-        
-        # Get the directory of the running executable
-        application_path = os.path.dirname(sys.argv[0])
-        print(f"Application path: {application_path}")  # Debug print
-
-        self.default_game_roots = [
-            application_path,
-            os.path.dirname(application_path),
-            r"C:\Program Files (x86)\Steam\steamapps\common\Victoria 2",
-            r"D:\Program Files (x86)\Steam\steamapps\common\Victoria 2",
-            r"D:\GOG Games\Victoria II",
-            r"C:\GOG Games\Victoria II"
-        ]
+        self.mod_user_dirs = {}  # Dictionary to store {mod_name: user_dir}
+        self.dependency_graph = DependencyGraph({})
+        self.mod_model = ModTreeModel(self)  # Mod records and their checked state
+        self.mod_index = None
+        self.mod_watcher = ModFolderWatcher(self)  # Reloads the mods when descriptors are added, edited or removed
+        self.mod_watcher.changed.connect(self.load_mods)
+        self.conflict_index = None
         
         self.game_root = None
-        for game_root in self.default_game_roots:
-            executable_path = os.path.join(game_root, "v2game.exe")
-            print(f"Checking: {executable_path}")  # Debug print
-            if os.path.exists(executable_path):
-                self.game_root = game_root
-                print(f"Found game root: {self.game_root}")  # Debug print
-                break
-        
+        self.config = None
+        self.user_dir = ""
+
+        # Changes are saved once the user stops clicking, not on every toggle
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.saveCheckedmods)
+
+        # The checked mods are validated in the background, so starting the game is only a cache lookup
+        self.validation_cache = validation.ValidationCache()
+        self.snapshot_keys = validation.ValidationCache()  # Cache snapshot keys, by the same keys and generation
+        self.validation_worker = None
+        self.validation_pending = False
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setSingleShot(True)
+        self.validation_timer.setInterval(VALIDATE_DELAY_MS)
+        self.validation_timer.timeout.connect(self.validate_selection)
+
+        self.cache_clear_workers = []  # Started by the config dialog, they outlive it
+
+        self.initUI()
+        self.started = False  # The game root and mods are loaded once the window is on screen
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.started:
+            self.started = True
+            # Queued behind the first paint, so the window appears before the disk is touched
+            QTimer.singleShot(0, self.start_launcher)
+
+    def start_launcher(self):
+        """Finds the game, then loads the config and the mods."""
+        profiling.mark('first paint')
+        with profiling.span('find_game_root'):
+            self.game_root = find_game_root()
         if not self.game_root:
             QMessageBox.critical(self, "Error", f"Could not find the game executable. Pleaase place this .exe in your Victoria II root folder, besides the v2game.exe file.")
             #self.game_root = self.get_game_root_from_user()
             if not self.game_root:
-                sys.exit(1)
-        
-        self.config_file = "launcher_configs.json"
+                QApplication.instance().exit(1)
+                return
+
+        self.config_file = CONFIG_FILE
         self.settings_file = os.path.join(self.game_root, "mod", self.config_file)
-        if not os.path.exists(self.settings_file):
-            with open(self.settings_file, 'w') as file:
-                json.dump({
-                    "checked_mods": [],
-                    "update_time": 1,
-                    "realtime": 0,
-                    "skipintro": 0,
-                    "presets": {}
-                }, file, indent=4)
-        self.initUI()
-        self.load_mods()
-        self.loadSettings()
+        self.config = LauncherConfig(self.settings_file)  # Shared by every dialog, only this window writes it
+        self.config.subscribe(self.on_config_changed)
+        if self.config.load_error:
+            QMessageBox.warning(
+                self, 'Error',
+                f"Error loading settings from {self.settings_file}: {self.config.load_error}\n\n"
+                f"The default settings are used. Your file is kept as {self.config_file}{BROKEN_SUFFIX} when the settings are next saved."
+            )
+
+        # Finish deleting caches a previous session left in the trash
+        threading.Thread(target=cachecleaner.purge_trash, daemon=True).start()
+
+        self.loadSettings()  # Also loads the mods, once the final game root is known
 
     def get_game_root_from_user(self):
         
@@ -84,12 +143,19 @@ class GameLauncher(QWidget):
         
         
         # Mod tree structure
-        self.mod_tree = QTreeWidget()
-        self.mod_tree.setHeaderLabels(['Mods'])
-        self.mod_tree.setDragDropMode(QTreeWidget.DragDropMode.InternalMove)
-        self.mod_tree.itemChanged.connect(self.on_item_changed)
+        self.mod_tree = QTreeView()
+        self.mod_tree.setUniformRowHeights(True)  # Lets the view lay out only the visible rows
+        self.mod_tree.setModel(self.mod_model)
+        self.mod_model.checked_changed.connect(self.on_mod_toggled)
+        self.mod_model.rowsInserted.connect(self.on_mod_rows_inserted)
         layout.addWidget(self.mod_tree)
 
+        # Problems found with the checked mods
+        self.validation_label = QLabel()
+        self.validation_label.setWordWrap(True)
+        self.validation_label.hide()
+        layout.addWidget(self.validation_label)
+
         # Buttons
         buttons_layout = QHBoxLayout()
         buttons_layout.addStretch()
@@ -112,6 +178,12 @@ class GameLauncher(QWidget):
         self.config_button.setFixedSize(100, 30)
         buttons_layout.addWidget(self.config_button)
 
+        # Saves button
+        self.saves_button = QPushButton('Saves')
+        self.saves_button.setFixedSize(100, 30)
+        self.saves_button.clicked.connect(self.open_saves_dialog)
+        buttons_layout.addWidget(self.saves_button)
+
         layout.addLayout(buttons_layout)
 
         buttons_layout2 = QHBoxLayout()
@@ -123,6 +195,18 @@ class GameLauncher(QWidget):
         self.update_button.clicked.connect(self.check_for_updates)
         buttons_layout2.addWidget(self.update_button)
 
+        # Conflicts button
+        self.conflicts_button = QPushButton('Check Conflicts')
+        self.conflicts_button.setFixedSize(120, 30)
+        self.conflicts_button.clicked.connect(self.check_conflicts)
+        buttons_layout2.addWidget(self.conflicts_button)
+
+        # Load times button
+        self.stats_button = QPushButton('Load Times')
+        self.stats_button.setFixedSize(100, 30)
+        self.stats_button.clicked.connect(self.open_stats_dialog)
+        buttons_layout2.addWidget(self.stats_button)
+
         # About button
         self.about_button = QPushButton('About')
         self.about_button.clicked.connect(self.open_about_dialog)
@@ -144,24 +228,19 @@ class GameLauncher(QWidget):
     def set_checked_mods(self, checked_mods):
         """Set the checked state of mods in the tree based on the provided list."""
         try:
-            iterator = QTreeWidgetItemIterator(self.mod_tree, QTreeWidgetItemIterator.IteratorFlag.All)
-            self.mod_tree.blockSignals(True)  # Prevent signals during setup
-            while iterator.value():
-                item = iterator.value()
-                mod_name = item.text(0)
-                if mod_name in checked_mods:
-                    item.setCheckState(0, Qt.CheckState.Checked)
-                else:
-                    item.setCheckState(0, Qt.CheckState.Unchecked)
-                iterator += 1
-            self.mod_tree.blockSignals(False)  # Re-enable signals
+            self.mod_model.set_checked(checked_mods)
         except Exception as e:
             QMessageBox.warning(self, 'Error', f"Error occurred when setting checked mods: {e}")
+        # set_checked doesn't emit checked_changed, so the same delayed save and validation are started here
+        self.save_timer.start()
+        self.validation_timer.start()
 
     def preset_manager(self):
         """Opens the preset manager dialog."""
         try:
-            dialog = PresetManagerDialog(self.get_checked_mods(), self.settings_file, parent=self)
+            from scr.presetmanagerWindow import PresetManagerDialog
+
+            dialog = PresetManagerDialog(self.get_checked_mods(), self.config, parent=self)
             
             if dialog.exec():
                 self.checked_mods = dialog.checked_mods
@@ -212,160 +291,267 @@ class GameLauncher(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Error occurred trying to open the about tab: {e}")
 
+    # Connected to clicked(bool), the slot signature keeps PyQt from passing the checked state
+    @pyqtSlot()
+    @profiling.traced('check_for_updates')
     def check_for_updates(self):
-        dialog = UpdateCheckerDialog(self.mod_files, os.path.join(self.game_root, "mod"))
+        try:
+            cache_ttl = self.config.update_cache_ttl
+        except Exception as e:
+            print(f"Error reading the update cache TTL: {e}")
+            cache_ttl = 900
+        # The dialog pulls in requests, which is only worth loading once updates are checked
+        from scr.updatesWindow import UpdateCheckerDialog
+
+        # The checks run on a worker, it gets its own dict since load_mods refills mod_files in place
+        dialog = UpdateCheckerDialog(dict(self.mod_files), os.path.join(self.game_root, "mod"), self, cache_ttl=cache_ttl)
         dialog.exec()
 
+    @pyqtSlot()
+    @profiling.traced('check_conflicts')
+    def check_conflicts(self):
+        """Shows which files of the checked mods are provided by more than one of them."""
+        try:
+            selection = [(mod, self.mod_files[mod]['path']) for mod in self.dependency_graph.load_order(self.get_checked_mods())]
+            if self.conflict_index is None or self.conflict_index.game_root != self.game_root:
+                self.conflict_index = ConflictIndex(self.game_root)
+            self.conflict_index.refresh([mod_path for mod, mod_path in selection])
+            conflicts = self.conflict_index.conflicts(selection)
+
+            message = QMessageBox(self)
+            message.setWindowTitle("Mod Conflicts")
+            if conflicts:
+                message.setText(f"{len(conflicts)} files are provided by more than one checked mod, the mod listed last is loaded last and overwrites the others.")
+                message.setDetailedText("\n".join(f"{path}: {', '.join(mods)}" for path, mods in conflicts.items()))
+            else:
+                message.setText("No file conflicts between the checked mods.")
+            message.exec()
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Error occurred when checking the mod conflicts: {e}")
+
     def open_config_dialog(self):
         """Opens the configuration dialog."""
         try:
+            from scr.configWindow import ConfigDialog
+
             dialog = ConfigDialog(self.game_root, self, self.user_dir)
             dialog.exec()
         except Exception as e:
             print(e)
             QMessageBox.warning(self, "Error", f"Error occurred in the configuration tab: {e}")
 
+    def open_stats_dialog(self):
+        """Opens the load times of the recorded game sessions."""
+        try:
+            from scr.statsWindow import StatsDialog
+
+            dialog = StatsDialog(gamelaunch.session_history_path(self.game_root), parent=self)
+            dialog.exec()
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Error occurred when showing the load times: {e}")
+
+    def open_saves_dialog(self):
+        """Opens the save browser, continuing a save starts the game with the mods it was played with."""
+        try:
+            from scr.savesWindow import SavesDialog
+
+            dialog = SavesDialog(self.game_root, self.mod_user_dirs.values(), gamelaunch.session_history_path(self.game_root), parent=self)
+            if dialog.exec() != QDialog.DialogCode.Accepted or dialog.selected_mods is None:
+                return
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Error occurred when showing the saves: {e}")
+            return
+
+        missing = [mod for mod in dialog.selected_mods if mod not in self.mod_files]
+        if missing:
+            reply = QMessageBox.question(
+                self, 'Mods Missing',
+                f"The save was played with mods that are no longer installed: {', '.join(missing)}\n\nStart without them?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        self.set_checked_mods(dialog.selected_mods)
+        self.start_game()
+
+    @pyqtSlot()
+    @profiling.traced('load_mods')
     def load_mods(self):
+        """Loads the mods into the tree, after the first load only the mods that changed are touched."""
         mod_folder = os.path.join(self.game_root, "mod")
         
         if not os.path.exists(mod_folder):
             print(f"Mod folder does not exist: {mod_folder}")
-            self.mod_tree.clear()
+            self.mod_watcher.stop()
+            self.mod_model.set_records({}, {})
+            return
+
+        reload = self.mod_index is not None and self.mod_index.mod_folder == mod_folder
+        if not reload:
+            self.mod_index = ModIndex(mod_folder)
+
+        entries = self.mod_index.refresh()
+        self.mod_watcher.watch(mod_folder, entries)
+        self.validation_timer.start()  # A new index generation drops the cached results
+        if reload and not any(self.mod_index.last_changes.values()):
             return
 
         self.mod_files.clear()
         self.mod_dependencies.clear()
         self.mod_user_dirs = {}
 
-        for file in os.listdir(mod_folder):
-            if file.endswith(".mod"):
-                try:
-                    with open(os.path.join(mod_folder, file), 'r', encoding='utf-8', errors='ignore') as mod_file:
-                        content = mod_file.read()
-                        name = ""
-                        dependencies = []
-                        user_dir = ""
-                        github = ""
-                        version = ""
-                        for line in content.split('\n'):
-                            if line.startswith("name"):
-                                name = line.split("=")[1].strip().strip('"')
-                            elif line.startswith("dependencies"):
-                                deps_str = line.split("=")[1].strip().strip("{}")
-                                dependencies = [dep.strip().strip('"') for dep in deps_str.split(",") if dep.strip()]
-                            elif line.startswith("user_dir"):
-                                user_dir = line.split("=")[1].strip().strip('"')
-                            elif line.startswith("github"):
-                                github = line.split("=")[1].strip().strip('"')
-                            elif line.startswith("version"):
-                                version = line.split("=")[1].strip().strip('"')
-
-                        if name:
-                            self.mod_files[name] = {
-                                'file': file,
-                                'github': github if github else None,
-                                'release': version if version else None
-                            }
-                            self.mod_dependencies[name] = dependencies
-                            self.mod_user_dirs[name] = user_dir
-                except Exception as e:
-                    print(f"An error reading the mod file {file}: {e}")
-
-        self.mod_tree.blockSignals(True)
-        self.mod_tree.clear()
-        mod_items = {}
-
-        for mod_name in self.mod_files.keys():
-            item = QTreeWidgetItem()
-            item.setText(0, mod_name)
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-            item.setCheckState(0, Qt.CheckState.Unchecked)
-            mod_items[mod_name] = item
-
-        for mod_name, dependencies in self.mod_dependencies.items():
-            if dependencies:
-                for dep in dependencies:
-                    if dep in mod_items:
-                        mod_items[dep].addChild(mod_items[mod_name])
-                        break
-                else:
-                    self.mod_tree.addTopLevelItem(mod_items[mod_name])
-            else:
-                self.mod_tree.addTopLevelItem(mod_items[mod_name])
-
-        self.mod_tree.expandAll()
-        self.mod_tree.blockSignals(False)
+        for name, mod_info in gamelaunch.read_mods(entries).items():
+            self.mod_files[name] = mod_info
+            self.mod_dependencies[name] = mod_info['dependencies']
+            self.mod_user_dirs[name] = mod_info['user_dir']
+
+        self.dependency_graph = DependencyGraph(self.mod_dependencies)
+        missing_dependencies = self.dependency_graph.missing_dependencies()
+        cyclic_mods = set()
+        for cycle in self.dependency_graph.find_cycles():
+            print(f"Dependency loop between mods: {' -> '.join(cycle)}")
+            cyclic_mods.update(cycle)
+
+        records = {}
+        parents = {}  # Dictionary to store {mod_name: name of the mod it is nested under}
+        for position, (mod_name, mod_info) in enumerate(self.mod_files.items()):
+            record = ModRecord(
+                mod_name, mod_info['file'], mod_info['github'], mod_info['release'], mod_info['path'],
+                self.mod_user_dirs[mod_name], self.mod_dependencies[mod_name]
+            )
+            record.position = position
+            if mod_name in missing_dependencies:
+                print(f"{mod_name} is missing dependencies: {', '.join(missing_dependencies[mod_name])}")
+                record.tooltip = f"Missing dependencies: {', '.join(missing_dependencies[mod_name])}"
+            records[mod_name] = record
+            # Mods in a dependency loop stay at top level, nesting them would hide the whole loop
+            if mod_name not in cyclic_mods:
+                parents[mod_name] = next((dep for dep in record.dependencies if dep in self.mod_files), None)
+
+        if reload:
+            self.mod_model.merge_records(records, parents)
+            self.get_checked_mods()  # A removed or edited mod may change the user directory
+        else:
+            self.mod_model.set_records(records, parents)
+            self.mod_tree.expandAll()
+
+    def on_mod_rows_inserted(self, parent, first, last):
+        """Submods are shown expanded, like before, as rows are fetched or added."""
+        if parent.isValid():
+            self.mod_tree.expand(parent)
+        for row in range(first, last + 1):
+            index = self.mod_model.index(row, 0, parent)
+            if self.mod_model.hasChildren(index):
+                self.mod_tree.expandRecursively(index)
 
     def get_checked_mods(self):
         checked_mods = []
-        last_user_dir_mod = None
         try:
-            iterator = QTreeWidgetItemIterator(self.mod_tree, QTreeWidgetItemIterator.IteratorFlag.All)
-            while iterator.value():
-                item = iterator.value()
-                if item.checkState(0) == Qt.CheckState.Checked:
-                    mod_name = item.text(0)
-                    if mod_name in self.mod_files:
-                        checked_mods.append(mod_name)
-                        if self.mod_user_dirs[mod_name]:
-                            last_user_dir_mod = mod_name
-                iterator += 1
-            if last_user_dir_mod:
-                self.user_dir = self.mod_user_dirs[last_user_dir_mod]
+            checked_mods = self.mod_model.checked_mods()
+            # The same rule as the command line, the game sees the mods in load order
+            self.user_dir = gamelaunch.user_dir_for(self.dependency_graph.load_order(checked_mods), self.mod_files)
+            if self.user_dir:
                 print(f"User directory: {self.user_dir}")
-            else:
-                self.user_dir = ""
         except Exception as e:
             QMessageBox.warning(self, 'Error', f"An error occurred when getting the active mods: {e}")
 
         return checked_mods
 
-    def start_game(self):
-        selected_mods = self.get_checked_mods()
-
-        with open(self.settings_file, 'r') as file:
-            launcher_config = json.load(file)
-
-        settings_path = os.path.join(
-            os.path.expanduser("~"),
-            "Documents",
-            "Paradox Interactive",
-            "Victoria II",
-            self.user_dir,
-            "settings.txt"
-        )
+    def validation_key(self, selected_mods):
+        return (self.user_dir, tuple(selected_mods))
 
-        with open(settings_path, 'r') as file:
-            lines = file.readlines()
+    def validate_selection(self):
+        """Validates the checked mods on a worker, unless the result is already cached."""
+        if self.config is None or self.mod_index is None:
+            return
+        if self.validation_worker is not None:
+            self.validation_pending = True  # Checked again once the running worker is done
+            return
+        selected_mods = self.dependency_graph.load_order(self.get_checked_mods())
+        key = self.validation_key(selected_mods)
+        problems = self.validation_cache.get(self.mod_index.generation, key)
+        snapshots = self.config.cache_snapshots
+        if problems is not None and (not snapshots or self.snapshot_keys.get(self.mod_index.generation, key) is not None):
+            self.show_validation(problems)
+            return
+        # The worker gets its own dict, load_mods refills mod_files in place
+        mods = {mod: self.mod_files[mod] for mod in selected_mods}
+        self.validation_worker = ValidationWorker(
+            self.mod_index.generation, key, self.game_root, selected_mods, mods, self.user_dir, self.dependency_graph, snapshots, self
+        )
+        self.validation_worker.validated.connect(self.on_validated)
+        self.validation_worker.start()
+
+    def on_validated(self, generation, key, problems, snapshot_key):
+        self.validation_worker.wait()
+        self.validation_worker = None
+        self.validation_cache.put(generation, key, problems)
+        if snapshot_key is not None:
+            self.snapshot_keys.put(generation, key, snapshot_key)
+        if self.validation_pending:
+            self.validation_pending = False
+            self.validate_selection()
+        elif key == self.validation_key(self.dependency_graph.load_order(self.mod_model.checked_mods())):
+            self.show_validation(problems)
+
+    def show_validation(self, problems):
+        if not problems:
+            self.validation_label.hide()
+            return
+        errors = [message for level, message in problems if level == validation.ERROR]
+        self.validation_label.setText(f"{len(problems)} problem(s) with the checked mods: {(errors or [problems[0][1]])[0]}")
+        self.validation_label.setToolTip("\n".join(message for level, message in problems))
+        self.validation_label.setStyleSheet("color: red;" if errors else "")
+        self.validation_label.show()
+
+    def selection_problems(self, selected_mods):
+        """The cached validation of the selection, validated right here when the worker hasn't got to it yet."""
+        key = self.validation_key(selected_mods)
+        problems = self.validation_cache.get(self.mod_index.generation, key)
+        if problems is None:
+            problems = validation.validate(self.game_root, selected_mods, self.mod_files, self.user_dir, self.dependency_graph)
+            self.validation_cache.put(self.mod_index.generation, key, problems)
+        return problems
+
+    @pyqtSlot()
+    @profiling.traced('start_game')
+    def start_game(self):
+        selected_mods = self.dependency_graph.load_order(self.get_checked_mods())
+
+        problems = self.selection_problems(selected_mods)
+        for level, message in problems:
+            print(f"{level.capitalize()}: {message}")
+        errors = [message for level, message in problems if level == validation.ERROR]
+        if errors:
+            reply = QMessageBox.question(
+                self, 'Problems Found',
+                "The game will likely fail to start:\n\n" + "\n".join(errors) + "\n\nStart it anyway?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
 
-        with open(settings_path, 'w') as file:
-            for i in range(len(lines)):
-                if lines[i].startswith("update_time"):
-                    lines[i] = f"update_time={float(launcher_config['update_time']):.6f}\n"
+        gamelaunch.patch_update_time(gamelaunch.settings_path(self.user_dir), self.config.update_time)
 
-            file.writelines(lines)
+        if self.config.cache_snapshots:
+            # Computed by the validation worker, reading every map and gfx file here would delay the start
+            snapshot_key = self.snapshot_keys.get(self.mod_index.generation, self.validation_key(selected_mods))
+            gamelaunch.prepare_cache(self.game_root, self.user_dir, selected_mods, self.mod_files, self.config.cache_budget_mb, snapshot_key)
 
         if selected_mods:
-            mod_files = [f"-mod=mod/{self.mod_files[mod]['file']}" for mod in selected_mods]
-            mods_argument = " ".join(mod_files)
-            game_command = f'v2game.exe {mods_argument}'
-            print(f"Starting game with mods: {game_command}")
+            print(f"Starting game with mods: {', '.join(selected_mods)}")
         else:
-            game_command = 'v2game.exe'
             print("Starting game without mods.")
-
-        priority = 'realtime' if launcher_config['realtime'] == '1' else 'high'
-        full_command = (
-            f'cd /d "{self.game_root}" && '
-            f'start "Victoria II" /{priority} /affinity 1 /node 0 '
-            f'{game_command}'
-        )
-
-        print(full_command)
+        argv = gamelaunch.game_argv(self.game_root, selected_mods, self.mod_files, self.config.wine_command)
+        # A preset can have its own priority and CPU pinning, it applies when its exact mods are checked
+        preset = self.config.preset_for(selected_mods)
+        policy = self.config.launch_policy(preset)
 
         try:
-            thread = threading.Thread(target=subprocess.run, args=(full_command,), kwargs={'shell': True})
-            thread.start()
+            process = gamelaunch.launch(self.game_root, argv, policy)
+            if self.config.supervise_sessions:
+                # The supervisor thread keeps the launcher running in the background until the game exits
+                gamelaunch.supervise(process, self.game_root, selected_mods, self.mod_files, preset, self.user_dir, self.config.load_ready_marker)
             if selected_mods:
                 self.saveCheckedmods()
             self.close()
@@ -373,40 +559,53 @@ class GameLauncher(QWidget):
             QMessageBox.warning(self, 'Error', f"An error occurred when starting the game: {e}")
 
 
-    def on_item_changed(self, item, column):
-        if column == 0:
-            try:
-                check_state = item.checkState(0)
-                self.mod_tree.blockSignals(True)
-                self.saveCheckedmods()
-                self.mod_tree.blockSignals(False)
-            except Exception as e:
-                QMessageBox.warning(self, 'Error', f"An error occurred when changing the mod state: {e}")
+    def on_mod_toggled(self, mod_name, checked):
+        if checked:
+            self.check_dependencies(mod_name)
+        # Restarting the timer coalesces a burst of toggles into a single save
+        self.save_timer.start()
+        self.validation_timer.start()
+
+    def check_dependencies(self, mod_name):
+        """Checks every mod the given mod needs, directly or through another dependency."""
+        dependencies = self.dependency_graph.transitive_dependencies(mod_name)
+        if dependencies:
+            self.set_checked_mods(self.mod_model.checked_names.union(dependencies))
+
+    def on_config_changed(self, key):
+        """Any change made by a window is written by the same delayed save."""
+        self.save_timer.start()
+
+    def flush_checked_mods(self):
+        """Saves the checked mods and every other pending change right away."""
+        if self.config is None:
+            return  # Closed before the launcher finished starting, nothing was loaded
+        self.save_timer.stop()
+        self.saveCheckedmods()
+
+    def closeEvent(self, event):
+        self.flush_checked_mods()
+        if self.validation_worker is not None:
+            self.validation_worker.wait()
+        # Whatever a cache clear left in the trash is purged on the next start
+        for worker in self.cache_clear_workers:
+            worker.cancelled.set()
+        for worker in self.cache_clear_workers:
+            worker.wait()
+        super().closeEvent(event)
+
+    @profiling.traced('loadSettings')
     def loadSettings(self):
         checked_mods = []
         
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
-                    checked_mods = settings.get('checked_mods', [])
-                    self.game_root = settings.get('game_root', self.game_root)
+            checked_mods = self.config.checked_mods
+            self.game_root = self.config.get('game_root', self.game_root)
         except Exception as e:
             QMessageBox.warning(self, 'Error', f"Error loading settings: {e}")
         
         self.load_mods()
-        
-        iterator = QTreeWidgetItemIterator(self.mod_tree, QTreeWidgetItemIterator.IteratorFlag.All)
-        self.mod_tree.blockSignals(True)
-        while iterator.value():
-            item = iterator.value()
-            mod_name = item.text(0)
-            if mod_name in checked_mods:
-                item.setCheckState(0, Qt.CheckState.Checked)
-            else:
-                item.setCheckState(0, Qt.CheckState.Unchecked)
-            iterator += 1
-        self.mod_tree.blockSignals(False)
+        self.set_checked_mods(checked_mods)
         
         try:
             self.get_checked_mods()
@@ -415,16 +614,10 @@ class GameLauncher(QWidget):
 
     def saveCheckedmods(self):
         checked_mods = self.get_checked_mods()
-        settings = {}
 
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
-            settings['checked_mods'] = checked_mods
-            mod_folder = os.path.join(self.game_root, "mod")
-            os.makedirs(mod_folder, exist_ok=True)
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f, indent=4)
+            self.config.checked_mods = checked_mods
+            self.save_timer.stop()  # Setting the mods above may have restarted it
+            self.config.save()
         except Exception as e:
-            QMessageBox.warning(self, 'Error', f"Error saving settings: {e}")
\ No newline at end of file
+            QMessageBox.warning(self, 'Error', f"Error saving settings: {e}")
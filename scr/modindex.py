@@ -0,0 +1,127 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scr import paradoxscript
+from scr import profiling
+from scr.paths import write_json_atomic, load_versioned_json
+
+INDEX_FILE = "launcher_modindex.json"
+INDEX_VERSION = 3
+MAX_PARSE_WORKERS = 8
+# Descriptors are often cp1252, dropping the bytes that aren't utf-8 keeps mod names the same
+# as presets and checked_mods saved by earlier versions
+DESCRIPTOR_ERRORS = 'ignore'
+
+def parse_mod_file(mod_file_path):
+    """Reads a .mod descriptor and returns the fields the launcher uses."""
+    descriptor = paradoxscript.load(mod_file_path, errors=DESCRIPTOR_ERRORS)
+    return {
+        'name': descriptor.get('name', ''),
+        'dependencies': descriptor.get_list('dependencies'),
+        'user_dir': descriptor.get('user_dir', ''),
+        'github': descriptor.get('github', ''),
+        'version': descriptor.get('version', ''),
+        'path': descriptor.get('path', '')
+    }
+
+class ModIndex:
+    """Parsed .mod descriptors persisted in the mod folder.
+
+    Each entry remembers the mtime and size of its descriptor, so refresh() only
+    re-parses files that are new or changed and drops the ones that were deleted.
+    """
+
+    def __init__(self, mod_folder, index_file=INDEX_FILE):
+        self.mod_folder = mod_folder
+        self.index_path = os.path.join(mod_folder, index_file)
+        self.entries = {}  # Dictionary to store {filename: parsed descriptor + stat data}
+        self.last_scan = {}  # Timing report of the last refresh
+        self.last_changes = {'added': [], 'updated': [], 'removed': []}  # Descriptors the last refresh changed
+        self.folders = None  # Names of the mod folders seen by the last refresh
+        self.generation = 0  # Goes up whenever a refresh finds descriptors or mod folders changed
+        self.load()
+
+    def load(self):
+        """Loads the saved index, an unreadable or outdated index is simply rebuilt."""
+        data = load_versioned_json(self.index_path, INDEX_VERSION, "mod index")
+        self.entries = data.get('entries', {}) if data else {}
+
+    def save(self):
+        try:
+            write_json_atomic(self.index_path, {'version': INDEX_VERSION, 'entries': self.entries})
+        except Exception as e:
+            print(f"Error saving the mod index: {e}")
+
+    def read_descriptor(self, file, stat):
+        """Parses one descriptor, returning None if it could not be read."""
+        try:
+            entry = parse_mod_file(os.path.join(self.mod_folder, file))
+        except Exception as e:
+            print(f"An error reading the mod file {file}: {e}")
+            return None
+        entry['mtime_ns'] = stat.st_mtime_ns
+        entry['size'] = stat.st_size
+        return entry
+
+    @profiling.traced('mod index refresh')
+    def refresh(self):
+        """Brings the index up to date with the mod folder and returns {filename: entry}.
+
+        Changed descriptors are parsed on a thread pool, the result is always ordered by
+        filename so the mod tree keeps the same order between runs.
+        """
+        start_time = time.perf_counter()
+        entries = {}
+        stale = []
+        folders = set()
+        with os.scandir(self.mod_folder) as scan:
+            for dir_entry in scan:
+                if dir_entry.is_dir():
+                    folders.add(dir_entry.name)
+                    continue
+                if not dir_entry.name.endswith(".mod") or not dir_entry.is_file():
+                    continue
+                stat = dir_entry.stat()
+                cached = self.entries.get(dir_entry.name)
+                if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                    entries[dir_entry.name] = cached
+                else:
+                    stale.append((dir_entry.name, stat))
+        files_scanned = len(entries) + len(stale)
+
+        if len(stale) > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(stale))) as executor:
+                parsed = list(executor.map(lambda item: self.read_descriptor(*item), stale))
+        else:
+            parsed = [self.read_descriptor(file, stat) for file, stat in stale]
+
+        for (file, stat), entry in zip(stale, parsed):
+            if entry is not None:
+                entries[file] = entry
+
+        entries = {file: entries[file] for file in sorted(entries)}
+        self.last_changes = {
+            'added': [file for file, stat in stale if file in entries and file not in self.entries],
+            'updated': [file for file, stat in stale if file in entries and file in self.entries],
+            'removed': [file for file in self.entries if file not in entries]
+        }
+        changed = any(self.last_changes.values())
+        self.entries = entries
+        if changed:
+            self.save()
+        if changed or folders != self.folders:
+            self.generation += 1
+            self.folders = folders
+
+        self.last_scan = {
+            'files_scanned': files_scanned,
+            'files_parsed': len(stale),
+            'bytes_read': sum(stat.st_size for file, stat in stale),
+            'wall_time': time.perf_counter() - start_time
+        }
+        print(
+            f"Mod scan: {self.last_scan['files_scanned']} descriptors, {self.last_scan['files_parsed']} parsed, "
+            f"{self.last_scan['bytes_read']} bytes read in {self.last_scan['wall_time'] * 1000:.1f} ms"
+        )
+        return self.entries
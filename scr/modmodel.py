@@ -0,0 +1,265 @@
+import bisect
+
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, pyqtSignal
+
+FETCH_BATCH = 200  # Top level rows handed to the view at a time
+
+class ModRecord:
+    """One installed mod, and its place in the mod tree."""
+    __slots__ = (
+        'name', 'file', 'github', 'release', 'path', 'user_dir', 'dependencies',
+        'position', 'parent', 'children', 'row', 'checked', 'tooltip'
+    )
+
+    def __init__(self, name, file, github=None, release=None, path="", user_dir="", dependencies=()):
+        self.name = name
+        self.file = file
+        self.github = github
+        self.release = release
+        self.path = path
+        self.user_dir = user_dir
+        self.dependencies = list(dependencies)
+        self.position = 0  # Load position, keeps the selection ordered
+        self.parent = None
+        self.children = []
+        self.row = 0  # Row under the parent, or among the top level mods
+        self.checked = False
+        self.tooltip = None
+
+class ModTreeModel(QAbstractItemModel):
+    """Mods nested under the mod they depend on, with the checked state kept in the records.
+
+    Top level rows are handed to the view in batches through canFetchMore/fetchMore, so the
+    view only lays out the mods that have been scrolled into reach.
+    """
+    checked_changed = pyqtSignal(str, bool)  # Emitted when the user toggles a mod
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = {}  # Dictionary to store {mod_name: ModRecord}
+        self.roots = []
+        self.fetched_roots = 0
+        self.checked_names = set()
+
+    def set_records(self, records, parents):
+        """Replaces the mods, parents maps each mod name to the name of its parent mod or None."""
+        self.beginResetModel()
+        self.records = records
+        self.roots = []
+        for name, record in records.items():
+            record.parent = records.get(parents.get(name))
+            siblings = record.parent.children if record.parent else self.roots
+            record.row = len(siblings)
+            siblings.append(record)
+        self.fetched_roots = min(FETCH_BATCH, len(self.roots))
+        self.checked_names = {name for name, record in records.items() if record.checked}
+        self.endResetModel()
+
+    def merge_records(self, records, parents):
+        """Brings the tree to records/parents while keeping the existing rows and their checked state.
+
+        Only rows of mods that were added, removed or moved under another parent are
+        removed or inserted, every other mod keeps its record and its place in the view.
+        """
+        added = records.keys() - self.records.keys()
+        moved = set(self.records.keys() - records.keys())
+        for name, old in self.records.items():
+            new = records.get(name)
+            if new is None:
+                continue
+            old_parent = old.parent.name if old.parent else None
+            if old_parent != parents.get(name) or old.file != new.file:
+                # A renamed descriptor sorts elsewhere, positions otherwise only shift together
+                moved.add(name)
+            changed = old.tooltip != new.tooltip
+            for field in ('file', 'github', 'release', 'path', 'user_dir', 'dependencies', 'tooltip'):
+                setattr(old, field, getattr(new, field))
+            old.position = new.position
+            records[name] = old
+            if changed and name not in moved:
+                index = self.index_of(old)
+                if index.isValid():
+                    self.dataChanged.emit(index, index, [Qt.ItemDataRole.ToolTipRole])
+
+        # Deepest first, so every record is detached while its own parents are still in the tree
+        for name in sorted(moved, key=lambda name: -self.depth(self.records[name])):
+            self.detach(self.records[name])
+        for name in moved - records.keys():
+            self.checked_names.discard(name)
+        self.records = records
+
+        # Shallowest first, so every parent is back in the tree before its children
+        attach = [name for name in records if name in moved or name in added]
+        depths = {}
+        for name in attach:
+            depth = 0
+            parent = parents.get(name)
+            while parent in records and depth <= len(records):
+                depth += 1
+                parent = parents.get(parent)
+            depths[name] = depth
+        for name in sorted(attach, key=depths.get):
+            self.attach(records[name], records.get(parents.get(name)))
+
+    def depth(self, record):
+        depth = 0
+        while record.parent is not None:
+            depth += 1
+            record = record.parent
+        return depth
+
+    def detach(self, record):
+        """Removes a record and the rows under it from the tree."""
+        parent = record.parent
+        siblings = parent.children if parent else self.roots
+        row = record.row
+        if parent is not None:
+            parent_index = self.index_of(parent)
+            visible = parent_index.isValid()
+        else:
+            parent_index = QModelIndex()
+            visible = row < self.fetched_roots
+        if visible:
+            self.beginRemoveRows(parent_index, row, row)
+        del siblings[row]
+        for sibling_row in range(row, len(siblings)):
+            siblings[sibling_row].row = sibling_row
+        if parent is None and visible:
+            self.fetched_roots -= 1
+        record.parent = None
+        if visible:
+            self.endRemoveRows()
+
+    def attach(self, record, parent):
+        """Inserts a record under parent, or at the top level, at the row of its load position."""
+        siblings = parent.children if parent else self.roots
+        row = bisect.bisect([sibling.position for sibling in siblings], record.position)
+        if parent is not None:
+            parent_index = self.index_of(parent)
+            visible = parent_index.isValid()
+        else:
+            parent_index = QModelIndex()
+            # Rows past the fetched ones are handed to the view by fetchMore later on
+            visible = row < self.fetched_roots or self.fetched_roots == len(self.roots)
+        if visible:
+            self.beginInsertRows(parent_index, row, row)
+        record.parent = parent
+        siblings.insert(row, record)
+        for sibling_row in range(row, len(siblings)):
+            siblings[sibling_row].row = sibling_row
+        if parent is None and visible:
+            self.fetched_roots += 1
+        if visible:
+            self.endInsertRows()
+
+    def record(self, index):
+        return index.internalPointer() if index.isValid() else None
+
+    def index_of(self, record):
+        """Returns the index of a record, or an invalid index if its row was not fetched yet."""
+        top = record
+        while top.parent is not None:
+            top = top.parent
+        if top.row >= self.fetched_roots:
+            return QModelIndex()
+        return self.createIndex(record.row, 0, record)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        if not parent.isValid():
+            if row >= self.fetched_roots:
+                return QModelIndex()
+            return self.createIndex(row, 0, self.roots[row])
+        children = parent.internalPointer().children
+        if row >= len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        parent_record = index.internalPointer().parent
+        if parent_record is None:
+            return QModelIndex()
+        return self.createIndex(parent_record.row, 0, parent_record)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return self.fetched_roots
+        if parent.column() != 0:
+            return 0
+        return len(parent.internalPointer().children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self.roots)
+        return bool(parent.internalPointer().children)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.fetched_roots < len(self.roots)
+
+    def fetchMore(self, parent):
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH, len(self.roots) - self.fetched_roots)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched_roots, self.fetched_roots + count - 1)
+        self.fetched_roots += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole and section == 0:
+            return 'Mods'
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return record.name
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if record.checked else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return record.tooltip
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        record = index.internalPointer()
+        checked = Qt.CheckState(value) == Qt.CheckState.Checked
+        if record.checked != checked:
+            self.set_record_checked(record, checked)
+            self.checked_changed.emit(record.name, checked)
+        return True
+
+    def set_record_checked(self, record, checked):
+        record.checked = checked
+        if checked:
+            self.checked_names.add(record.name)
+        else:
+            self.checked_names.discard(record.name)
+        index = self.index_of(record)
+        if index.isValid():
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+
+    def set_checked(self, names):
+        """Makes exactly the given mods checked, touching only the ones whose state changes."""
+        checked = set(names) & self.records.keys()
+        for name in self.checked_names ^ checked:
+            self.set_record_checked(self.records[name], name in checked)
+
+    def checked_mods(self):
+        """Returns the checked mods in load order."""
+        return sorted(self.checked_names, key=lambda name: self.records[name].position)
@@ -0,0 +1,52 @@
+import os
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+WATCH_DELAY_MS = 500  # Quiet time after the last event before the mod folder is rescanned
+
+class ModFolderWatcher(QObject):
+    """Watches the mod folder and its .mod descriptors, emitting changed once a burst of events settles.
+
+    The folder itself only reports entries being added, removed or renamed, so every
+    descriptor is watched as well to catch edits made in place.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mod_folder = None
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_event)
+        self.watcher.fileChanged.connect(self.on_event)
+
+        # Copying a mod in fires many events, they are all handled by one rescan
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(WATCH_DELAY_MS)
+        self.timer.timeout.connect(self.changed)
+
+    def watch(self, mod_folder, files):
+        """Watches mod_folder and the given descriptor filenames in it, replacing what was watched before."""
+        if self.mod_folder != mod_folder:
+            self.stop()
+            self.mod_folder = mod_folder
+            if not self.watcher.addPath(mod_folder):
+                print(f"Could not watch the mod folder: {mod_folder}")
+
+        paths = {os.path.join(mod_folder, file) for file in files}
+        watched = set(self.watcher.files())
+        if watched - paths:
+            self.watcher.removePaths(list(watched - paths))
+        if paths - watched:
+            # A descriptor that was replaced rather than edited drops out of the watch, it is added back here
+            self.watcher.addPaths(list(paths - watched))
+
+    def stop(self):
+        self.timer.stop()
+        watched = self.watcher.files() + self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+        self.mod_folder = None
+
+    def on_event(self, path):
+        self.timer.start()
@@ -0,0 +1,233 @@
+import re
+
+from scr.paths import write_atomic
+
+FILE_ENCODING = 'utf-8'
+FILE_ERRORS = 'surrogateescape'  # Keeps any non utf-8 byte intact through a load/save round trip
+
+# The parser matches whole statements at once, key=value is one regex match instead of three tokens.
+# Whitespace and commas never match, so finditer skips them for free. Commas are
+# separators because older descriptors write lists as { "A", "B" }
+STATEMENT_RE = re.compile(r'''
+     (?P<key>"[^"]*"|[^\s,{}=#"<>]+)[\s,]*(?P<operator>[<>]=?|==?)[\s,]*
+        (?:(?P<open>\{)|(?P<value>"[^"]*"?|[^\s,{}=#"<>]+))
+    |(?P<close>\})
+    |(?P<bare_open>\{)
+    |(?P<bare>"[^"]*"?|[^\s,{}=#"<>]+)
+    |\#[^\n]*
+''', re.VERBOSE)
+
+
+class Node:
+    """One entry of a script: key=value, key={ ... } or a bare value inside a block.
+
+    value is a string for scalars and a list of Nodes for blocks. The spans are
+    (start, end) offsets into the source text, value_span of a block covers its braces.
+    """
+    __slots__ = ('key', 'operator', 'value', 'quoted', 'key_span', 'value_span')
+
+    def __init__(self, key, operator, value, quoted, key_span, value_span):
+        self.key = key
+        self.operator = operator
+        self.value = value
+        self.quoted = quoted
+        self.key_span = key_span
+        self.value_span = value_span
+
+    def is_block(self):
+        return isinstance(self.value, list)
+
+    def __repr__(self):
+        return f"Node({self.key!r}, {self.value!r})"
+
+
+def scalar_text(value):
+    """The text of a scalar. Strings have no escapes, so a double quote would end one early and is dropped."""
+    return str(value).replace('"', '')
+
+
+def format_value(value, quoted=False):
+    """Formats a python value the way the game writes it, quoting when needed."""
+    value = scalar_text(value)
+    if quoted or not value or re.search(r'[\s{}=#"]', value):
+        return f'"{value}"'
+    return value
+
+
+class Document:
+    """A parsed script that remembers its source so edits rewrite only the changed values."""
+
+    def __init__(self, text, nodes):
+        self.text = text
+        self.nodes = nodes
+        self.edits = {}  # Dictionary to store {value start offset: (value end offset, new text)}
+        self.inserts = []  # New entries as (offset, node, depth)
+        self.index = None  # Dictionary to store {dotted path: node}, built on the first lookup
+
+    @property
+    def changed(self):
+        return bool(self.edits or self.inserts)
+
+    def build_index(self):
+        """Maps every dotted path to its node, so lookups don't rescan the document.
+
+        Like a walk from the root, a path leads to the first node with each key, the
+        children of a repeated block are only reachable through its first occurrence.
+        """
+        self.index = {}
+        stack = [('', self.nodes)]
+        while stack:
+            prefix, nodes = stack.pop()
+            for node in nodes:
+                if node.key is None:
+                    continue
+                path = prefix + node.key
+                if path in self.index:
+                    continue
+                self.index[path] = node
+                if node.is_block():
+                    stack.append((path + '.', node.value))
+
+    def find(self, path):
+        """Returns the first node matching a dotted path like 'graphics.size.x', or None."""
+        if self.index is None:
+            self.build_index()
+        return self.index.get(path)
+
+    def get(self, path, default=None):
+        """Returns the unquoted scalar value at path, or default."""
+        node = self.find(path)
+        if node is None or node.is_block():
+            return default
+        return node.value
+
+    def get_list(self, path):
+        """Returns the scalar values of the block at path, or a one item list for a scalar."""
+        node = self.find(path)
+        if node is None:
+            return []
+        if node.is_block():
+            return [child.value for child in node.value if not child.is_block()]
+        return [node.value]
+
+    def set(self, path, value):
+        """Sets the scalar at path, adding key=value to its parent block if it does not exist yet."""
+        value = scalar_text(value)
+        node = self.find(path)
+        if node is not None:
+            if node.is_block():
+                raise ValueError(f"{path} is a block, not a value")
+            node.value = value
+            if node.value_span is None:
+                return  # Not in the source yet, it is written out by the pending insert
+            start, end = node.value_span
+            new_text = format_value(value, node.quoted)
+            if new_text == self.text[start:end]:
+                self.edits.pop(start, None)
+            else:
+                self.edits[start] = (end, new_text)
+            return
+
+        parent_path, _, key = path.rpartition('.')
+        if parent_path:
+            parent = self.find(parent_path)
+            if parent is None or not parent.is_block():
+                raise KeyError(f"No block named {parent_path}")
+            siblings = parent.value
+            brace = parent.value_span[1] - 1
+            line_start = self.text.rfind('\n', 0, brace) + 1
+            # At the start of the closing brace's line, or right before the brace when it follows other entries
+            offset = line_start if not self.text[line_start:brace].strip() else brace
+            depth = parent_path.count('.') + 1
+        else:
+            siblings = self.nodes
+            offset = len(self.text)
+            depth = 0
+        node = Node(key, '=', value, False, None, None)
+        siblings.append(node)
+        self.index[path] = node
+        self.inserts.append((offset, node, depth))
+
+    def to_text(self):
+        """Returns the source with every edit applied, everything else is left byte for byte."""
+        if not self.changed:
+            return self.text
+        newline = '\r\n' if '\r\n' in self.text else '\n'
+        replacements = [(start, end, new_text) for start, (end, new_text) in self.edits.items()]
+        for offset, node, depth in self.inserts:
+            entry = '\t' * depth + f"{node.key}={format_value(node.value, node.quoted)}{newline}"
+            if offset > 0 and self.text[offset - 1] not in '\r\n':
+                entry = newline + entry
+            replacements.append((offset, offset, entry))
+        replacements.sort(key=lambda replacement: replacement[0])
+
+        parts = []
+        position = 0
+        for start, end, new_text in replacements:
+            parts.append(self.text[position:start])
+            parts.append(new_text)
+            position = end
+        parts.append(self.text[position:])
+        return ''.join(parts)
+
+
+def _unquote(text):
+    if text[0] != '"':
+        return text, False
+    if len(text) > 1 and text[-1] == '"':
+        return text[1:-1], True
+    return text[1:], True
+
+
+def parse(text):
+    """Parses script text into a Document. Like the game, stray or missing braces are tolerated."""
+    root = []
+    stack = []  # Open blocks as (node list, opening brace offset, owning node)
+    current = root
+
+    for match in STATEMENT_RE.finditer(text):
+        key, operator, open_brace, value, close_brace, bare_open, bare = match.groups()
+        if key is not None:
+            key, _ = _unquote(key)
+            key_span = match.span('key')
+            if open_brace is not None:
+                node = Node(key, operator, [], False, key_span, None)
+                current.append(node)
+                stack.append((current, match.start('open'), node))
+                current = node.value
+            else:
+                value, quoted = _unquote(value)
+                current.append(Node(key, operator, value, quoted, key_span, match.span('value')))
+        elif bare is not None:
+            value, quoted = _unquote(bare)
+            current.append(Node(None, None, value, quoted, None, match.span('bare')))
+        elif close_brace is not None:
+            if stack:
+                current, open_start, node = stack.pop()
+                node.value_span = (open_start, match.end())
+        elif bare_open is not None:
+            # Anonymous block, e.g. a list of lists
+            node = Node(None, None, [], False, None, None)
+            current.append(node)
+            stack.append((current, match.start(), node))
+            current = node.value
+
+    while stack:
+        # Unclosed block, pretend its closing brace sits right after the end of the text
+        current, open_start, node = stack.pop()
+        node.value_span = (open_start, len(text) + 1)
+    return Document(text, root)
+
+
+def load(path, errors=FILE_ERRORS):
+    """Parses a script file, keeping its exact bytes and line endings for save().
+
+    Bytes are only kept with the default errors, other values are for files that are never saved.
+    """
+    with open(path, 'r', encoding=FILE_ENCODING, errors=errors, newline='') as file:
+        return parse(file.read())
+
+
+def save(document, path):
+    """Writes a document back to path."""
+    write_atomic(path, document.to_text(), encoding=FILE_ENCODING, errors=FILE_ERRORS, newline='')
@@ -0,0 +1,55 @@
+import os
+import json
+import threading
+
+def user_data_dir(user_dir="", *parts):
+    """Returns Documents/Paradox Interactive/Victoria II/<user_dir>, joined with any extra parts."""
+    return os.path.join(
+        os.path.expanduser("~"),
+        "Documents",
+        "Paradox Interactive",
+        "Victoria II",
+        user_dir,
+        *parts
+    )
+
+def write_atomic(path, text, encoding=None, errors=None, newline=None):
+    """Writes text to path through a temporary file next to it, so a crash never leaves it half written.
+
+    The temporary file is named after the process and thread, the GUI and the command line
+    saving the same file at once each write their own instead of truncating each other's.
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'x', encoding=encoding, errors=errors, newline=newline) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """write_atomic for a JSON document, dump_kwargs go to json.dumps."""
+    write_atomic(path, json.dumps(data, **dump_kwargs))
+
+def load_versioned_json(path, version, name):
+    """Returns the JSON object in path if it was written with version, otherwise None.
+
+    A missing file is expected, an unreadable one is reported with name (like "mod index").
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error loading the {name}, rebuilding it: {e}")
+        return None
+    if not isinstance(data, dict) or data.get('version') != version:
+        return None
+    return data
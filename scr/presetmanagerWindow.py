@@ -1,5 +1,4 @@
 
-import json
 from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, 
     QPushButton, QTreeWidget, QTreeWidgetItem,
@@ -8,14 +7,12 @@ from PyQt6.QtWidgets import (
 
 
 class PresetManagerDialog(QDialog):
-    def __init__(self, checked_mods, settings_file, parent=None):
+    def __init__(self, checked_mods, config, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Manage Presets")
         self.setGeometry(400, 400, 300, 400)
         self.checked_mods = checked_mods
-        self.settings_file = settings_file
-        self.settings = {}
-        self.load_settings()
+        self.config = config
         self.initUI()
 
         self.preset_list.itemClicked.connect(self.load_selected_preset)
@@ -51,23 +48,10 @@ class PresetManagerDialog(QDialog):
 
         self.setLayout(layout)
 
-    def load_settings(self):
-        """Loads the settings file, including presets."""
-        try:
-            with open(self.settings_file, 'r') as f:
-                self.settings = json.load(f)
-                if 'presets' not in self.settings:
-                    self.settings['presets'] = {}
-        except FileNotFoundError:
-            self.settings = {'presets': {}}
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-            self.settings = {'presets': {}}
-
     def populate_preset_list(self):
         """Populates the preset list widget with existing presets."""
         self.preset_list.clear()
-        for preset_name in self.settings['presets']:
+        for preset_name in self.config.presets:
             item = QTreeWidgetItem()
             item.setText(0, preset_name)
             self.preset_list.addTopLevelItem(item)
@@ -76,7 +60,7 @@ class PresetManagerDialog(QDialog):
         selected_item = self.preset_list.currentItem()
         if selected_item:
             preset_name = selected_item.text(0)
-            self.checked_mods[:] = self.settings['presets'][preset_name]
+            self.checked_mods[:] = self.config.presets[preset_name]
             print(f"Loaded preset: {preset_name}")
             # Optionally, update the mod tree in the main window here
             self.parent().set_checked_mods(self.checked_mods)  # Update the main window's checked mods
@@ -92,8 +76,7 @@ class PresetManagerDialog(QDialog):
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
             if reply == QMessageBox.StandardButton.Yes:
-                del self.settings['presets'][preset_name]
-                self.save_settings()
+                self.config.delete_preset(preset_name)
                 self.populate_preset_list()
                 print(f"Deleted preset: {preset_name}")
 
@@ -101,15 +84,6 @@ class PresetManagerDialog(QDialog):
         """Creates a new preset with the currently checked mods."""
         preset_name, ok = QInputDialog.getText(self, 'New Preset', 'Enter preset name:')
         if ok and preset_name:
-            self.settings['presets'][preset_name] = list(self.checked_mods)
-            self.save_settings()
+            self.config.save_preset(preset_name, self.checked_mods)
             self.populate_preset_list()
             print(f"Saved new preset: {preset_name}")
-
-    def save_settings(self):
-        """Saves the presets to the settings file."""
-        try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=4)
-        except Exception as e:
-            print(f"Error saving presets: {e}")
@@ -0,0 +1,217 @@
+import os
+import time
+import subprocess
+
+PRIORITIES = ('normal', 'above_normal', 'high', 'realtime')
+NICE_LEVELS = {'normal': 0, 'above_normal': -2, 'high': -5, 'realtime': -10}  # Raising needs CAP_SYS_NICE on Linux
+LOAD_SAMPLE_SECONDS = 0.1  # How long CPU usage is measured before picking the least loaded core
+
+def parse_cpu_list(text):
+    """Parses a Linux style CPU list like '0-3,8' into [0, 1, 2, 3, 8]."""
+    cpus = []
+    for part in str(text).replace(' ', '').split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return sorted(set(cpus))
+
+def parse_affinity(value):
+    """Turns a configured affinity into None (any CPU), 'least_loaded' or a list of CPUs.
+
+    Numbers and '0x' strings are masks like the old /affinity 1, other strings are CPU lists like '2,3' or '4-7'.
+    """
+    if value is None or value in ('', 'all'):
+        return None
+    if value == 'least_loaded':
+        return value
+    if isinstance(value, list):
+        return sorted(set(int(cpu) for cpu in value))
+    if isinstance(value, int) or str(value).lower().startswith('0x'):
+        mask = value if isinstance(value, int) else int(value, 16)
+        return [cpu for cpu in range(mask.bit_length()) if mask >> cpu & 1]
+    return parse_cpu_list(value)
+
+def physical_cores():
+    """Returns the logical CPUs of each physical core, e.g. [[0, 8], [1, 9], ...] with hyperthreading."""
+    try:
+        if os.name == 'nt':
+            return _windows_physical_cores()
+        cores = {}
+        for cpu in range(os.cpu_count() or 1):
+            path = f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list"
+            with open(path, 'r') as f:
+                siblings = tuple(parse_cpu_list(f.read()))
+            cores[siblings] = list(siblings)
+        return sorted(cores.values())
+    except Exception as e:
+        print(f"Could not read the CPU topology, treating every CPU as a core: {e}")
+        return [[cpu] for cpu in range(os.cpu_count() or 1)]
+
+def cpu_times():
+    """Returns {cpu: (busy time, total time)} since boot, in platform units."""
+    if os.name == 'nt':
+        return _windows_cpu_times()
+    times = {}
+    with open("/proc/stat", 'r') as f:
+        for line in f:
+            name, *values = line.split()
+            if not name.startswith('cpu') or name == 'cpu':
+                continue
+            values = [int(value) for value in values]
+            idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+            total = sum(values[:8])  # guest time is already counted in user
+            times[int(name[3:])] = (total - idle, total)
+    return times
+
+def least_loaded_core(allowed=None):
+    """Returns the CPUs of the physical core that was least busy over a short sample.
+
+    Ties go to the later core, the first one handles most interrupts and the launcher itself.
+    """
+    cores = physical_cores()
+    if allowed is not None:
+        cores = [[cpu for cpu in core if cpu in allowed] for core in cores]
+        cores = [core for core in cores if core]
+    if not cores:
+        return None
+    try:
+        before = cpu_times()
+        time.sleep(LOAD_SAMPLE_SECONDS)
+        after = cpu_times()
+    except Exception as e:
+        print(f"Could not measure the CPU load: {e}")
+        return cores[-1]
+
+    def load(core):
+        busy = sum(after[cpu][0] - before[cpu][0] for cpu in core if cpu in before and cpu in after)
+        total = sum(after[cpu][1] - before[cpu][1] for cpu in core if cpu in before and cpu in after)
+        return busy / total if total else 0.0
+
+    return min(cores, key=lambda core: (round(load(core), 2), -core[0]))
+
+def numa_node_cpus(node):
+    """Returns the CPUs of a NUMA node, or None if the node is unknown."""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            mask = ctypes.c_ulonglong(0)
+            if not ctypes.windll.kernel32.GetNumaNodeProcessorMask(ctypes.c_ubyte(node), ctypes.byref(mask)):
+                return None
+            return [cpu for cpu in range(64) if mask.value >> cpu & 1]
+        with open(f"/sys/devices/system/node/node{node}/cpulist", 'r') as f:
+            return parse_cpu_list(f.read())
+    except (OSError, AttributeError, ValueError):
+        return None
+
+def resolve_cpus(affinity, numa_node=None):
+    """Returns the CPUs the game should run on for a launch policy, or None to leave it unpinned."""
+    affinity = parse_affinity(affinity)
+    allowed = None
+    if numa_node is not None:
+        allowed = numa_node_cpus(int(numa_node))
+        if allowed is None:
+            print(f"NUMA node {numa_node} not found, ignoring it")
+    if affinity == 'least_loaded':
+        return least_loaded_core(allowed)
+    if affinity is None:
+        return allowed
+    if allowed is not None:
+        return [cpu for cpu in affinity if cpu in allowed] or affinity
+    return affinity
+
+def start_process(argv, cwd, priority='high', cpus=None):
+    """Starts argv directly, without a shell, and applies the priority and CPU affinity.
+
+    Both are set from the launcher right after the spawn, as the GUI has other threads
+    running and a preexec_fn could deadlock the forked child. The game only inherits them
+    for what it starts afterwards, wine starts its own processes only once it has loaded.
+    """
+    if priority not in PRIORITIES:
+        print(f"Unknown priority {priority!r}, using normal")
+        priority = 'normal'
+
+    if os.name == 'nt':
+        priority_classes = {
+            'normal': subprocess.NORMAL_PRIORITY_CLASS,
+            'above_normal': subprocess.ABOVE_NORMAL_PRIORITY_CLASS,
+            'high': subprocess.HIGH_PRIORITY_CLASS,
+            'realtime': subprocess.REALTIME_PRIORITY_CLASS
+        }
+        process = subprocess.Popen(argv, cwd=cwd, creationflags=priority_classes[priority])
+        if cpus:
+            _windows_set_affinity(process.pid, cpus)
+        return process
+
+    process = subprocess.Popen(argv, cwd=cwd)
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(process.pid, cpus)
+        except ProcessLookupError:
+            pass  # Already exited
+        except OSError as e:
+            print(f"Could not pin the game to CPUs {cpus}: {e}")
+    nice = NICE_LEVELS[priority]
+    if nice:
+        try:
+            os.setpriority(os.PRIO_PROCESS, process.pid, os.getpriority(os.PRIO_PROCESS, 0) + nice)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            print(f"Could not raise the game's priority to {priority}, it needs CAP_SYS_NICE")
+        except OSError as e:
+            print(f"Could not set the game's priority to {priority}: {e}")
+    return process
+
+def _windows_physical_cores():
+    import ctypes
+    from ctypes import wintypes
+
+    class SYSTEM_LOGICAL_PROCESSOR_INFORMATION(ctypes.Structure):
+        _fields_ = [('ProcessorMask', ctypes.c_size_t), ('Relationship', ctypes.c_int), ('Reserved', ctypes.c_ulonglong * 2)]
+
+    kernel32 = ctypes.windll.kernel32
+    length = wintypes.DWORD(0)
+    kernel32.GetLogicalProcessorInformation(None, ctypes.byref(length))
+    buffer = (SYSTEM_LOGICAL_PROCESSOR_INFORMATION * (length.value // ctypes.sizeof(SYSTEM_LOGICAL_PROCESSOR_INFORMATION)))()
+    if not kernel32.GetLogicalProcessorInformation(buffer, ctypes.byref(length)):
+        raise ctypes.WinError()
+    relation_processor_core = 0
+    return sorted(
+        [cpu for cpu in range(64) if info.ProcessorMask >> cpu & 1]
+        for info in buffer if info.Relationship == relation_processor_core
+    )
+
+def _windows_cpu_times():
+    import ctypes
+
+    class SYSTEM_PROCESSOR_PERFORMANCE_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ('IdleTime', ctypes.c_longlong), ('KernelTime', ctypes.c_longlong), ('UserTime', ctypes.c_longlong),
+            ('DpcTime', ctypes.c_longlong), ('InterruptTime', ctypes.c_longlong), ('InterruptCount', ctypes.c_ulong)
+        ]
+
+    buffer = (SYSTEM_PROCESSOR_PERFORMANCE_INFORMATION * (os.cpu_count() or 1))()
+    system_processor_performance_information = 8
+    status = ctypes.windll.ntdll.NtQuerySystemInformation(system_processor_performance_information, buffer, ctypes.sizeof(buffer), None)
+    if status != 0:
+        raise OSError(f"NtQuerySystemInformation failed with status {status:#x}")
+    # Kernel time includes the idle time
+    return {cpu: (info.KernelTime + info.UserTime - info.IdleTime, info.KernelTime + info.UserTime) for cpu, info in enumerate(buffer)}
+
+def _windows_set_affinity(pid, cpus):
+    import ctypes
+
+    process_set_information = 0x0200
+    process_query_information = 0x0400
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(process_set_information | process_query_information, False, pid)
+    if not handle:
+        print(f"Could not open the game process to pin it to CPUs {cpus}")
+        return
+    try:
+        mask = sum(1 << cpu for cpu in cpus)
+        if not kernel32.SetProcessAffinityMask(handle, ctypes.c_size_t(mask)):
+            print(f"Could not pin the game to CPUs {cpus}")
+    finally:
+        kernel32.CloseHandle(handle)
@@ -0,0 +1,95 @@
+import os
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+from scr.paths import write_json_atomic
+
+TRACE_FILE = "launcher_profile.json"  # Open in chrome://tracing or https://ui.perfetto.dev
+CPROFILE_FILE = "launcher_profile.prof"  # Open with python -m pstats or snakeviz
+
+_origin_ns = time.perf_counter_ns()  # Timestamps count from the import of this module
+_events = []
+_lock = threading.Lock()
+_enabled = False
+_profiler = None
+
+def enable(use_cprofile=False):
+    """Starts recording spans, and profiling the main thread with cProfile if asked to."""
+    global _enabled, _profiler
+    _enabled = True
+    if use_cprofile:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+def enabled():
+    return _enabled
+
+@contextmanager
+def span(name, **args):
+    """Records the time spent in the with block as one Chrome trace event, free when profiling is off."""
+    if not _enabled:
+        yield
+        return
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end_ns = time.perf_counter_ns()
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': (start_ns - _origin_ns) / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args
+        }
+        with _lock:
+            _events.append(event)
+
+def traced(name):
+    """Decorator recording every call of a function as a span named name."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def mark(name, **args):
+    """Records a point in time, like the first paint of the window."""
+    if not _enabled:
+        return
+    event = {
+        'name': name,
+        'ph': 'i',
+        's': 'p',
+        'ts': (time.perf_counter_ns() - _origin_ns) / 1000,
+        'pid': os.getpid(),
+        'tid': threading.get_ident(),
+        'args': args
+    }
+    with _lock:
+        _events.append(event)
+
+def finish(trace_file=TRACE_FILE, cprofile_file=CPROFILE_FILE):
+    """Writes the recorded spans, and the cProfile stats if they were collected."""
+    if not _enabled:
+        return
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(cprofile_file)
+        print(f"cProfile stats written to {cprofile_file}")
+    with _lock:
+        events = list(_events)
+    try:
+        write_json_atomic(trace_file, {'traceEvents': events, 'displayTimeUnit': 'ms'})
+        print(f"Profile with {len(events)} events written to {trace_file}")
+    except Exception as e:
+        print(f"Error writing the profile: {e}")
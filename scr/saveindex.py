@@ -0,0 +1,118 @@
+import os
+import re
+import mmap
+import time
+
+from scr.paths import user_data_dir, write_json_atomic, load_versioned_json
+
+SAVE_INDEX_FILE = "launcher_saveindex.json"
+INDEX_VERSION = 1
+SAVE_FOLDER = "save games"
+HEADER_LIMIT = 1024 * 1024  # The header keys come first, nothing past this is ever read
+HEADER_KEYS = ('date', 'player')
+SESSION_SLACK = 120  # Seconds after a session's end a save still counts as written by it
+
+HEADER_RE = re.compile(rb'^(date|player)\s*=\s*"?([^"\r\n]*)"?', re.MULTILINE)
+
+def read_header(path):
+    """Returns {'date', 'player'} from the start of a .v2 save, found through mmap.
+
+    Saves are tens of megabytes of text, only the pages up to the last header key are
+    touched, and never more than HEADER_LIMIT bytes. The first occurrence wins, later
+    ones belong to nested blocks.
+    """
+    header = {}
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return header
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for match in HEADER_RE.finditer(data, 0, min(size, HEADER_LIMIT)):
+                key = match.group(1).decode('ascii')
+                if key not in header:
+                    header[key] = match.group(2).decode('latin-1').strip()
+                    if len(header) == len(HEADER_KEYS):
+                        break
+    return header
+
+def save_folders(user_dirs):
+    """Returns {user_dir: its save games folder} for the default user directory and the given ones."""
+    return {user_dir: user_data_dir(user_dir, SAVE_FOLDER) for user_dir in [""] + sorted(set(user_dirs) - {""})}
+
+def mods_for_save(save, sessions):
+    """Finds the mods a save was played with in the session history, returns (mods, exact) or (None, False).
+
+    exact means the save was written while a recorded session was running, otherwise the
+    mods of the last session started before it with the same user directory are guessed.
+    """
+    saved_at = save['mtime_ns'] / 1e9
+    earlier = None
+    for session in sessions:
+        if session.get('user_dir', "") != save['user_dir'] or session.get('started', 0) > saved_at:
+            continue
+        if saved_at <= session['started'] + session.get('duration', 0) + SESSION_SLACK:
+            return session.get('mods', []), True
+        if earlier is None or session['started'] > earlier['started']:
+            earlier = session
+    return (earlier.get('mods', []), False) if earlier else (None, False)
+
+class SaveIndex:
+    """Headers of the .v2 saves, persisted next to the mod index.
+
+    Entries are keyed by path and remember the mtime and size of the save, so refresh()
+    only opens saves that are new or were overwritten.
+    """
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.entries = {}  # {save path: {'mtime_ns', 'size', 'date', 'player'}}
+        self.last_scan = {}
+        self.load()
+
+    def load(self):
+        data = load_versioned_json(self.index_path, INDEX_VERSION, "save index")
+        self.entries = data.get('entries', {}) if data else {}
+
+    def save(self):
+        try:
+            write_json_atomic(self.index_path, {'version': INDEX_VERSION, 'entries': self.entries})
+        except Exception as e:
+            print(f"Error saving the save index: {e}")
+
+    def refresh(self, folders):
+        """Brings the index up to date with the save folders ({user_dir: folder}), newest save first.
+
+        Each save is returned as its index entry plus 'path', 'name' and 'user_dir'.
+        """
+        start_time = time.perf_counter()
+        entries = {}
+        saves = []
+        parsed = 0
+        for user_dir, folder in folders.items():
+            try:
+                scan = list(os.scandir(folder))
+            except OSError:
+                continue  # No saves with this user directory yet
+            for dir_entry in scan:
+                if not dir_entry.name.endswith(".v2") or not dir_entry.is_file():
+                    continue
+                stat = dir_entry.stat()
+                entry = self.entries.get(dir_entry.path)
+                if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                    try:
+                        header = read_header(dir_entry.path)
+                    except (OSError, ValueError) as e:
+                        print(f"Error reading the save {dir_entry.path}: {e}")
+                        continue
+                    parsed += 1
+                    entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'date': header.get('date', ""), 'player': header.get('player', "")}
+                entries[dir_entry.path] = entry
+                saves.append(dict(entry, path=dir_entry.path, name=dir_entry.name[:-3], user_dir=user_dir))
+
+        if parsed or entries.keys() != self.entries.keys():
+            self.entries = entries
+            self.save()
+
+        self.last_scan = {'saves': len(saves), 'parsed': parsed, 'wall_time': time.perf_counter() - start_time}
+        print(f"Save scan: {len(saves)} saves, {parsed} headers read in {self.last_scan['wall_time'] * 1000:.1f} ms")
+        return sorted(saves, key=lambda save: save['mtime_ns'], reverse=True)
@@ -0,0 +1,106 @@
+import os
+import time
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView
+from PyQt6.QtGui import QDesktopServices
+from PyQt6.QtCore import QUrl
+
+from scr.saveindex import SaveIndex, SAVE_INDEX_FILE, save_folders, mods_for_save
+from scr.supervisor import read_history
+
+class SavesDialog(QDialog):
+    """Lists the saves of every user directory, "Continue" starts the game with the mods a save was played with.
+
+    After exec(), selected_mods holds the mods to continue with, or None.
+    """
+
+    def __init__(self, game_root, user_dirs, history_file, parent=None):
+        super().__init__(parent)
+        self.index = SaveIndex(os.path.join(game_root, "mod", SAVE_INDEX_FILE))
+        self.folders = save_folders(user_dirs)
+        self.sessions = read_history(history_file)
+        self.saves = []
+        self.selected_mods = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("Saves")
+        self.resize(720, 420)
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.save_table = QTableWidget(0, 5)
+        self.save_table.setHorizontalHeaderLabels(["Save", "Player", "Date", "Saved", "Mods"])
+        self.save_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.save_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.save_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.save_table.verticalHeader().setVisible(False)
+        self.save_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
+        self.save_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.save_table.itemDoubleClicked.connect(self.continue_save)
+        layout.addWidget(self.save_table)
+
+        button_layout = QHBoxLayout()
+        self.folder_button = QPushButton("Open Save Folder")
+        self.folder_button.clicked.connect(self.open_folder)
+        button_layout.addWidget(self.folder_button)
+        button_layout.addStretch()
+        self.continue_button = QPushButton("Continue")
+        self.continue_button.setEnabled(False)
+        self.continue_button.clicked.connect(self.continue_save)
+        button_layout.addWidget(self.continue_button)
+        self.close_button = QPushButton("Close")
+        self.close_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.load_saves()
+
+    def load_saves(self):
+        self.saves = self.index.refresh(self.folders)
+        self.save_table.setRowCount(len(self.saves))
+        for row, save in enumerate(self.saves):
+            mods, exact = mods_for_save(save, self.sessions)
+            save['mods'] = mods
+            if mods is None:
+                mods_text = "Unknown, played before sessions were recorded"
+            else:
+                mods_text = ", ".join(mods) if mods else "No mods"
+                if not exact:
+                    mods_text += " (probably)"
+            name = QTableWidgetItem(save['name'])
+            name.setToolTip(save['path'])
+            self.save_table.setItem(row, 0, name)
+            self.save_table.setItem(row, 1, QTableWidgetItem(save['player']))
+            self.save_table.setItem(row, 2, QTableWidgetItem(save['date']))
+            self.save_table.setItem(row, 3, QTableWidgetItem(time.strftime("%Y-%m-%d %H:%M", time.localtime(save['mtime_ns'] / 1e9))))
+            mods_item = QTableWidgetItem(mods_text)
+            mods_item.setToolTip("\n".join(mods) if mods else mods_text)
+            self.save_table.setItem(row, 4, mods_item)
+        self.save_table.resizeColumnsToContents()
+        self.status_label.setText(f"{len(self.saves)} saves" if self.saves else "No saves found.")
+        if self.saves:
+            self.save_table.selectRow(0)
+
+    def selected_save(self):
+        rows = self.save_table.selectionModel().selectedRows()
+        return self.saves[rows[0].row()] if rows else None
+
+    def on_selection_changed(self):
+        save = self.selected_save()
+        self.continue_button.setEnabled(save is not None and save['mods'] is not None)
+
+    def continue_save(self):
+        save = self.selected_save()
+        if save is None or save['mods'] is None:
+            return
+        self.selected_mods = save['mods']
+        self.accept()
+
+    def open_folder(self):
+        save = self.selected_save()
+        folder = os.path.dirname(save['path']) if save else self.folders[""]
+        os.makedirs(folder, exist_ok=True)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(folder))
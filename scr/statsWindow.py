@@ -0,0 +1,112 @@
+import time
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView
+from PyQt6.QtGui import QColor
+
+from scr.supervisor import read_history
+from scr.loadtiming import load_stats, changed_mods
+
+def seconds_text(value):
+    if value is None:
+        return "-"
+    return f"{value / 60:.1f} min" if value >= 120 else f"{value:.0f} s"
+
+def megabytes_text(value):
+    return f"{value / 1048576:.0f} MB" if value else "-"
+
+class StatsDialog(QDialog):
+    """Shows how long each mod combination took to load, and when it got slower."""
+
+    def __init__(self, history_file, parent=None):
+        super().__init__(parent)
+        self.groups = load_stats(read_history(history_file))
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("Load Times")
+        self.resize(720, 480)
+        layout = QVBoxLayout()
+
+        if not self.groups:
+            layout.addWidget(QLabel("No game sessions recorded yet. Sessions are recorded when \"Record Game Sessions\" is enabled in the settings."))
+
+        self.set_table = QTableWidget(len(self.groups), 6)
+        self.set_table.setHorizontalHeaderLabels(["Mods", "Sessions", "Last Load", "Usual Load", "Best Load", "Notes"])
+        self.set_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.set_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.set_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.set_table.verticalHeader().setVisible(False)
+        self.set_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for row, group in enumerate(self.groups):
+            label = QTableWidgetItem(group['label'])
+            label.setToolTip("\n".join(group['mods']) or "No mods")
+            self.set_table.setItem(row, 0, label)
+            self.set_table.setItem(row, 1, QTableWidgetItem(str(len(group['sessions']))))
+            self.set_table.setItem(row, 2, QTableWidgetItem(seconds_text(group['last'])))
+            self.set_table.setItem(row, 3, QTableWidgetItem(seconds_text(group['median'])))
+            self.set_table.setItem(row, 4, QTableWidgetItem(seconds_text(group['best'])))
+            notes = QTableWidgetItem(self.group_notes(group))
+            if group['regression'] or group['crashes']:
+                notes.setForeground(QColor("red"))
+            self.set_table.setItem(row, 5, notes)
+        self.set_table.itemSelectionChanged.connect(self.show_sessions)
+        layout.addWidget(self.set_table)
+
+        layout.addWidget(QLabel("Sessions of the selected mods, newest first:"))
+        self.session_table = QTableWidget(0, 5)
+        self.session_table.setHorizontalHeaderLabels(["Started", "Load", "Played", "Peak Memory", "Notes"])
+        self.session_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.session_table.verticalHeader().setVisible(False)
+        self.session_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.session_table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.close_button = QPushButton("Close")
+        self.close_button.clicked.connect(self.close)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        if self.groups:
+            self.set_table.selectRow(0)
+
+    def group_notes(self, group):
+        notes = []
+        if group['regression']:
+            note = f"Slower than usual ({seconds_text(group['last'])} against {seconds_text(group['baseline'])})"
+            if group['changed_mods']:
+                note += f" since updating {', '.join(group['changed_mods'])}"
+            notes.append(note)
+        if group['crashes']:
+            notes.append(f"{group['crashes']} crashed")
+        if len(group['loads']) > 1:
+            notes.append("Trend: " + " > ".join(seconds_text(load) for load in group['loads'][-5:]))
+        return "; ".join(notes)
+
+    def show_sessions(self):
+        rows = self.set_table.selectionModel().selectedRows()
+        sessions = self.groups[rows[0].row()]['sessions'] if rows else []
+        self.session_table.setRowCount(len(sessions))
+        previous_fingerprints = None
+        # Oldest first to compare each session with the one before it, shown newest first
+        for position, session in enumerate(sessions):
+            row = len(sessions) - 1 - position
+            notes = []
+            fingerprints = session.get('fingerprints') or {}
+            if previous_fingerprints is not None and changed_mods(previous_fingerprints, fingerprints):
+                notes.append(f"Updated: {', '.join(changed_mods(previous_fingerprints, fingerprints))}")
+            previous_fingerprints = fingerprints
+            if session.get('crashed'):
+                notes.append(f"Crashed with code {session.get('exit_code'):#x}")
+            if session.get('near_address_limit'):
+                notes.append("Close to the 4 GB memory limit")
+
+            started = time.strftime("%Y-%m-%d %H:%M", time.localtime(session.get('started', 0)))
+            self.session_table.setItem(row, 0, QTableWidgetItem(started))
+            self.session_table.setItem(row, 1, QTableWidgetItem(seconds_text(session.get('load_time'))))
+            self.session_table.setItem(row, 2, QTableWidgetItem(seconds_text(session.get('duration'))))
+            self.session_table.setItem(row, 3, QTableWidgetItem(megabytes_text(session.get('peak_rss'))))
+            note_item = QTableWidgetItem("; ".join(notes))
+            if session.get('crashed') or session.get('near_address_limit'):
+                note_item.setForeground(QColor("red"))
+            self.session_table.setItem(row, 4, note_item)
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import threading
+
+from scr.loadtiming import LoadTimer, mod_set_key
+from scr.paths import write_atomic
+
+HISTORY_FILE = "launcher_sessions.jsonl"
+HISTORY_LIMIT = 500  # Sessions kept, the file is trimmed once it holds twice as many
+SAMPLE_INTERVAL = 2.0  # Seconds between samples, the game runs for hours
+LOAD_POLL_INTERVAL = 0.5  # Seconds between log checks until the game reached its main menu
+ADDRESS_SPACE_LIMIT_MB = 4096  # v2game.exe is a 32 bit, large address aware program
+ADDRESS_SPACE_WARNING = 0.9  # Fraction of the limit that flags a session
+
+def read_history(history_file, limit=None):
+    """Returns the recorded sessions, oldest first, skipping lines that can't be read."""
+    sessions = []
+    try:
+        with open(history_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    sessions.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        return []
+    return sessions[-limit:] if limit else sessions
+
+def append_history(history_file, session, limit=HISTORY_LIMIT):
+    """Appends one session, trimming the file to the last limit sessions when it grew too long."""
+    with open(history_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(session, separators=(',', ':')) + "\n")
+    sessions = read_history(history_file)
+    if len(sessions) > 2 * limit:
+        write_atomic(history_file, "".join(json.dumps(kept, separators=(',', ':')) + "\n" for kept in sessions[-limit:]), encoding='utf-8')
+
+class ProcessSampler:
+    """Reads the CPU time, memory and thread count of one process, from /proc on Linux."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.handle = None
+        if os.name == 'nt':
+            self.open_windows_handle()
+        else:
+            self.clock_ticks = os.sysconf('SC_CLK_TCK')
+
+    def sample(self):
+        """Returns {'cpu_time', 'rss', 'address_space', 'threads'}, or None once the process is gone."""
+        try:
+            return self.sample_windows() if os.name == 'nt' else self.sample_proc()
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def sample_proc(self):
+        with open(f"/proc/{self.pid}/stat", 'r') as f:
+            # The command name may contain spaces, the fields after it are split on the closing parenthesis
+            fields = f.read().rpartition(')')[2].split()
+        status = {}
+        with open(f"/proc/{self.pid}/status", 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                status[key] = value.split()
+        return {
+            'cpu_time': (int(fields[11]) + int(fields[12])) / self.clock_ticks,  # utime + stime
+            'rss': int(status['VmRSS'][0]) * 1024 if 'VmRSS' in status else 0,
+            'address_space': int(status['VmSize'][0]) * 1024 if 'VmSize' in status else 0,
+            'threads': int(fields[17])
+        }
+
+    def open_windows_handle(self):
+        import ctypes
+        process_query_limited_information = 0x1000
+        process_vm_read = 0x0010
+        self.handle = ctypes.windll.kernel32.OpenProcess(process_query_limited_information | process_vm_read, False, self.pid)
+
+    def sample_windows(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS_EX(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+                ('PrivateUsage', ctypes.c_size_t)
+            ]
+
+        class THREADENTRY32(ctypes.Structure):
+            _fields_ = [
+                ('dwSize', wintypes.DWORD), ('cntUsage', wintypes.DWORD), ('th32ThreadID', wintypes.DWORD),
+                ('th32OwnerProcessID', wintypes.DWORD), ('tpBasePri', wintypes.LONG), ('tpDeltaPri', wintypes.LONG),
+                ('dwFlags', wintypes.DWORD)
+            ]
+
+        kernel32 = ctypes.windll.kernel32
+        if not self.handle:
+            raise OSError("The game process could not be opened")
+
+        creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        if not kernel32.GetProcessTimes(self.handle, ctypes.byref(creation), ctypes.byref(exit_time), ctypes.byref(kernel), ctypes.byref(user)):
+            raise ctypes.WinError()
+        exit_code = wintypes.DWORD()
+        still_active = 259
+        if not kernel32.GetExitCodeProcess(self.handle, ctypes.byref(exit_code)) or exit_code.value != still_active:
+            return None
+
+        counters = PROCESS_MEMORY_COUNTERS_EX()
+        counters.cb = ctypes.sizeof(counters)
+        if not kernel32.K32GetProcessMemoryInfo(self.handle, ctypes.byref(counters), counters.cb):
+            raise ctypes.WinError()
+
+        threads = 0
+        th32cs_snapthread = 0x00000004
+        snapshot = kernel32.CreateToolhelp32Snapshot(th32cs_snapthread, 0)
+        if snapshot not in (0, -1):
+            try:
+                entry = THREADENTRY32()
+                entry.dwSize = ctypes.sizeof(entry)
+                found = kernel32.Thread32First(snapshot, ctypes.byref(entry))
+                while found:
+                    if entry.th32OwnerProcessID == self.pid:
+                        threads += 1
+                    found = kernel32.Thread32Next(snapshot, ctypes.byref(entry))
+            finally:
+                kernel32.CloseHandle(snapshot)
+
+        def seconds(filetime):
+            return ((filetime.dwHighDateTime << 32) | filetime.dwLowDateTime) / 10_000_000
+
+        return {
+            'cpu_time': seconds(kernel) + seconds(user),
+            'rss': counters.WorkingSetSize,
+            'address_space': counters.PrivateUsage,  # Committed private bytes, what runs out first in a 32 bit process
+            'threads': threads
+        }
+
+    def close(self):
+        if self.handle:
+            import ctypes
+            ctypes.windll.kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+class SessionSupervisor:
+    """Follows a started game until it exits, then records the session in the history file.
+
+    Given the game's log folder it also times the load to the main menu, see LoadTimer.
+
+    The thread is not a daemon, so the launcher process stays around (without a window)
+    until the game exits and the session is written.
+    """
+
+    def __init__(self, process, mods, history_file, preset=None, user_dir="", interval=SAMPLE_INTERVAL, address_space_limit_mb=ADDRESS_SPACE_LIMIT_MB,
+                 log_folder=None, ready_marker="", fingerprints=None):
+        # Created right after the spawn, the load is timed from here
+        self.started = time.time()
+        self.start_time = time.monotonic()
+        self.process = process
+        self.mods = list(mods)
+        self.fingerprints = dict(fingerprints or {})
+        self.load_timer = LoadTimer(log_folder, self.started, ready_marker) if log_folder else None
+        self.history_file = history_file
+        self.preset = preset
+        self.user_dir = user_dir
+        self.interval = interval
+        self.address_space_limit = address_space_limit_mb * 1024 * 1024
+        self.thread = None
+        self.session = None  # The recorded session, once the game exited
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="SessionSupervisor")
+        self.thread.start()
+
+    def run(self):
+        sampler = ProcessSampler(self.process.pid)
+        peaks = {'cpu_time': 0, 'rss': 0, 'address_space': 0, 'threads': 0}
+        samples = 0
+        try:
+            while self.process.poll() is None:
+                sample = sampler.sample()
+                if sample:
+                    samples += 1
+                    for key, value in sample.items():
+                        peaks[key] = max(peaks[key], value)
+                loading = self.load_timer is not None and not self.load_timer.poll(time.time())
+                try:
+                    self.process.wait(timeout=LOAD_POLL_INTERVAL if loading else self.interval)
+                except Exception:
+                    pass  # Still running, take the next sample
+        finally:
+            sampler.close()
+        if self.load_timer is not None:
+            self.load_timer.poll(time.time())  # The game may have got to its menu since the last check
+
+        exit_code = self.process.returncode
+        if os.name == 'nt' and exit_code is not None and exit_code < 0:
+            exit_code &= 0xFFFFFFFF  # Crash codes like 0xC0000005 read as negative numbers
+        near_limit = peaks['address_space'] >= self.address_space_limit * ADDRESS_SPACE_WARNING
+        self.session = {
+            'started': round(self.started, 3),
+            'duration': round(time.monotonic() - self.start_time, 1),
+            'preset': self.preset,
+            'mods': self.mods,
+            'mod_set': mod_set_key(self.mods),
+            'fingerprints': self.fingerprints,
+            'load_time': self.load_timer.load_time if self.load_timer else None,
+            'load_detected_by': self.load_timer.detected_by if self.load_timer else None,
+            'user_dir': self.user_dir,
+            'exit_code': exit_code,
+            'crashed': exit_code not in (0, None),
+            'cpu_time': round(peaks['cpu_time'], 2),
+            'peak_rss': peaks['rss'],
+            'peak_address_space': peaks['address_space'],
+            'peak_threads': peaks['threads'],
+            'samples': samples,
+            'near_address_limit': near_limit
+        }
+        if self.session['crashed']:
+            print(f"The game exited with code {exit_code:#x} after {self.session['duration']} s")
+        if self.session['load_time'] is not None:
+            print(f"The game took {self.session['load_time']} s to load")
+        if near_limit:
+            print(f"The game used {peaks['address_space'] / 1048576:.0f} MB of its {self.address_space_limit / 1048576:.0f} MB address space")
+        try:
+            append_history(self.history_file, self.session)
+        except OSError as e:
+            print(f"Error saving the session history: {e}")
@@ -0,0 +1,163 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scr import profiling
+
+GITHUB_API_ROOT = "https://api.github.com"
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 10
+GITHUB_DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def github_api_url(github_url, api_root=GITHUB_API_ROOT):
+    """Turns a https://github.com/<owner>/<repo> link into its API repository url."""
+    repo_path = github_url.split("github.com", 1)[-1].strip().strip("/")
+    if repo_path.endswith(".git"):
+        repo_path = repo_path[:-4]
+    return f"{api_root.rstrip('/')}/repos/{repo_path}"
+
+
+class UpdateChecker:
+    """Checks the GitHub tracked mods for new releases and commits on a thread pool."""
+
+    def __init__(self, mod_files, mod_folder, api_root=GITHUB_API_ROOT, max_workers=MAX_WORKERS, session=None, cache=None):
+        self.mod_files = mod_files
+        self.mod_folder = mod_folder
+        self.api_root = api_root
+        self.max_workers = max_workers
+        self.session = session
+        self.cache = cache
+        self.cancelled = threading.Event()
+
+    def create_session(self):
+        """Creates one keep-alive session shared by every worker thread."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "TGLauncher"
+        })
+        return session
+
+    def cancel(self):
+        """Stops handing out new checks, the ones already in flight are discarded."""
+        self.cancelled.set()
+
+    def get_json(self, url):
+        if self.cache:
+            return self.cache.get_json(self.session, url, timeout=REQUEST_TIMEOUT)
+        response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 200:
+            return response.json()
+        return None
+
+    def latest_commit_date(self, repo_api_url):
+        """Returns the committer date of the newest commit, asking GitHub for a single commit only."""
+        latest_commit_info = self.get_json(repo_api_url + "/commits?per_page=1")
+        if latest_commit_info:
+            return latest_commit_info[0]['commit']['committer']['date']
+        return None
+
+    def check_mod(self, mod_name, mod_info):
+        """Returns an (update_text, github_url) tuple if the mod has updates, None otherwise."""
+        github_url = mod_info.get('github')
+        current_release = mod_info.get('release')
+        mod_file_path = os.path.join(self.mod_folder, mod_info['file'])
+        repo_api_url = github_api_url(github_url, self.api_root)
+
+        # Check for latest release
+        latest_release_tag = None
+        latest_release_date = None
+        latest_release_info = self.get_json(repo_api_url + "/releases/latest")
+        if latest_release_info:
+            latest_release_tag = latest_release_info.get('tag_name', None)
+            latest_release_date = latest_release_info.get('published_at', None)
+
+        # Check modification date of local mod file
+        mod_last_modified_timestamp = os.path.getmtime(mod_file_path)
+        mod_last_modified_date = datetime.utcfromtimestamp(mod_last_modified_timestamp)
+
+        has_new_release = False
+        has_new_commit = False
+        # Compare release date
+        if latest_release_date:
+            latest_release_date = datetime.strptime(latest_release_date, GITHUB_DATE_FORMAT)
+            if (latest_release_tag and latest_release_tag != current_release) or latest_release_date > mod_last_modified_date:
+                has_new_release = True
+
+        # A new release already means an update, the commit lookup would not change that
+        if has_new_release or self.cancelled.is_set():
+            latest_commit_date = None
+        else:
+            latest_commit_date = self.latest_commit_date(repo_api_url)
+
+        # Compare commit date
+        if latest_commit_date:
+            latest_commit_date = datetime.strptime(latest_commit_date, GITHUB_DATE_FORMAT)
+            if latest_commit_date > mod_last_modified_date:
+                has_new_commit = True
+
+        if has_new_release:
+            return (f"{mod_name} - New packed release available: {latest_release_tag}", github_url)
+        elif has_new_commit:
+            return (f"{mod_name} - New commits avaliable.", github_url)
+        return None
+
+    @profiling.traced('update check')
+    def run(self, on_result=None, on_progress=None, on_error=None):
+        """Checks every tracked mod, reporting each one through the callbacks as soon as it finishes.
+
+        on_result(update_text, url), on_progress(done, total) and on_error(mod_name, error)
+        are called from the thread running this method. Returns the list of updates found.
+        """
+        tracked_mods = [(name, info) for name, info in self.mod_files.items() if info.get('github')]
+        total = len(tracked_mods)
+        done = 0
+        updates = []
+        if on_progress:
+            on_progress(done, total)
+        if not tracked_mods:
+            return updates
+
+        owns_session = self.session is None
+        if owns_session:
+            self.session = self.create_session()
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, total))
+        try:
+            pending = {executor.submit(self.check_mod, name, info): name for name, info in tracked_mods}
+            while pending and not self.cancelled.is_set():
+                # Wake up periodically so a cancellation is noticed even while requests hang
+                finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    mod_name = pending.pop(future)
+                    done += 1
+                    try:
+                        update = future.result()
+                    except Exception as e:
+                        if on_error:
+                            on_error(mod_name, e)
+                        update = None
+                    if update and not self.cancelled.is_set():
+                        updates.append(update)
+                        if on_result:
+                            on_result(*update)
+                    if on_progress:
+                        on_progress(done, total)
+        finally:
+            executor.shutdown(wait=not self.cancelled.is_set(), cancel_futures=True)
+            if owns_session and not self.cancelled.is_set():
+                self.session.close()
+                self.session = None
+            if self.cache:
+                self.cache.save()
+                print(f"Update check cache: {self.cache.stats()}")
+
+        return updates
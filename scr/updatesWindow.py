@@ -1,15 +1,38 @@
 import os
-import requests
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QListWidget, QPushButton, QListWidgetItem
-from PyQt6.QtCore import Qt
-from datetime import datetime
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 import webbrowser
 
+from scr.updatechecker import UpdateChecker
+from scr.httpcache import HttpCache, DEFAULT_TTL
+
+HTTP_CACHE_FILE = "launcher_http_cache.json"
+
+class UpdateCheckWorker(QThread):
+    """Runs the UpdateChecker off the GUI thread and forwards its results as signals."""
+    update_found = pyqtSignal(str, str)
+    progress = pyqtSignal(int, int)
+    error = pyqtSignal(str, str)
+
+    def __init__(self, checker, parent=None):
+        super().__init__(parent)
+        self.checker = checker
+
+    def run(self):
+        self.checker.run(
+            on_result=self.update_found.emit,
+            on_progress=self.progress.emit,
+            on_error=lambda mod_name, e: self.error.emit(mod_name, str(e))
+        )
+
 class UpdateCheckerDialog(QDialog):
-    def __init__(self, mod_files, mod_folder, parent=None):
+    def __init__(self, mod_files, mod_folder, parent=None, cache_ttl=DEFAULT_TTL):
         super().__init__(parent)
         self.mod_files = mod_files
         self.mod_folder = mod_folder
+        self.cache = HttpCache(os.path.join(mod_folder, HTTP_CACHE_FILE), ttl=cache_ttl)
+        self.worker = None
+        self.errors = []
         self.init_ui()
 
     def init_ui(self):
@@ -34,76 +57,59 @@ class UpdateCheckerDialog(QDialog):
         self.check_for_updates()
 
     def check_for_updates(self):
-        mods_with_updates = []
-        for mod_name, mod_info in self.mod_files.items():
-            github_url = mod_info.get('github')
-            current_release = mod_info.get('current_release')
-            mod_file_path = os.path.join(self.mod_folder, mod_info['file'])
-
-            if github_url:
-                try:
-                    # Check for latest release
-                    release_api_url = github_url.replace("github.com", "api.github.com/repos") + "/releases/latest"
-                    release_response = requests.get(release_api_url)
-                    latest_release_info = {}
-                    latest_release_tag = None
-                    latest_release_date = None
-                    if release_response.status_code == 200:
-                        latest_release_info = release_response.json()
-                        latest_release_tag = latest_release_info.get('tag_name', None)
-                        latest_release_date = latest_release_info.get('published_at', None)
-
-                    # Check for latest commit
-                    commit_api_url = github_url.replace("github.com", "api.github.com/repos") + "/commits"
-                    commit_response = requests.get(commit_api_url)
-                    latest_commit_date = None
-                    if commit_response.status_code == 200:
-                        latest_commit_info = commit_response.json()
-                        latest_commit_date = latest_commit_info[0]['commit']['committer']['date']
-
-                    # Check modification date of local mod file
-                    mod_last_modified_timestamp = os.path.getmtime(mod_file_path)
-                    mod_last_modified_date = datetime.utcfromtimestamp(mod_last_modified_timestamp)
-
-                    has_new_release = False
-                    has_new_commit = False
-                    # Compare release date
-                    if latest_release_date:
-                        latest_release_date = datetime.strptime(latest_release_date, "%Y-%m-%dT%H:%M:%SZ")
-                        if (latest_release_tag and latest_release_tag != current_release) or latest_release_date>mod_last_modified_date:
-                            has_new_release = True
-                    
-                    # Compare commit date
-                    if latest_commit_date:
-                        latest_commit_date = datetime.strptime(latest_commit_date, "%Y-%m-%dT%H:%M:%SZ")
-                        if latest_commit_date > mod_last_modified_date:
-                            has_new_commit = True
-
-                    if has_new_release and has_new_commit:
-                        mods_with_updates.append((f"{mod_name} - New packed release, {latest_release_tag}, and new commits avaliable.", github_url))
-                    elif has_new_release:
-                        mods_with_updates.append((f"{mod_name} - New packed release available: {latest_release_tag}", github_url))
-                    elif has_new_commit:
-                        mods_with_updates.append((f"{mod_name} - New commits avaliable.", github_url))
-
-                except Exception as e:
-                    self.status_label.setText(f"An error occurred while displaying the updates, report it to Wyrm on the discord server: {e}")
-
-        if mods_with_updates:
-            try:
-                self.mod_list.clear()
-                for update_text, url in mods_with_updates:
-                    item = QListWidgetItem(update_text)
-                    if url:
-                        item.setData(Qt.ItemDataRole.UserRole, url)
-                    self.mod_list.addItem(item)
-                self.status_label.setText("Updates found for the following mods (Click to go to the download page):")
-            except Exception as e:
-                self.status_label.setText(f"An error occurred while displaying the updates, report it to Wyrm on the discord server: {e}")
+        """Starts the background check, results are added to the list as they arrive."""
+        self.mod_list.clear()
+        self.errors = []
+        self.checker = UpdateChecker(self.mod_files, self.mod_folder, cache=self.cache)
+        self.worker = UpdateCheckWorker(self.checker, self)
+        self.worker.update_found.connect(self.on_update_found)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.error.connect(self.on_error)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.start()
+
+    def on_update_found(self, update_text, url):
+        try:
+            item = QListWidgetItem(update_text)
+            if url:
+                item.setData(Qt.ItemDataRole.UserRole, url)
+            self.mod_list.addItem(item)
+        except Exception as e:
+            self.status_label.setText(f"An error occurred while displaying the updates, report it to Wyrm on the discord server: {e}")
+
+    def on_progress(self, done, total):
+        if done < total:
+            self.status_label.setText(f"Checking for updates... ({done}/{total})")
+
+    def on_error(self, mod_name, error):
+        print(f"Error checking updates for {mod_name}: {error}")
+        self.errors.append(error)
+
+    def on_finished(self):
+        if self.checker.cancelled.is_set():
+            return
+        if self.errors:
+            self.status_label.setText(f"An error occurred while displaying the updates, report it to Wyrm on the discord server: {self.errors[-1]}")
+        elif self.mod_list.count():
+            self.status_label.setText("Updates found for the following mods (Click to go to the download page):")
         else:
             self.status_label.setText("All mods are up to date.")
 
+    def stop_checking(self):
+        """Cancels the running check so closing the dialog never waits on the network."""
+        if self.worker and self.worker.isRunning():
+            self.checker.cancel()
+            self.worker.wait()
+
+    def closeEvent(self, event):
+        self.stop_checking()
+        super().closeEvent(event)
+
+    def reject(self):
+        self.stop_checking()
+        super().reject()
+
     def on_item_clicked(self, item):
         url = item.data(Qt.ItemDataRole.UserRole)
         if url:
-            webbrowser.open(url)
\ No newline at end of file
+            webbrowser.open(url)
@@ -0,0 +1,73 @@
+import os
+
+from scr.gameroot import has_game
+from scr.paths import user_data_dir
+
+ERROR = "error"  # The game would fail or crash
+WARNING = "warning"  # The game starts, but not quite as expected
+CACHE_LIMIT = 64  # Mod selections remembered per mod index generation
+
+def writable(path):
+    """Whether path, or the folder it would be created in, can be written to."""
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return False
+        path = parent
+    return os.access(path, os.W_OK)
+
+def validate(game_root, selected_mods, mods, user_dir, graph):
+    """Checks a mod selection before launching, returns [(ERROR or WARNING, message)].
+
+    mods is {mod name: info} as read by gamelaunch.read_mods, graph the DependencyGraph
+    of every installed mod. Only the file system is read, nothing is changed.
+    """
+    problems = []
+    if not has_game(game_root):
+        problems.append((ERROR, f"v2game.exe is missing from {game_root}"))
+
+    for mod in selected_mods:
+        mod_info = mods.get(mod)
+        if mod_info is None:
+            problems.append((ERROR, f"{mod} is no longer installed"))
+            continue
+        if not os.path.isfile(os.path.join(game_root, "mod", mod_info['file'])):
+            problems.append((ERROR, f"{mod}: mod/{mod_info['file']} is missing"))
+        if mod_info['path'] and not os.path.isdir(os.path.join(game_root, mod_info['path'])):
+            problems.append((ERROR, f"{mod}: its folder {mod_info['path']} is missing"))
+        absent = [dep for dep in mod_info['dependencies'] if dep not in graph.dependencies]
+        if absent:
+            problems.append((ERROR, f"{mod} needs mods that are not installed: {', '.join(absent)}"))
+        unchecked = [dep for dep in graph.transitive_dependencies(mod) if dep not in selected_mods]
+        if unchecked:
+            problems.append((WARNING, f"{mod} needs mods that are not checked: {', '.join(unchecked)}"))
+
+    settings_file = user_data_dir(user_dir, "settings.txt")
+    if not os.path.isfile(settings_file):
+        problems.append((WARNING, f"No settings.txt in {user_data_dir(user_dir)} yet, the game creates it and the update time applies from the next launch"))
+    elif not os.access(settings_file, os.W_OK):
+        problems.append((WARNING, f"{settings_file} is read only, the update time can't be set"))
+
+    if not writable(user_data_dir(user_dir)):
+        problems.append((ERROR, f"{user_data_dir(user_dir)} can't be written to, the game can't save or build its cache"))
+    if not writable(os.path.join(game_root, "mod")):
+        problems.append((WARNING, "The mod folder can't be written to, the launcher settings won't be saved"))
+    return problems
+
+class ValidationCache:
+    """Results computed for mod selections, like their problems, dropped whenever the mod index generation changes."""
+
+    def __init__(self):
+        self.generation = None
+        self.results = {}  # {(user_dir, mods in load order): problems}
+
+    def get(self, generation, key):
+        if generation != self.generation:
+            return None
+        return self.results.get(key)
+
+    def put(self, generation, key, problems):
+        if generation != self.generation or len(self.results) >= CACHE_LIMIT:
+            self.generation = generation
+            self.results = {}
+        self.results[key] = problems
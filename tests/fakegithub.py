@@ -0,0 +1,70 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeGitHub:
+    """A local stand-in for the GitHub API, serving {path: JSON payload} with ETags.
+
+    Unknown paths answer 404, a request with the current ETag answers 304. Every
+    request is recorded as (path, status, body bytes).
+    """
+
+    def __init__(self, routes=None, delay=0.0):
+        self.routes = dict(routes or {})
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def api_root(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like api.github.com
+            wbufsize = 64 * 1024  # Headers and body leave in one packet, or Nagle delays every keep-alive answer
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if fake.delay:
+                    threading.Event().wait(fake.delay)
+                payload = fake.routes.get(self.path)
+                if payload is None:
+                    self.reply(404, b'{"message": "Not Found"}')
+                    return
+                body = json.dumps(payload).encode('utf-8')
+                etag = f'"{hash(body) & 0xffffffff:x}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.reply(304, b"", etag)
+                else:
+                    self.reply(200, body, etag)
+
+            def reply(self, status, body, etag=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+                with fake.lock:
+                    fake.requests.append((self.path, status, len(body)))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
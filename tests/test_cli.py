@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+from scr import cli
+from scr.launcherconfig import CONFIG_FILE
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def game_root(tmp_path, monkeypatch):
+    """A fake Victoria II folder with a submod named before its parent, and a preset of both."""
+    monkeypatch.setenv('HOME', str(tmp_path / "home"))
+    root = tmp_path / "game"
+    (root / "mod" / "Base").mkdir(parents=True)
+    (root / "mod" / "Sub").mkdir()
+    (root / "v2game.exe").write_text("")
+    (root / "mod" / "a_sub.mod").write_text('name = "A Sub"\npath = "mod/Sub"\nuser_dir = "sub"\ndependencies = { "Z Base" }\n')
+    (root / "mod" / "z_base.mod").write_text('name = "Z Base"\npath = "mod/Base"\nuser_dir = "base"\n')
+    config = {'presets': {'Both': ["A Sub", "Z Base", "Gone"]}, 'update_time': "2.5", 'wine_command': "wine"}
+    (root / "mod" / CONFIG_FILE).write_text(json.dumps(config))
+    settings = tmp_path / "home" / "Documents" / "Paradox Interactive" / "Victoria II" / "sub" / "settings.txt"
+    settings.parent.mkdir(parents=True)
+    settings.write_text("update_time=1.000000\n")
+    return root
+
+
+def test_dry_run(game_root, capsys):
+    settings = os.path.join(os.environ['HOME'], "Documents", "Paradox Interactive", "Victoria II", "sub", "settings.txt")
+    assert cli.main(['--preset', 'Both', '--dry-run', '--game-root', str(game_root), '--affinity', 'all']) == 0
+    output = capsys.readouterr().out
+    assert "Skipping mods of the preset that are not installed: Gone" in output
+    assert "Mods in load order: Z Base, A Sub" in output
+    assert f"Would set update_time=2.500000 in {settings}" in output
+    assert output.rstrip().endswith(f"wine {os.path.join(str(game_root), 'v2game.exe')} -mod=mod/z_base.mod -mod=mod/a_sub.mod")
+    with open(settings) as f:
+        assert f.read() == "update_time=1.000000\n"
+
+
+def test_unknown_preset(game_root, capsys):
+    assert cli.main(['--preset', 'Nope', '--dry-run', '--game-root', str(game_root)]) == 1
+    assert "No preset named 'Nope'. Saved presets: Both" in capsys.readouterr().out
+
+
+def test_relative_game_root(game_root, capsys, monkeypatch):
+    monkeypatch.chdir(game_root.parent)
+    assert cli.main(['--preset', 'Both', '--dry-run', '--game-root', game_root.name]) == 0
+    assert f"{os.path.join(str(game_root), 'v2game.exe')} -mod=mod/z_base.mod" in capsys.readouterr().out
+
+
+def test_broken_config(game_root, capsys):
+    (game_root / "mod" / CONFIG_FILE).write_text("{broken")
+    assert cli.main(['--preset', 'Both', '--dry-run', '--game-root', str(game_root)]) == 1
+    assert "Could not read" in capsys.readouterr().out
+    assert (game_root / "mod" / CONFIG_FILE).read_text() == "{broken"
+
+
+@pytest.mark.parametrize('arguments', [['--preset', 'Both'], ['--preset=Both']])
+def test_launcher_runs_headless(game_root, arguments):
+    # A fall through to the window would hang until the timeout instead
+    result = subprocess.run(
+        [sys.executable, "launcher.py", *arguments, "--dry-run", "--game-root", str(game_root)],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=60, env=dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "-mod=mod/z_base.mod -mod=mod/a_sub.mod" in result.stdout
+
+
+def test_launcher_help():
+    result = subprocess.run(
+        [sys.executable, "launcher.py", "--help"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=60, env=dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    )
+    assert result.returncode == 0
+    assert "usage: launcher" in result.stdout
@@ -0,0 +1,44 @@
+import os
+
+from scr.conflictindex import ConflictIndex, INDEX_FILE
+
+
+def write_files(mod_dir, paths):
+    for path in paths:
+        os.makedirs(os.path.join(mod_dir, os.path.dirname(path)), exist_ok=True)
+        open(os.path.join(mod_dir, path), 'w').close()
+
+
+def game_root(tmp_path):
+    write_files(tmp_path / "mod" / "Base", ["common/defines.lua", "events/Base.txt", "gfx/flags/ENG.tga", ".git/HEAD"])
+    write_files(tmp_path / "mod" / "Sub", ["common/Defines.lua", "gfx/flags/ENG.tga", "events/Sub.txt", ".git/HEAD"])
+    write_files(tmp_path / "mod" / "Music", ["music/song.ogg", "gfx/flags/ENG.tga"])
+    return str(tmp_path)
+
+
+def test_conflicts_in_selection_order(tmp_path):
+    index = ConflictIndex(game_root(tmp_path))
+    index.refresh(["mod/Base", "mod/Sub", "mod/Music"])
+    selection = [("Sub", "mod/Sub"), ("Music", "mod/Music"), ("Base", "mod/Base")]
+    assert index.conflicts(selection) == {
+        "common/defines.lua": ["Sub", "Base"],  # Paths compare case insensitively, like on Windows
+        "gfx/flags/eng.tga": ["Sub", "Music", "Base"],
+    }
+    assert index.conflicts([("Base", "mod/Base"), ("Music", "mod/Music")]) == {"gfx/flags/eng.tga": ["Base", "Music"]}
+    assert index.conflicts([("Base", "mod/Base")]) == {}
+
+
+def test_saved_index_is_updated_incrementally(tmp_path):
+    root = game_root(tmp_path)
+    ConflictIndex(root).refresh(["mod/Base", "mod/Sub"])
+    assert os.path.exists(os.path.join(root, "mod", INDEX_FILE))
+
+    index = ConflictIndex(root)
+    assert "events/base.txt" in index.files("mod/Base")
+    write_files(os.path.join(root, "mod", "Sub"), ["events/Base.txt"])
+    os.remove(os.path.join(root, "mod", "Sub", "common", "Defines.lua"))
+    index.refresh(["mod/Base", "mod/Sub"])
+    assert index.conflicts([("Base", "mod/Base"), ("Sub", "mod/Sub")]) == {
+        "events/base.txt": ["Base", "Sub"],
+        "gfx/flags/eng.tga": ["Base", "Sub"],
+    }
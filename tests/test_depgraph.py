@@ -0,0 +1,58 @@
+from scr.depgraph import DependencyGraph
+
+
+def test_missing_dependencies():
+    graph = DependencyGraph({'HPM': [], 'Submod': ['HPM', 'Music', 'Music'], 'Music': [], 'Flags': ['GFM']})
+    assert graph.missing_dependencies() == {'Flags': ['GFM']}
+    assert DependencyGraph({'HPM': [], 'Submod': ['HPM']}).missing_dependencies() == {}
+
+
+def test_transitive_dependencies():
+    graph = DependencyGraph({'A': ['B'], 'B': ['C', 'Gone'], 'C': [], 'D': []})
+    assert graph.transitive_dependencies('A') == ['B', 'C']
+    assert graph.transitive_dependencies('C') == []
+    assert graph.transitive_dependencies('Unknown') == []
+
+
+def test_transitive_dependencies_of_a_loop():
+    graph = DependencyGraph({'A': ['B'], 'B': ['A']})
+    assert graph.transitive_dependencies('A') == ['B']
+
+
+def test_transitive_dependencies_of_a_long_chain():
+    count = 5000  # Deeper than the recursion limit
+    graph = DependencyGraph({f"mod{i}": [f"mod{i + 1}"] if i + 1 < count else [] for i in range(count)})
+    assert len(graph.transitive_dependencies('mod0')) == count - 1
+
+
+def test_find_cycles():
+    graph = DependencyGraph({'A': ['B'], 'B': ['C'], 'C': ['A'], 'D': ['A'], 'E': ['E'], 'F': ['Gone']})
+    cycles = graph.find_cycles()
+    assert sorted(sorted(cycle) for cycle in cycles) == [['A', 'B', 'C'], ['E']]
+
+
+def test_find_cycles_without_loops():
+    graph = DependencyGraph({'A': ['B', 'C'], 'B': ['C'], 'C': []})
+    assert graph.find_cycles() == []
+
+
+def test_load_order_puts_dependencies_first():
+    graph = DependencyGraph({'Submod': ['HPM'], 'HPM': [], 'Music': []})
+    assert graph.load_order(['Submod', 'Music', 'HPM']) == ['HPM', 'Submod', 'Music']
+
+
+def test_load_order_keeps_independent_mods_in_order():
+    graph = DependencyGraph({'A': [], 'B': [], 'C': []})
+    assert graph.load_order(['C', 'A', 'B']) == ['C', 'A', 'B']
+
+
+def test_load_order_ignores_unselected_dependencies():
+    graph = DependencyGraph({'A': ['B'], 'B': ['C'], 'C': []})
+    assert graph.load_order(['A', 'C']) == ['C', 'A']
+
+
+def test_load_order_of_a_loop():
+    graph = DependencyGraph({'A': ['B'], 'B': ['A'], 'C': []})
+    order = graph.load_order(['A', 'C', 'B'])
+    assert sorted(order) == ['A', 'B', 'C']
+    assert order.index('C') == 2
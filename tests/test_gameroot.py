@@ -0,0 +1,108 @@
+import os
+import threading
+
+import pytest
+
+from scr import gameroot
+from scr.gameroot import parse_vdf, steam_library_dirs, find_game_root, probe, STEAM_GAME_FOLDER
+
+LIBRARY_FOLDERS = r'''
+"libraryfolders"
+{
+	"0"
+	{
+		"path"		"%s"
+		"label"		""
+		"apps"
+		{
+			"228980"		"123"
+		}
+	}
+	"1"
+	{
+		"Path"		"%s"
+	}
+}
+'''
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv('APPDATA', raising=False)
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(tmp_path / "config"))
+
+
+def install_game(folder):
+    os.makedirs(folder, exist_ok=True)
+    open(os.path.join(folder, "v2game.exe"), 'w').close()
+    return str(folder)
+
+
+def steam_install(tmp_path, libraries):
+    steam_dir = tmp_path / "Steam"
+    (steam_dir / "steamapps").mkdir(parents=True)
+    escaped = [str(library).replace("\\", "\\\\") for library in libraries]
+    (steam_dir / "steamapps" / "libraryfolders.vdf").write_text(LIBRARY_FOLDERS % tuple(escaped))
+    return str(steam_dir)
+
+
+def test_parse_vdf():
+    text = '"a" { "path" "D:\\\\Steam \\"Library\\"" "nested" { "x" "1" } } "b" "2" }'
+    assert parse_vdf(text) == {'a': {'path': 'D:\\Steam "Library"', 'nested': {'x': '1'}}, 'b': '2'}
+    assert parse_vdf('"LibraryFolders" { "TimeNextStatsReport" "1" "1" "E:\\\\Games" ') == {
+        'LibraryFolders': {'TimeNextStatsReport': '1', '1': 'E:\\Games'}
+    }
+
+
+def test_steam_library_dirs(tmp_path):
+    first, second = tmp_path / "LibraryA", tmp_path / "Library B"
+    steam_dir = steam_install(tmp_path, [first, second])
+    (tmp_path / "Steam" / "config").mkdir()
+    (tmp_path / "Steam" / "config" / "libraryfolders.vdf").write_text('"LibraryFolders" { "1" "%s" "ContentStatsID" "5" }' % first)
+    assert steam_library_dirs([steam_dir, str(tmp_path / "NoSteam")]) == [steam_dir, str(first), str(second)]
+
+
+def test_finds_the_game_in_a_steam_library_and_remembers_it(tmp_path):
+    library = tmp_path / "Library B"
+    game = install_game(library / "steamapps" / "common" / STEAM_GAME_FOLDER)
+    steam_dir = steam_install(tmp_path, [tmp_path / "LibraryA", library])
+    launcher_folder = tmp_path / "launcher"
+    launcher_folder.mkdir()
+    assert find_game_root(str(launcher_folder), steam_dirs=[steam_dir]) == game
+    # The remembered root is used without reading Steam's files again
+    assert find_game_root(str(launcher_folder), steam_dirs=[]) == game
+
+    os.remove(os.path.join(game, "v2game.exe"))
+    assert find_game_root(str(launcher_folder), steam_dirs=[]) is None
+
+
+def test_the_launcher_folder_comes_first(tmp_path):
+    game = install_game(tmp_path / "game")
+    steam_dir = steam_install(tmp_path, [tmp_path / "Library", tmp_path / "Other"])
+    install_game(tmp_path / "Library" / "steamapps" / "common" / STEAM_GAME_FOLDER)
+    assert find_game_root(game, steam_dirs=[steam_dir], use_cache=False) == game
+
+
+def test_probe_gives_up_on_a_hanging_folder(tmp_path, monkeypatch):
+    hanging = str(tmp_path / "network drive")
+    found = install_game(tmp_path / "local")
+    release = threading.Event()
+    has_game = gameroot.has_game
+
+    def slow_has_game(folder):
+        if folder == hanging:
+            release.wait(10)
+            return True
+        return has_game(folder)
+    monkeypatch.setattr(gameroot, 'has_game', slow_has_game)
+    try:
+        assert probe([hanging, str(tmp_path / "missing"), found], timeout=0.2) == found
+    finally:
+        release.set()
+
+
+def test_probe_prefers_the_earlier_candidate(tmp_path):
+    first = install_game(tmp_path / "first")
+    second = install_game(tmp_path / "second")
+    assert probe([str(tmp_path / "missing"), first, second]) == first
+    assert probe([str(tmp_path / "missing")]) is None
@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import subprocess
+
+from scr import supervisor
+from scr.loadtiming import LoadTimer, load_stats, changed_mods, mod_set_key
+from scr.supervisor import SessionSupervisor, read_history
+
+# A fake game, writing (delay, file, text) to its log folder on a schedule and exiting with a code
+FAKE_GAME = '''
+import os, sys, time
+schedule, exit_code = eval(sys.argv[2]), int(sys.argv[3])
+start = time.time()
+for delay, name, text in schedule:
+    time.sleep(max(0, start + delay - time.time()))
+    with open(os.path.join(sys.argv[1], name), 'a') as f:
+        f.write(text)
+sys.exit(exit_code)
+'''
+
+
+def start_fake_game(log_folder, schedule, exit_code=0):
+    return subprocess.Popen([sys.executable, "-c", FAKE_GAME, str(log_folder), repr(schedule), str(exit_code)])
+
+
+def poll_until_ready(timer, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not timer.poll(time.time()) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return timer.ready
+
+
+def test_ready_marker(tmp_path):
+    (tmp_path / "old.log").write_text("Main menu reached\n")
+    os.utime(tmp_path / "old.log", (time.time() - 3600, time.time() - 3600))  # Left over from the last session
+    timer = LoadTimer(str(tmp_path), time.time(), ready_marker=r"Main menu")
+    process = start_fake_game(tmp_path, [
+        (0.1, "system.log", "Loading map\n"),
+        (0.2, "game.log", "Main me"),  # Not a whole line yet
+        (0.6, "game.log", "nu reached\n"),
+        (0.8, "system.log", "Still writing\n"),
+    ])
+    try:
+        assert poll_until_ready(timer)
+    finally:
+        process.wait(10)
+    assert timer.detected_by == 'marker'
+    assert 0.5 <= timer.load_time <= 2.0
+
+
+def test_quiet_logs(tmp_path):
+    timer = LoadTimer(str(tmp_path / "logs"), time.time(), quiet_seconds=0.4)
+    (tmp_path / "logs").mkdir()
+    process = start_fake_game(tmp_path / "logs", [(0.1, "system.log", "a\n"), (0.3, "map.log", "b\n"), (0.5, "system.log", "c\n")])
+    try:
+        assert poll_until_ready(timer)
+        assert time.time() - timer.spawned_at >= 0.9  # The logs had to be quiet for 0.4 s after the last write
+    finally:
+        process.wait(10)
+    assert timer.detected_by == 'quiet logs'
+    assert 0.4 <= timer.load_time <= 1.5
+
+
+def test_truncated_log_is_read_again(tmp_path):
+    log = tmp_path / "game.log"
+    timer = LoadTimer(str(tmp_path), time.time() - 1, ready_marker="ready")
+    log.write_text("a long first line of the earlier start\n")
+    assert not timer.poll(time.time())
+    log.write_text("ready\n")  # The game truncates its logs when it starts
+    assert timer.poll(time.time())
+
+
+def test_supervised_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(supervisor, 'LOAD_POLL_INTERVAL', 0.05)
+    history = str(tmp_path / "sessions.jsonl")
+    process = start_fake_game(tmp_path, [(0.3, "game.log", "Main menu\n")], exit_code=3)
+    session_supervisor = SessionSupervisor(
+        process, ["B", "A"], history, preset="Both", user_dir="U", interval=0.1,
+        log_folder=str(tmp_path), ready_marker="Main menu", fingerprints={"A": "1", "B": "2"}
+    )
+    session_supervisor.start()
+    session_supervisor.thread.join(10)
+    [session] = read_history(history)
+    assert session == session_supervisor.session
+    assert session['mods'] == ["B", "A"] and session['mod_set'] == mod_set_key(["A", "B"])
+    assert session['crashed'] and session['exit_code'] == 3
+    assert session['load_detected_by'] == 'marker' and 0.2 <= session['load_time'] <= 2.0
+
+
+def test_load_stats_flags_a_regression_and_the_updated_mod():
+    def session(started, load_time, hpm_version):
+        return {'started': started, 'mods': ["HPM", "Music"], 'load_time': load_time, 'fingerprints': {"HPM": hpm_version, "Music": "m"}}
+    sessions = [session(1, 100, "a"), session(2, 104, "a"), session(3, 98, "a"), session(4, 150, "b"),
+                {'started': 5, 'mods': ["Vanilla"], 'load_time': None, 'crashed': True}]
+    newest, group = load_stats(sessions)
+    assert newest['label'] == "Vanilla" and newest['crashes'] == 1 and newest['last'] is None
+    assert group['loads'] == [100, 104, 98, 150]
+    assert group['baseline'] == 100 and group['regression']
+    assert group['changed_mods'] == ["HPM"]
+    assert changed_mods({"HPM": "a"}, {"HPM": "a", "New": "x"}) == []
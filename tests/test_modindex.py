@@ -0,0 +1,47 @@
+import os
+import json
+
+from scr import paradoxscript
+from scr.modindex import ModIndex, parse_mod_file, INDEX_FILE
+
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_cp1252_descriptor_keeps_the_old_name(tmp_path):
+    write(tmp_path / "cafe.mod", b'name = "Caf\xe9 Mod"\r\npath = "mod/Cafe"\r\nuser_dir = "Caf\xe9"\r\n')
+    descriptor = parse_mod_file(str(tmp_path / "cafe.mod"))
+    assert descriptor['name'] == "Caf Mod"
+    assert descriptor['user_dir'] == "Caf"
+    for value in descriptor.values():
+        str(value).encode('utf-8')  # No surrogates, they would end up in launcher_configs.json
+
+
+def test_utf8_descriptor(tmp_path):
+    write(tmp_path / "cafe.mod", 'name = "Café Mod"\ndependencies = { "Base" "Other" }\n'.encode('utf-8'))
+    descriptor = parse_mod_file(str(tmp_path / "cafe.mod"))
+    assert descriptor['name'] == "Café Mod"
+    assert descriptor['dependencies'] == ["Base", "Other"]
+
+
+def test_settings_round_trip_keeps_cp1252_bytes(tmp_path):
+    settings = tmp_path / "settings.txt"
+    write(settings, b'lastplayer="Caf\xe9"\r\nupdate_time=1.000000\r\n')
+    document = paradoxscript.load(str(settings))
+    document.set('update_time', "2.000000")
+    paradoxscript.save(document, str(settings))
+    assert settings.read_bytes() == b'lastplayer="Caf\xe9"\r\nupdate_time=2.000000\r\n'
+
+
+def test_index_from_an_older_version_is_parsed_again(tmp_path):
+    write(tmp_path / "cafe.mod", b'name = "Caf\xe9 Mod"\n')
+    stale = {'version': 2, 'entries': {'cafe.mod': {'name': "Caf\udce9 Mod"}}}
+    with open(tmp_path / INDEX_FILE, 'w') as f:
+        json.dump(stale, f)
+    index = ModIndex(str(tmp_path))
+    assert index.entries == {}
+    index.refresh()
+    assert [entry['name'] for entry in index.entries.values()] == ["Caf Mod"]
+    assert os.path.exists(tmp_path / INDEX_FILE)
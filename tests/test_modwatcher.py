@@ -0,0 +1,135 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QModelIndex
+from PyQt6.QtTest import QTest, QAbstractItemModelTester
+from PyQt6.QtWidgets import QApplication, QTreeView
+
+from scr import modwatcher
+from scr.modmodel import ModRecord, ModTreeModel
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def quick_watch(monkeypatch):
+    monkeypatch.setattr(modwatcher, 'WATCH_DELAY_MS', 50)
+
+
+def write_descriptor(folder, file, name, dependency=None):
+    with open(os.path.join(folder, file), 'w') as f:
+        f.write(f'name = "{name}"\npath = "mod/{name}"\n' + (f'dependencies = {{ "{dependency}" }}\n' if dependency else ""))
+
+
+def wait_for(condition, timeout_ms=5000):
+    waited = 0
+    while not condition() and waited < timeout_ms:
+        QTest.qWait(20)
+        waited += 20
+    return condition()
+
+
+def test_watcher_debounces_a_burst_of_events(app, quick_watch, tmp_path):
+    watcher = modwatcher.ModFolderWatcher()
+    events = []
+    watcher.changed.connect(lambda: events.append(True))
+    write_descriptor(tmp_path, "a.mod", "A")
+    watcher.watch(str(tmp_path), ["a.mod"])
+
+    for number in range(5):
+        write_descriptor(tmp_path, f"new{number}.mod", f"New {number}")
+    assert wait_for(lambda: events)
+    QTest.qWait(200)
+    assert len(events) == 1
+
+    watcher.watch(str(tmp_path), ["a.mod"] + [f"new{number}.mod" for number in range(5)])
+    with open(tmp_path / "a.mod", 'a') as f:
+        f.write('version = "2"\n')  # Edited in place, the folder itself doesn't change
+    assert wait_for(lambda: len(events) == 2)
+
+    watcher.stop()
+    os.remove(tmp_path / "a.mod")
+    QTest.qWait(200)
+    assert len(events) == 2
+
+
+def records_of(mods):
+    """ModRecords and parents for [(name, parent)], in load order."""
+    records = {}
+    parents = {}
+    for position, (name, parent) in enumerate(mods):
+        records[name] = ModRecord(name, f"{name.lower()}.mod", dependencies=[parent] if parent else [])
+        records[name].position = position
+        parents[name] = parent
+    return records, parents
+
+
+def tree(model, parent=QModelIndex()):
+    rows = []
+    for row in range(model.rowCount(parent)):
+        index = model.index(row, 0, parent)
+        rows.append((model.record(index).name, tree(model, index)))
+    return rows
+
+
+def test_merge_records_keeps_rows_and_checks(app):
+    model = ModTreeModel()
+    QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+    view = QTreeView()
+    view.setModel(model)
+    model.set_records(*records_of([("Base", None), ("Music", None), ("Sub", "Base"), ("Zoo", None)]))
+    view.expandAll()
+    model.set_checked(["Sub", "Music"])
+    music = model.records["Music"]
+
+    records, parents = records_of([("Base", None), ("Extra", "Base"), ("Music", None), ("Sub", "Base")])
+    records["Music"].tooltip = "Missing dependencies: Gone"
+    model.merge_records(records, parents)
+    assert tree(model) == [("Base", [("Extra", []), ("Sub", [])]), ("Music", [])]
+    assert model.records["Music"] is music and music.tooltip == "Missing dependencies: Gone"
+    assert model.checked_mods() == ["Music", "Sub"]
+
+    # Base goes away, its submods move to the top level and stay checked
+    model.merge_records(*records_of([("Extra", None), ("Music", None), ("Sub", None)]))
+    assert tree(model) == [("Extra", []), ("Music", []), ("Sub", [])]
+    assert model.checked_mods() == ["Music", "Sub"]
+
+
+def test_launcher_follows_the_mod_folder(app, quick_watch, tmp_path, monkeypatch):
+    root = tmp_path / "game"
+    (root / "mod").mkdir(parents=True)
+    (root / "v2game.exe").write_text("")
+    write_descriptor(root / "mod", "base.mod", "Base")
+    write_descriptor(root / "mod", "sub.mod", "Sub", "Base")
+    write_descriptor(root / "mod", "music.mod", "Music")
+    monkeypatch.setenv('HOME', str(tmp_path / "home"))
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(tmp_path / "config"))
+    monkeypatch.setattr(sys, 'argv', [str(root / "launcher.py")])
+
+    from scr.mainWindow import GameLauncher
+    launcher = GameLauncher()
+    try:
+        launcher.show()
+        assert wait_for(lambda: len(launcher.mod_model.records) == 3)
+        launcher.set_checked_mods(["Sub", "Base"])
+        sub = launcher.mod_model.records["Sub"]
+
+        write_descriptor(root / "mod", "extra.mod", "Extra", "Base")
+        assert wait_for(lambda: "Extra" in launcher.mod_model.records)
+        assert tree(launcher.mod_model) == [("Base", [("Extra", []), ("Sub", [])]), ("Music", [])]
+        assert launcher.mod_model.records["Sub"] is sub
+        assert launcher.mod_model.checked_mods() == ["Base", "Sub"]
+
+        os.remove(root / "mod" / "base.mod")
+        assert wait_for(lambda: "Base" not in launcher.mod_model.records)
+        assert tree(launcher.mod_model) == [("Extra", []), ("Music", []), ("Sub", [])]
+        assert launcher.mod_model.checked_mods() == ["Sub"]
+    finally:
+        launcher.close()
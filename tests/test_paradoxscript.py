@@ -0,0 +1,117 @@
+import os
+
+import pytest
+
+from scr import paradoxscript
+from scr.gamelaunch import patch_update_time
+from scr.settingsmanager import SettingsManager
+
+SETTINGS = (
+    b'# Written by the game\r\n'
+    b'x=7\r\n'
+    b'graphics=\r\n'
+    b'{\r\n'
+    b'\tsize=\r\n'
+    b'\t{\r\n'
+    b'\t\tx=1920\r\n'
+    b'\t\ty=1080\r\n'
+    b'\t}\r\n'
+    b'\r\n'
+    b'\trefreshRate=60 # Hz\r\n'
+    b'}\r\n'
+    b'update_timex=5.000000\r\n'
+    b'lastplayer="Caf\xe9 Au Lait"\r\n'
+    b'categories=\r\n'
+    b'{\r\n'
+    b'1 1 1 }\r\n'
+    b'update_time=1.000000\r\n'
+)
+
+
+@pytest.fixture
+def settings(tmp_path):
+    path = tmp_path / "settings.txt"
+    path.write_bytes(SETTINGS)
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    return path
+
+
+def edited(settings, changes):
+    document = paradoxscript.load(str(settings))
+    for path, value in changes.items():
+        document.set(path, value)
+    paradoxscript.save(document, str(settings))
+    return settings.read_bytes()
+
+
+def test_unchanged_round_trip(settings):
+    document = paradoxscript.load(str(settings))
+    assert not document.changed
+    paradoxscript.save(document, str(settings))
+    assert settings.read_bytes() == SETTINGS
+    assert document.get('lastplayer') == "Caf\udce9 Au Lait"
+    assert document.get_list('categories') == ["1", "1", "1"]
+
+
+def test_exact_path_edit(settings):
+    assert edited(settings, {'graphics.size.x': 2560}) == SETTINGS.replace(b'\t\tx=1920', b'\t\tx=2560')
+
+
+def test_startswith_trap(settings):
+    document = paradoxscript.load(str(settings))
+    assert document.get('update_time') == "1.000000"
+    assert document.get('update_timex') == "5.000000"
+    assert edited(settings, {'update_time': "2.500000"}) == SETTINGS.replace(b'update_time=1.000000', b'update_time=2.500000')
+
+
+def test_quoted_value_stays_quoted(settings):
+    assert edited(settings, {'lastplayer': 'Bob "The" Builder'}) == SETTINGS.replace(b'"Caf\xe9 Au Lait"', b'"Bob The Builder"')
+
+
+def test_insert_into_nested_blocks(settings):
+    result = edited(settings, {'graphics.vsync': "yes", 'graphics.size.scale': 2})
+    assert result == SETTINGS.replace(
+        b'\t\ty=1080\r\n\t}\r\n', b'\t\ty=1080\r\n\t\tscale=2\r\n\t}\r\n'
+    ).replace(
+        b'\trefreshRate=60 # Hz\r\n}\r\n', b'\trefreshRate=60 # Hz\r\n\tvsync=yes\r\n}\r\n'
+    )
+    document = paradoxscript.parse(result.decode('utf-8', 'surrogateescape'))
+    assert document.get('graphics.vsync') == "yes" and document.get('graphics.size.scale') == "2"
+
+
+def test_insert_at_top_level(settings):
+    assert edited(settings, {'shortcut': "yes"}) == SETTINGS + b'shortcut=yes\r\n'
+    document = paradoxscript.parse("a=1")  # No newline at the end
+    document.set('b', 2)
+    assert document.to_text() == "a=1\nb=2\n"
+
+
+def test_setting_the_same_value_changes_nothing():
+    document = paradoxscript.parse("a=1\nb=\"x\"\n")
+    document.set('a', 1)
+    document.set('b', "x")
+    assert not document.changed
+    document.set('a', 2)
+    document.set('a', 1)
+    assert not document.changed
+    assert document.to_text() == "a=1\nb=\"x\"\n"
+
+
+def test_bad_paths():
+    document = paradoxscript.parse("graphics={ x=1 }\n")
+    with pytest.raises(ValueError):
+        document.set('graphics', 1)
+    with pytest.raises(KeyError):
+        document.set('sound.volume', 1)
+
+
+def test_no_write_when_nothing_changed(settings):
+    assert not patch_update_time(str(settings), 1.0)
+    manager = SettingsManager(str(settings))
+    manager.set_setting('graphics.size.x', "1920")
+    manager.save_settings()
+    assert os.stat(settings).st_mtime_ns == 1_000_000_000
+
+    assert patch_update_time(str(settings), 2.0)
+    assert settings.read_bytes() == SETTINGS.replace(b'update_time=1.000000', b'update_time=2.000000')
+    assert sorted(os.listdir(settings.parent)) == ["settings.txt"]
@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+
+import pytest
+
+from scr import processlaunch
+from scr.processlaunch import parse_cpu_list, parse_affinity, resolve_cpus, least_loaded_core, start_process
+
+STUB = '''#!%s
+# Records how it was started, once the launcher had the time to set its affinity and priority
+import os, sys, time
+time.sleep(0.3)
+with open("started.txt", "w") as f:
+    f.write(repr({'argv': sys.argv[1:], 'cwd': os.getcwd(), 'cpus': sorted(os.sched_getaffinity(0)), 'nice': os.getpriority(os.PRIO_PROCESS, 0)}))
+'''
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("0-3,8") == [0, 1, 2, 3, 8]
+    assert parse_cpu_list(" 4, 2-2,,4 ") == [2, 4]
+
+
+def test_parse_affinity():
+    assert parse_affinity(None) is None
+    assert parse_affinity("all") is None
+    assert parse_affinity("least_loaded") == "least_loaded"
+    assert parse_affinity(1) == [0]
+    assert parse_affinity("0xA") == [1, 3]
+    assert parse_affinity("4-5,1") == [1, 4, 5]
+    assert parse_affinity([3, "1", 3]) == [1, 3]
+
+
+def test_resolve_cpus_keeps_to_the_numa_node(monkeypatch):
+    monkeypatch.setattr(processlaunch, 'numa_node_cpus', lambda node: [4, 5, 6, 7] if node == 1 else None)
+    assert resolve_cpus("0x30", 1) == [4, 5]
+    assert resolve_cpus("0-1", 1) == [0, 1]  # Nothing in the node, the affinity wins
+    assert resolve_cpus("all", 1) == [4, 5, 6, 7]
+    assert resolve_cpus("2", 3) == [2]
+
+
+def test_least_loaded_core(monkeypatch):
+    monkeypatch.setattr(processlaunch, 'LOAD_SAMPLE_SECONDS', 0)
+    monkeypatch.setattr(processlaunch, 'physical_cores', lambda: [[0, 4], [1, 5], [2, 6], [3, 7]])
+    samples = iter([
+        {cpu: (0, 0) for cpu in range(8)},
+        {0: (90, 100), 4: (10, 100), 1: (5, 100), 5: (5, 100), 2: (50, 100), 6: (50, 100), 3: (5, 100), 7: (5, 100)},
+    ])
+    monkeypatch.setattr(processlaunch, 'cpu_times', lambda: next(samples))
+    assert least_loaded_core() == [3, 7]  # Ties go to the later core
+    samples = iter([{cpu: (0, 0) for cpu in range(8)}, {cpu: (cpu, 100) for cpu in range(8)}])
+    assert least_loaded_core(allowed=[5, 6]) == [5]
+
+
+@pytest.fixture
+def stub(tmp_path):
+    path = tmp_path / "v2game stub"
+    path.write_text(STUB % sys.executable)
+    path.chmod(0o755)
+    return str(path)
+
+
+def started(folder):
+    path = os.path.join(folder, "started.txt")
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    with open(path) as f:
+        return eval(f.read())
+
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'), reason="needs Linux")
+def test_start_process_pins_and_passes_arguments_as_is(tmp_path, stub):
+    cpu = max(os.sched_getaffinity(0))
+    process = start_process([stub, "-mod=mod/My Mod.mod", "$HOME;"], str(tmp_path), priority='normal', cpus=[cpu])
+    assert process.wait(10) == 0
+    result = started(str(tmp_path))
+    assert result['argv'] == ["-mod=mod/My Mod.mod", "$HOME;"]
+    assert result['cwd'] == str(tmp_path)
+    assert result['cpus'] == [cpu]
+    assert result['nice'] == os.getpriority(os.PRIO_PROCESS, 0)
+
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'), reason="needs Linux")
+def test_start_process_raises_the_priority(tmp_path, stub, capsys):
+    process = start_process([stub], str(tmp_path), priority='high')
+    assert process.wait(10) == 0
+    nice = started(str(tmp_path))['nice']
+    if nice == os.getpriority(os.PRIO_PROCESS, 0):
+        assert "it needs CAP_SYS_NICE" in capsys.readouterr().out
+    else:
+        assert nice == max(-20, os.getpriority(os.PRIO_PROCESS, 0) + processlaunch.NICE_LEVELS['high'])
+
+
+def test_start_process_falls_back_to_normal(tmp_path, stub, capsys):
+    process = start_process([stub], str(tmp_path), priority='ludicrous')
+    assert process.wait(10) == 0
+    assert "Unknown priority 'ludicrous', using normal" in capsys.readouterr().out
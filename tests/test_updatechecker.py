@@ -0,0 +1,80 @@
+import os
+import calendar
+
+from scr.httpcache import HttpCache
+from scr.updatechecker import UpdateChecker, github_api_url
+from tests.fakegithub import FakeGitHub
+
+INSTALLED_AT = calendar.timegm((2020, 1, 1, 0, 0, 0))
+
+
+def release(tag, date):
+    return {'tag_name': tag, 'published_at': date}
+
+
+def commits(date):
+    return [{'commit': {'committer': {'date': date}}}]
+
+
+ROUTES = {
+    '/repos/owner/released/releases/latest': release("v2", "2019-06-01T00:00:00Z"),
+    '/repos/owner/committed/releases/latest': release("v1", "2019-06-01T00:00:00Z"),
+    '/repos/owner/committed/commits?per_page=1': commits("2021-01-01T00:00:00Z"),
+    '/repos/owner/current/releases/latest': release("v1", "2019-06-01T00:00:00Z"),
+    '/repos/owner/current/commits?per_page=1': commits("2019-06-01T00:00:00Z"),
+    '/repos/owner/unreleased/commits?per_page=1': commits("2019-06-01T00:00:00Z"),
+}
+
+
+def installed_mods(folder):
+    mods = {}
+    for repo in ["released", "committed", "current", "unreleased"]:
+        path = os.path.join(folder, f"{repo}.mod")
+        with open(path, 'w') as f:
+            f.write(f'name = "{repo}"\n')
+        os.utime(path, (INSTALLED_AT, INSTALLED_AT))
+        mods[repo] = {'file': f"{repo}.mod", 'github': f"https://github.com/owner/{repo}.git", 'release': "v1"}
+    mods['untracked'] = {'file': "untracked.mod", 'github': "", 'release': ""}
+    return mods
+
+
+def test_github_api_url():
+    assert github_api_url("https://github.com/owner/repo.git/", "http://localhost:1") == "http://localhost:1/repos/owner/repo"
+
+
+def test_new_releases_and_commits(tmp_path):
+    mods = installed_mods(str(tmp_path))
+    progress = []
+    with FakeGitHub(ROUTES) as github:
+        updates = UpdateChecker(mods, str(tmp_path), api_root=github.api_root).run(on_progress=lambda done, total: progress.append((done, total)))
+    assert sorted(updates) == [
+        ("committed - New commits avaliable.", "https://github.com/owner/committed.git"),
+        ("released - New packed release available: v2", "https://github.com/owner/released.git"),
+    ]
+    assert progress[0] == (0, 4) and progress[-1] == (4, 4)
+    # A new release is enough, its commits are never asked for
+    assert '/repos/owner/released/commits?per_page=1' not in [path for path, status, size in github.requests]
+
+
+def test_stale_cache_is_revalidated(tmp_path):
+    mods = installed_mods(str(tmp_path))
+    cache_file = str(tmp_path / "cache.json")
+    with FakeGitHub(ROUTES) as github:
+        first = UpdateChecker(mods, str(tmp_path), api_root=github.api_root, cache=HttpCache(cache_file, ttl=0)).run()
+        requests = len(github.requests)
+        cache = HttpCache(cache_file, ttl=0)
+        second = UpdateChecker(mods, str(tmp_path), api_root=github.api_root, cache=cache).run()
+        statuses = [status for path, status, size in github.requests[requests:]]
+    assert sorted(first) == sorted(second)
+    assert statuses.count(304) == cache.revalidated == 6  # Every 200 comes back as a 304, the 404 is asked again
+    assert statuses.count(404) == 1
+
+
+def test_fresh_cache_skips_the_network(tmp_path):
+    mods = installed_mods(str(tmp_path))
+    cache_file = str(tmp_path / "cache.json")
+    with FakeGitHub(ROUTES) as github:
+        UpdateChecker(mods, str(tmp_path), api_root=github.api_root, cache=HttpCache(cache_file)).run()
+        requests = len(github.requests)
+        UpdateChecker(mods, str(tmp_path), api_root=github.api_root, cache=HttpCache(cache_file)).run()
+        assert len(github.requests) == requests